@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config,pool
@@ -12,7 +13,12 @@ from app.core.config import settings
 #importing created model 
 from app.models.dummy import Dummy
 from app.models.logs import Log
-from app.models.user import User,Team,TeamMember
+from app.models.user import User,Team,TeamMember,RefreshSession
+from app.models.product import Product
+from app.models.category import Category
+from app.models.change_request import ChangeRequest
+from app.models.audit import AuditEntry
+from app.models.job import Job
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -29,6 +35,19 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata =  Base.metadata
 
+# Daily partitions of `logs` and its default partition are managed by
+# app/tasks/log_partitions.py, not by the models; autogenerate must not drop them
+LOG_PARTITION = re.compile(r"^logs_(p\d{8}|default)$")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and LOG_PARTITION.match(name or ""):
+        return False
+    if type_ == "index" and LOG_PARTITION.match(getattr(object.table, "name", "")):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,6 +70,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -74,7 +94,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,47 @@
+"""product_search_indexes
+
+Revision ID: 35d657587ee2
+Revises: 3e8b51f0a7c2
+Create Date: 2026-10-18 15:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '35d657587ee2'
+down_revision: Union[str, Sequence[str], None] = '3e8b51f0a7c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(sku, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm ships with the standard contrib package
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # STORED generated column: rewrites the table once, then Postgres keeps it in sync
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True))
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_products_name_trgm', 'products', ['name'], postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_products_sku_trgm', 'products', ['sku'], postgresql_using='gin', postgresql_ops={'sku': 'gin_trgm_ops'})
+    op.create_index('ix_products_tags', 'products', ['tags'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_tags', table_name='products')
+    op.drop_index('ix_products_sku_trgm', table_name='products')
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.drop_index('ix_products_search_vector', table_name='products')
+    op.drop_column('products', 'search_vector')
+    # The extension is left installed, other objects may depend on it
@@ -0,0 +1,44 @@
+"""change_status_failed
+
+Revision ID: 4f2b7c9e1a6d
+Revises: b3dc9685e395
+Create Date: 2026-10-18 21:40:12.508311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2b7c9e1a6d'
+down_revision: Union[str, Sequence[str], None] = 'b3dc9685e395'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE changestatus ADD VALUE IF NOT EXISTS 'failed'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Enum values cannot be dropped: failed changes become rejected and the
+    # type is rebuilt without the value
+    op.execute("UPDATE change_requests SET status = 'rejected' WHERE status = 'failed'")
+    op.execute("ALTER TYPE changestatus RENAME TO changestatus_old")
+    op.execute("CREATE TYPE changestatus AS ENUM ('pending', 'approved', 'rejected', 'conflict')")
+    op.execute("ALTER TABLE change_requests ALTER COLUMN status DROP DEFAULT")
+    # The pending-queue index predicate compares against the old type
+    op.drop_index('ix_change_requests_pending_queue', table_name='change_requests')
+    op.execute(
+        "ALTER TABLE change_requests ALTER COLUMN status TYPE changestatus USING status::text::changestatus"
+    )
+    op.execute("ALTER TABLE change_requests ALTER COLUMN status SET DEFAULT 'pending'")
+    op.create_index(
+        'ix_change_requests_pending_queue', 'change_requests', ['team_id', 'created_at', 'id'],
+        unique=False, postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.execute("DROP TYPE changestatus_old")
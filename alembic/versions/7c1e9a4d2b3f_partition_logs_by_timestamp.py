@@ -0,0 +1,110 @@
+"""partition_logs_by_timestamp
+
+Revision ID: 7c1e9a4d2b3f
+Revises: d0b746e19d06
+Create Date: 2026-10-18 11:02:17.540113
+
+Turns `logs` into a table range-partitioned by day on `timestamp`, with a
+BRIN index on time. Existing rows are copied over; ids keep counting from
+the old sequence. Partitions ahead of time and retention are handled by
+app/tasks/log_partitions.py.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a4d2b3f'
+down_revision: Union[str, Sequence[str], None] = 'd0b746e19d06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Days of partitions created ahead of today by the migration itself
+PREMAKE_DAYS = 7
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f('ix_logs_id'), table_name='logs')
+    op.execute("ALTER TABLE logs RENAME TO logs_legacy")
+    op.execute("ALTER TABLE logs_legacy RENAME CONSTRAINT logs_pkey TO logs_legacy_pkey")
+    # Keep the id sequence alive when the legacy table is dropped
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE logs_id_seq AS bigint")
+
+    op.execute("""
+        CREATE TABLE logs (
+            id BIGINT NOT NULL DEFAULT nextval('logs_id_seq'),
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            level VARCHAR NOT NULL,
+            message VARCHAR NOT NULL,
+            module VARCHAR,
+            func_name VARCHAR,
+            line_no INTEGER,
+            extra JSON,
+            CONSTRAINT logs_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY logs.id")
+    op.execute("CREATE INDEX ix_logs_timestamp_brin ON logs USING brin (timestamp)")
+    # Catches rows outside the managed range instead of failing the insert
+    op.execute("CREATE TABLE logs_default PARTITION OF logs DEFAULT")
+
+    # One partition per UTC day from the oldest existing row up to PREMAKE_DAYS ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            day date;
+            today date := (now() AT TIME ZONE 'UTC')::date;
+            first_day date := LEAST(
+                COALESCE((SELECT min(timestamp AT TIME ZONE 'UTC')::date FROM logs_legacy), today),
+                today
+            );
+        BEGIN
+            FOR day IN
+                SELECT d::date FROM generate_series(first_day, today + {PREMAKE_DAYS}, interval '1 day') AS d
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF logs FOR VALUES FROM (%L) TO (%L)',
+                    'logs_p' || to_char(day, 'YYYYMMDD'),
+                    day::timestamp AT TIME ZONE 'UTC', (day + 1)::timestamp AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute("""
+        INSERT INTO logs (id, timestamp, level, message, module, func_name, line_no, extra)
+        SELECT id, timestamp, level, message, module, func_name, line_no, extra FROM logs_legacy
+    """)
+    op.drop_table('logs_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE logs RENAME TO logs_partitioned")
+    op.execute("ALTER TABLE logs_partitioned RENAME CONSTRAINT logs_pkey TO logs_partitioned_pkey")
+    op.create_table('logs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('logs_id_seq')"), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('level', sa.String(), nullable=False),
+    sa.Column('message', sa.String(), nullable=False),
+    sa.Column('module', sa.String(), nullable=True),
+    sa.Column('func_name', sa.String(), nullable=True),
+    sa.Column('line_no', sa.Integer(), nullable=True),
+    sa.Column('extra', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_logs_id'), 'logs', ['id'], unique=False)
+    op.execute("""
+        INSERT INTO logs (id, timestamp, level, message, module, func_name, line_no, extra)
+        SELECT id, timestamp, level, message, module, func_name, line_no, extra FROM logs_partitioned
+    """)
+    # Drops every partition along with the parent
+    op.execute("DROP TABLE logs_partitioned CASCADE")
+    op.execute("ALTER SEQUENCE logs_id_seq AS integer")
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY logs.id")
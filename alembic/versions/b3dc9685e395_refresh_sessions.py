@@ -0,0 +1,50 @@
+"""refresh_sessions
+
+Revision ID: b3dc9685e395
+Revises: 33600e16fdf6
+Create Date: 2026-10-18 16:23:22.473177
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3dc9685e395'
+down_revision: Union[str, Sequence[str], None] = '33600e16fdf6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The auth schema is not autogenerated
+    op.create_table(
+        'refresh_sessions',
+        sa.Column('id', sa.Uuid(as_uuid=False), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.Uuid(as_uuid=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('rotated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('revoked_reason', sa.String(length=20), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['auth.users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        schema='auth'
+    )
+    op.create_index('ix_refresh_sessions_user_live', 'refresh_sessions', ['user_id'], unique=False, schema='auth',
+                    postgresql_where=sa.text('revoked_at IS NULL'))
+    op.create_index('ix_refresh_sessions_revoked', 'refresh_sessions', ['expires_at'], unique=False, schema='auth',
+                    postgresql_where=sa.text('revoked_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_sessions_revoked', table_name='refresh_sessions', schema='auth',
+                  postgresql_where=sa.text('revoked_at IS NOT NULL'))
+    op.drop_index('ix_refresh_sessions_user_live', table_name='refresh_sessions', schema='auth',
+                  postgresql_where=sa.text('revoked_at IS NULL'))
+    op.drop_table('refresh_sessions', schema='auth')
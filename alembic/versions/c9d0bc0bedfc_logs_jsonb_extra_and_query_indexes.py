@@ -0,0 +1,37 @@
+"""logs_jsonb_extra_and_query_indexes
+
+Revision ID: c9d0bc0bedfc
+Revises: 7c1e9a4d2b3f
+Create Date: 2026-10-18 12:20:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0bc0bedfc'
+down_revision: Union[str, Sequence[str], None] = '7c1e9a4d2b3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes on the partitioned parent cascade to every partition
+    op.alter_column('logs', 'extra', type_=postgresql.JSONB(), postgresql_using='extra::jsonb')
+    # jsonb_path_ops only serves @> but is smaller and faster than the default opclass
+    op.create_index('ix_logs_extra_gin', 'logs', ['extra'], postgresql_using='gin', postgresql_ops={'extra': 'jsonb_path_ops'})
+    op.create_index('ix_logs_level_timestamp', 'logs', ['level', 'timestamp', 'id'])
+    op.create_index('ix_logs_module_timestamp', 'logs', ['module', 'timestamp', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_logs_module_timestamp', table_name='logs')
+    op.drop_index('ix_logs_level_timestamp', table_name='logs')
+    op.drop_index('ix_logs_extra_gin', table_name='logs')
+    op.alter_column('logs', 'extra', type_=sa.JSON(), postgresql_using='extra::json')
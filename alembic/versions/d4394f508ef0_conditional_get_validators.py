@@ -0,0 +1,29 @@
+"""conditional get validators
+
+Revision ID: d4394f508ef0
+Revises: d436e45cb1ca
+Create Date: 2026-10-18 16:10:44.606008
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4394f508ef0'
+down_revision: Union[str, Sequence[str], None] = 'd436e45cb1ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('team_members', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True), schema='auth')
+    op.create_index('ix_categories_modified_at', 'categories', [sa.literal_column('coalesce(updated_at, created_at)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_categories_modified_at', table_name='categories')
+    op.drop_column('team_members', 'updated_at', schema='auth')
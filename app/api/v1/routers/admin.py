@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud.jobs import job_stats
+from app.database.asyncio.replicas import get_replica_router
+from app.database.asyncio.session import get_async_db
+from app.database.pool import pool_stats
+from app.schemas.admin import PoolReport, ReplicaReport
+from app.schemas.job import JobReport
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/pool", response_model=PoolReport)
+def connection_pool_stats(principal: Principal = Depends(require(Permission.system_read))):
+    """Live pool state plus checkout wait / hold time since process start."""
+    return {
+        "settings": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pre_ping": settings.DB_POOL_PRE_PING,
+            "pgbouncer": settings.DB_PGBOUNCER,
+        },
+        "pools": pool_stats(),
+    }
+
+
+@router.get("/replicas", response_model=ReplicaReport)
+def replica_status(principal: Principal = Depends(require(Permission.system_read))):
+    """Replica health and replay lag as of the last health check."""
+    replica_router = get_replica_router()
+    if replica_router is None:
+        return {"enabled": False, "read_your_writes_seconds": settings.READ_YOUR_WRITES_SECONDS}
+    return {"enabled": True, "read_your_writes_seconds": settings.READ_YOUR_WRITES_SECONDS, **replica_router.stats()}
+
+
+@router.get("/jobs", response_model=JobReport)
+async def job_queue_stats(
+    window: int = Query(default=3600, ge=60, le=7 * 24 * 3600, description="Seconds of finished jobs to time"),
+    principal: Principal = Depends(require(Permission.system_read)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Background job backlog per queue and job, plus wait / run time percentiles over the window."""
+    return {"window_seconds": window, "jobs": await job_stats(db, window)}
+
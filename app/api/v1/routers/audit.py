@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import AUDITED
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud.audit import entity_history
+from app.crud.pagination import InvalidCursor
+from app.database.asyncio.replicas import get_read_db
+from app.schemas.audit import AuditPage
+
+router = APIRouter(prefix="/audit", tags=["Audit"])
+
+ENTITY_TYPES = frozenset(AUDITED.values())
+
+
+@router.get("/{entity_type}/{entity_id}", response_model=AuditPage)
+async def get_entity_history(
+    entity_type: str,
+    entity_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    principal: Principal = Depends(require(Permission.logs_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Who changed what on one entity (e.g. /audit/product/42), newest first."""
+    if entity_type not in ENTITY_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity type '{entity_type}'")
+    try:
+        return await entity_history(db, entity_type, entity_id, cursor=cursor, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -4,12 +4,18 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
-
-from app.database.sync.session import get_db
-from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import Principal, get_current_user, revoke_user_tokens
+from app.core.logger import logger
+from app.core.permissions import encode_memberships
+from app.core.revocation import revocations
+from app.crud import sessions as sessions_crud
+from app.database.asyncio.session import get_async_db
+from app.models.user import Team, TeamMember, User
 from app.schemas.user import Token, TokenRefresh
-from app.utils.security import verify_password
+from app.utils.password_pool import PasswordPoolBusy, verify_password_async
 
 from app.core.config import settings
 
@@ -31,47 +37,145 @@ def create_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def create_access_and_refresh_tokens(user_id: int):
+def create_access_and_refresh_tokens(
+    user_id: int,
+    session_id: str,
+    jti: str,
+    token_version: int = 0,
+    memberships: Optional[dict] = None,
+):
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_token_expires = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
 
+    # "tm" carries the team memberships so authorization needs no query;
+    # "sid" ties both tokens to the login session, so logging out revokes them
     access_token = create_token(
-        data={"sub": str(user_id), "type": "access"},
+        data={
+            "sub": str(user_id), "type": "access", "ver": token_version, "sid": session_id,
+            "tm": encode_memberships(memberships or {}),
+        },
         expires_delta=access_token_expires
     )
+    # "jti" is the session's current refresh token, replaced on every refresh
     refresh_token = create_token(
-        data={"sub": str(user_id), "type": "refresh"},
+        data={"sub": str(user_id), "type": "refresh", "ver": token_version, "sid": session_id, "jti": jti},
         expires_delta=refresh_token_expires
     )
     return access_token, refresh_token
 
 
-@router.post("/login", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+def _decode_refresh_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    if payload.get("type") != "refresh":
+        raise HTTPException(status_code=400, detail="Invalid token type")
+    try:
+        int(payload["sub"]), int(payload.get("ver", 0))
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    if not payload.get("sid") or not payload.get("jti"):
+        # Issued before sessions existed
+        raise HTTPException(status_code=401, detail="Refresh token has been revoked, log in again")
+    return payload
+
+
+async def load_memberships(db: AsyncSession, user_id: int) -> dict:
+    """Active memberships in active teams, {team_id: TeamMemberRole}."""
+    result = await db.execute(
+        select(TeamMember.team_id, TeamMember.role)
+        .join(Team, Team.id == TeamMember.team_id)
+        .where(TeamMember.user_id == user_id, TeamMember.is_active.is_(True), Team.is_active.is_(True))
+    )
+    return {team_id: role for team_id, role in result}
 
-    access_token, refresh_token = create_access_and_refresh_tokens(user.id)
-    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
+@router.post("/login", response_model=Token)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-@router.post("/refresh", response_model=TokenRefresh)
-def refresh_access_token(refresh_data: TokenRefresh, db: Session = Depends(get_db)):
+    # bcrypt runs in the dedicated process pool, shed load when it is saturated
     try:
-        payload = jwt.decode(refresh_data.refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-        token_type = payload.get("type")
-        user_id = int(payload.get("sub"))
+        password_ok = await verify_password_async(form_data.password, user.password_hash)
+    except PasswordPoolBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    if not password_ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-        if token_type != "refresh":
-            raise HTTPException(status_code=400, detail="Invalid token type")
+    memberships = await load_memberships(db, user.id)
+    session_id, jti = await sessions_crud.create_session(db, user.id)
+    await db.commit()
+    access_token, refresh_token = create_access_and_refresh_tokens(
+        user.id, session_id, jti, user.token_version, memberships
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
 
-        new_access_token, _ = create_access_and_refresh_tokens(user.id)
-        return {"access_token": new_access_token}
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(refresh_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
+    """
+    Trade the refresh token for new access and refresh tokens. The old
+    refresh token stops working: sending it again revokes the session.
+    """
+    payload = _decode_refresh_token(refresh_data.refresh_token)
+    user_id, token_version = int(payload["sub"]), int(payload.get("ver", 0))
+    session_id, jti = payload["sid"], payload["jti"]
+
+    # Revoked sessions and logged-out users are refused from memory
+    if revocations.is_revoked(user_id, token_version, session_id):
+        raise HTTPException(status_code=401, detail="Refresh token has been revoked")
+
+    # One statement: rotates the token and re-reads the memberships, so
+    # membership changes apply from the next refresh
+    rotated = await sessions_crud.rotate_session(db, session_id, jti)
+    if rotated is None:
+        await _refuse_refresh(db, session_id, jti)
+    await db.commit()
+    memberships, new_jti = rotated
+    access_token, refresh_token = create_access_and_refresh_tokens(
+        user_id, session_id, new_jti, token_version, memberships
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
\ No newline at end of file
+
+async def _refuse_refresh(db: AsyncSession, session_id: str, jti: str):
+    """The token did not rotate: revoke its session if it was an already used one, and answer 401."""
+    try:
+        session = await sessions_crud.get_session(db, session_id)
+    except sessions_crud.SessionError:
+        raise HTTPException(status_code=401, detail="Refresh token has been revoked")
+    if session.revoked_at is None and session.jti != jti:
+        # An older token of a live session: it was copied, and whoever holds
+        # the newest one may be the thief, so the session ends for both
+        expires_at = await sessions_crud.revoke_session(db, session_id, "reuse")
+        await db.commit()
+        if expires_at is not None:
+            await revocations.revoke_session(session_id, expires_at.timestamp())
+        logger.warning("refresh token reuse detected, session revoked", extra={"extra": {
+            "user_id": session.user_id, "session_id": session_id,
+        }})
+    raise HTTPException(status_code=401, detail="Refresh token has been revoked")
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
+    # Ends this session only: its refresh token and its access tokens
+    payload = _decode_refresh_token(refresh_data.refresh_token)
+    expires_at = await sessions_crud.revoke_session(db, payload["sid"], "logout")
+    await db.commit()
+    if expires_at is not None:
+        await revocations.revoke_session(payload["sid"], expires_at.timestamp())
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_everywhere(principal: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    # Invalidates every access and refresh token issued to this user so far
+    await revoke_user_tokens(db, principal.user_id)
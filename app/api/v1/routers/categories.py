@@ -0,0 +1,190 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import conditional
+from app.core.cache import cached
+from app.core.conditional import Validators
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud import categories as crud
+from app.crud.pagination import InvalidCursor
+from app.database.asyncio.replicas import get_read_db
+from app.database.asyncio.session import get_async_db
+from app.schemas.category import (
+    CategoryCreate, CategoryMove, CategoryProductCounts, CategoryResponse,
+    CategoryTreeNode, CategoryUpdate,
+)
+from app.schemas.product import ProductPage
+
+router = APIRouter(prefix="/categories", tags=["Categories"])
+
+
+def _not_found(e: crud.CategoryError):
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# -----------------------------
+# Reads
+# -----------------------------
+# Catalog reads need catalog:read, held by every role (products and search
+# too). Each read first checks the client's validators with a narrow query
+# and answers 304 before loading anything when its copy is current
+@router.get("/tree", response_model=List[CategoryTreeNode])
+async def category_tree(
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    rows, modified = await crud.get_tree_state(db)
+    validators = Validators.of("categories:tree", rows, modified, last_modified=modified)
+    not_modified = conditional.evaluate(request, response, validators)
+    if not_modified is not None:
+        return not_modified
+    return await crud.get_tree(db)
+
+
+@router.get("/product-counts", response_model=CategoryProductCounts)
+# Product counts also move with product writes, hence the short TTL and both tags
+@cached("categories:product_counts", ttl=60, tags=[crud.CATEGORY_TAG, "products"], exclude=("principal", "db"))
+async def category_product_counts(
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return {"counts": await crud.get_product_counts(db)}
+
+
+@router.get("/{category_id}/subtree", response_model=List[CategoryResponse])
+async def category_subtree(
+    category_id: int,
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    rows, modified = await crud.get_subtree_state(db, category_id)
+    if rows:
+        validators = Validators.of("categories:subtree", category_id, rows, modified, last_modified=modified)
+        not_modified = conditional.evaluate(request, response, validators)
+        if not_modified is not None:
+            return not_modified
+    nodes = await crud.get_subtree(db, category_id)
+    if not nodes:
+        raise HTTPException(status_code=404, detail=f"Category {category_id} not found")
+    return nodes
+
+
+@router.get("/{category_id}/breadcrumb", response_model=List[CategoryResponse])
+async def category_breadcrumb(
+    category_id: int,
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    rows, modified = await crud.get_breadcrumb_state(db, category_id)
+    if rows:
+        validators = Validators.of("categories:breadcrumb", category_id, rows, modified, last_modified=modified)
+        not_modified = conditional.evaluate(request, response, validators)
+        if not_modified is not None:
+            return not_modified
+    nodes = await crud.get_breadcrumb(db, category_id)
+    if not nodes:
+        raise HTTPException(status_code=404, detail=f"Category {category_id} not found")
+    return nodes
+
+
+@router.get("/{category_id}/products", response_model=ProductPage)
+async def category_products(
+    category_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    with_total: bool = False,
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        # total_estimate is a planner estimate and is left out of the validators
+        state = await crud.get_subtree_products_state(db, category_id, cursor=cursor, limit=limit)
+        validators = Validators.of(
+            "categories:products", category_id, state.next_cursor, state.prev_cursor,
+            [(row.id, row.version) for row in state.items],
+            last_modified=max((row.modified_at for row in state.items if row.modified_at), default=None),
+        )
+        not_modified = conditional.evaluate(request, response, validators)
+        if not_modified is not None:
+            return not_modified
+        return await crud.get_subtree_products(db, category_id, cursor=cursor, limit=limit, with_total=with_total)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# -----------------------------
+# Writes
+# -----------------------------
+@router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+async def create_category(
+    payload: CategoryCreate,
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        category = await crud.create_category(db, payload.name, payload.parent_id)
+    except crud.CategoryError as e:
+        raise _not_found(e)
+    await db.commit()
+    await crud.invalidate_category_cache()
+    return category
+
+
+@router.patch("/{category_id}", response_model=CategoryResponse)
+async def update_category(
+    category_id: int,
+    payload: CategoryUpdate,
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        category = await crud.get_active_category(db, category_id)
+        if payload.name is not None:
+            category = await crud.rename_category(db, category_id, payload.name)
+    except crud.CategoryError as e:
+        raise _not_found(e)
+    await db.commit()
+    await crud.invalidate_category_cache()
+    return category
+
+
+@router.post("/{category_id}/move", response_model=CategoryResponse)
+async def move_category(
+    category_id: int,
+    payload: CategoryMove,
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        category = await crud.move_category(db, category_id, payload.parent_id)
+    except crud.CategoryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await db.commit()
+    await crud.invalidate_category_cache()
+    return category
+
+
+@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_category(
+    category_id: int,
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Soft delete of the node and its whole subtree
+    try:
+        await crud.soft_delete_category(db, category_id)
+    except crud.CategoryError as e:
+        raise _not_found(e)
+    await db.commit()
+    await crud.invalidate_category_cache()
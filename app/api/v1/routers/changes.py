@@ -0,0 +1,131 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.core.dependencies import Principal, get_current_user
+from app.core.permissions import Permission
+from app.crud import changes as crud
+from app.crud.pagination import InvalidCursor
+from app.database.asyncio.session import get_async_db
+from app.models.change_request import ChangeAction
+from app.schemas.change import (
+    ChangeBatchRequest, ChangeBatchResponse, ChangePage, ChangeResponse, ChangeSubmit,
+)
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+
+def _reviewable_teams(principal: Principal, team_id: Optional[int] = None) -> Optional[list]:
+    """Teams whose changes `principal` may review, narrowed to `team_id` if given."""
+    team_ids = principal.team_ids_with(Permission.changes_approve)
+    if team_id is not None:
+        if team_ids is not None and team_id not in team_ids:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing permission changes:approve")
+        return [team_id]
+    if team_ids == []:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing permission changes:approve")
+    return team_ids
+
+
+def _batch_response(outcome: dict) -> dict:
+    response = {"approved": 0, "rejected": 0, "conflict": 0, "failed": 0, "not_pending": 0, "results": []}
+    for change_id, (result, entity_id, version, error) in outcome.items():
+        response[result] += 1
+        response["results"].append(
+            {"id": change_id, "status": result, "entity_id": entity_id, "applied_version": version, "error": error}
+        )
+    return response
+
+
+@router.post("", response_model=ChangeResponse, status_code=status.HTTP_201_CREATED)
+async def submit_change(
+    payload: ChangeSubmit,
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not principal.can(Permission.changes_submit, payload.team_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing permission changes:submit")
+    try:
+        change = await crud.submit_change(
+            db,
+            payload.team_id,
+            principal.user_id,
+            ChangeAction(payload.action.value),
+            payload.changes,
+            entity_id=payload.entity_id,
+            base_version=payload.base_version,
+            note=payload.note,
+        )
+    except crud.ChangeConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except crud.ChangeError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    await db.commit()
+    return change
+
+
+@router.get("/pending", response_model=ChangePage)
+async def pending_changes(
+    team_id: Optional[int] = Query(default=None, description="Only this team; default is every team you review"),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    with_total: bool = False,
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """The review queue: pending changes of the teams you approve for, oldest first."""
+    team_ids = _reviewable_teams(principal, team_id)
+    try:
+        return await crud.pending_changes(db, team_ids, cursor=cursor, limit=limit, with_total=with_total)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{change_id}", response_model=ChangeResponse)
+async def get_change(
+    change_id: int,
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        change = await crud.get_change(db, change_id)
+    except crud.ChangeError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    # Visible to its author and to the team's reviewers
+    if change.submitted_by != principal.user_id and not principal.can(Permission.changes_approve, change.team_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Change {change_id} not found")
+    return change
+
+
+@router.post("/approve", response_model=ChangeBatchResponse)
+async def approve_changes(
+    payload: ChangeBatchRequest,
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Approve up to 1,000 changes in one transaction. Changes whose product was
+    modified since submission come back as `conflict` and are not applied;
+    changes the database refuses come back as `failed` with the error.
+    """
+    team_ids = _reviewable_teams(principal)
+    outcome = await crud.approve_changes(db, payload.ids, principal.user_id, team_ids, payload.note)
+    await db.commit()
+    response = _batch_response(outcome)
+    if response["approved"]:
+        await get_cache().invalidate_tags("products")
+    return response
+
+
+@router.post("/reject", response_model=ChangeBatchResponse)
+async def reject_changes(
+    payload: ChangeBatchRequest,
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    team_ids = _reviewable_teams(principal)
+    outcome = await crud.reject_changes(db, payload.ids, principal.user_id, team_ids, payload.note)
+    await db.commit()
+    return _batch_response(outcome)
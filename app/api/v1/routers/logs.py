@@ -0,0 +1,59 @@
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud.logs import query_logs
+from app.crud.pagination import InvalidCursor
+from app.database.asyncio.replicas import get_read_db
+from app.schemas.logs import LogPage
+
+router = APIRouter(prefix="/logs", tags=["Logs"])
+
+
+def _parse_extra_filters(filters: List[str]) -> dict:
+    """Turn `key:value` pairs into a containment document; values are JSON when they parse."""
+    document = {}
+    for item in filters:
+        key, sep, value = item.partition(":")
+        if not sep or not key:
+            raise HTTPException(status_code=400, detail=f"Invalid extra filter '{item}', expected key:value")
+        try:
+            document[key] = json.loads(value)
+        except ValueError:
+            document[key] = value
+    return document
+
+
+@router.get("", response_model=LogPage)
+async def list_logs(
+    level: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    module: Optional[str] = None,
+    extra: List[str] = Query(default=[], description="key:value pairs matched inside `extra`, e.g. status_code:500"),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    with_total: bool = Query(default=False, description="Add a planner estimate of the matching rows"),
+    principal: Principal = Depends(require(Permission.logs_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        page = await query_logs(
+            db,
+            level=level,
+            start=start,
+            end=end,
+            module=module,
+            extra=_parse_extra_filters(extra),
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page
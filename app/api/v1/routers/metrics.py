@@ -0,0 +1,46 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import get_cache
+from app.core.logger import get_db_handler, logger
+from app.core.metrics import render_prometheus
+from app.core.rate_limit import get_rate_limiter
+from app.core.revocation import revocations
+from app.core.startup import startup_profiler
+from app.database.pool import pool_stats
+from app.utils.password_pool import password_pool
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _collect_gauges() -> dict:
+    """Counters of the other in-process subsystems, flattened to gauges."""
+    gauges = {}
+    for name, value in password_pool.stats().items():
+        if isinstance(value, (int, float)):
+            gauges[f"password_pool_{name}"] = value
+    for name, value in get_cache().stats().items():
+        gauges[f"cache_{name}"] = value
+    for name, value in get_rate_limiter().stats().items():
+        gauges[f"rate_limit_{name}"] = value
+    for name, value in revocations.stats().items():
+        gauges[f"revoked_{name}"] = value
+    db_handler = get_db_handler(logger)
+    if db_handler is not None:
+        for name, value in db_handler.stats().items():
+            gauges[f"log_sink_{name}"] = value
+    for pool_name, stats in pool_stats().items():
+        for name, value in stats.items():
+            gauges.setdefault(f"db_pool_{name}", {})[(("pool", pool_name),)] = value
+    gauges["app_startup_phase_seconds"] = {
+        (("phase", name),): seconds for name, seconds in startup_profiler.report()["phases"].items()
+    }
+    return gauges
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(
+        render_prometheus(_collect_gauges()),
+        media_type="text/plain; version=0.0.4",
+    )
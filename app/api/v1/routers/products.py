@@ -0,0 +1,193 @@
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from anyio import from_thread
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.services import product_export
+from app.api.v1.services.product_import import ImportFormatError, detect_format, import_products
+from app.core import conditional
+from app.core.cache import get_cache
+from app.core.conditional import Validators
+from app.core.config import settings
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud import jobs as jobs_crud
+from app.crud.categories import CategoryError, get_active_category
+from app.crud.products import ProductError, bulk_update_price_stock, get_product, get_product_state
+from app.database.asyncio.replicas import get_read_db
+from app.database.asyncio.session import get_async_db
+from app.core.logger import logger
+from app.schemas.job import JobResponse
+from app.schemas.product import BulkPriceStockRequest, BulkPriceStockResponse, ImportReport, ProductResponse
+from app.tasks.queue import enqueue_async
+
+router = APIRouter(prefix="/products", tags=["Products"])
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True when Accept-Encoding lists gzip without q=0."""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        name, _, value = params.partition("=")
+        try:
+            return name.strip() != "q" or float(value) > 0
+        except ValueError:
+            return False
+    return False
+
+
+@router.get("/export")
+async def export_products(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    category_id: Optional[int] = Query(default=None, description="Includes the whole subtree"),
+    accept_encoding: Optional[str] = Header(default=None),
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Stream every active product as NDJSON or CSV (the import's layout),
+    gzipped when the client accepts it. The session stays open until the
+    last chunk is sent.
+    """
+    if category_id is not None:
+        try:
+            await get_active_category(db, category_id)
+        except CategoryError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    gzip = _accepts_gzip(accept_encoding)
+    headers = {
+        "Content-Disposition": f'attachment; filename="products.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        product_export.export_products(db, format, category_id=category_id, gzip=gzip),
+        media_type=product_export.MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def read_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Every product write bumps `version`, so it alone validates the response
+    state = await get_product_state(db, product_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
+    validators = Validators.of("product", product_id, state.version, last_modified=state.modified_at)
+    not_modified = conditional.evaluate(request, response, validators)
+    if not_modified is not None:
+        return not_modified
+    try:
+        return await get_product(db, product_id)
+    except ProductError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/import", response_model=ImportReport)
+def import_products_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(default=None, description="csv or ndjson, defaults to the file extension"),
+    principal: Principal = Depends(require(Permission.catalog_write)),
+):
+    # Sync endpoint: runs on the threadpool since COPY goes through psycopg2.
+    # The upload is already spooled to disk by Starlette and read as a stream.
+    try:
+        fmt = detect_format(file.filename, format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def log_progress(progress):
+        logger.info("product import progress", extra={"extra": {
+            "file": file.filename, "user_id": principal.user_id, **progress.model_dump(),
+        }})
+
+    try:
+        report = import_products(file.file, fmt, on_progress=log_progress)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info("product import finished", extra={"extra": report.model_dump()})
+    if report.inserted or report.updated or report.reactivated:
+        # Runs on the threadpool, hop back to the event loop for the async cache
+        from_thread.run(get_cache().invalidate_tags, "products")
+    return report
+
+
+def _save_upload(upload: UploadFile, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(upload.file, out, length=1024 * 1024)
+
+
+@router.post("/import/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_product_import(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(default=None, description="csv or ndjson, defaults to the file extension"),
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Import in the background: the file is saved under JOB_FILES_DIR and a
+    `products.import` job runs it on a worker. Poll the returned job.
+    """
+    try:
+        fmt = detect_format(file.filename, format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    path = Path(settings.JOB_FILES_DIR) / "imports" / f"{uuid.uuid4().hex}.{fmt}"
+    await run_in_threadpool(_save_upload, file, path)
+    try:
+        job_id = await enqueue_async(
+            db, "products.import", {"path": str(path), "format": fmt, "filename": file.filename},
+            created_by=principal.user_id,
+        )
+        await db.commit()
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return await jobs_crud.get_job(db, job_id)
+
+
+@router.get("/import/jobs/{job_id}", response_model=JobResponse)
+async def product_import_job(
+    job_id: int,
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await jobs_crud.get_job(db, job_id, name="products.import")
+    except jobs_crud.JobError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/bulk-update", response_model=BulkPriceStockResponse)
+async def bulk_update_prices_and_stock(
+    payload: BulkPriceStockRequest,
+    principal: Principal = Depends(require(Permission.catalog_write)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    results = await bulk_update_price_stock(db, payload.items)
+    await db.commit()
+
+    counts = {"updated": 0, "not_found": 0, "conflict": 0, "insufficient_stock": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    if counts["updated"]:
+        await get_cache().invalidate_tags("products")
+    return {**counts, "results": results}
@@ -0,0 +1,42 @@
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud.search import search_products
+from app.database.asyncio.replicas import get_read_db
+from app.schemas.search import SearchResponse
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(min_length=1, max_length=200, description="Words, a name with typos, or a SKU prefix"),
+    brand: Optional[str] = None,
+    category_id: Optional[int] = Query(default=None, description="Includes the whole subtree"),
+    tag: List[str] = Query(default=[], description="Products must carry every given tag"),
+    min_price: Optional[Decimal] = Query(default=None, ge=0),
+    max_price: Optional[Decimal] = Query(default=None, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    principal: Principal = Depends(require(Permission.catalog_read)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        return await search_products(
+            db,
+            q,
+            brand=brand,
+            category_id=category_id,
+            tags=tag,
+            min_price=min_price,
+            max_price=max_price,
+            limit=limit,
+            offset=offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
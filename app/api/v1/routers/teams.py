@@ -0,0 +1,74 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import conditional
+from app.core.conditional import Validators
+from app.core.dependencies import Principal, require
+from app.core.permissions import Permission
+from app.crud import teams as crud
+from app.crud.pagination import InvalidCursor
+from app.database.asyncio.replicas import get_read_db
+from app.schemas.user import TeamMemberPage, TeamResponse
+
+router = APIRouter(prefix="/teams", tags=["Teams"])
+
+# Per-user responses: shared caches must not keep them
+PRIVATE = "private, no-cache"
+
+
+def _not_found(team_id: int):
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Team {team_id} not found")
+
+
+@router.get("/{team_id}", response_model=TeamResponse)
+async def get_team(
+    team_id: int,
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(require(Permission.team_read, "team_id")),
+    db: AsyncSession = Depends(get_read_db),
+):
+    modified = await crud.get_team_state(db, team_id)
+    if modified is None:
+        raise _not_found(team_id)
+    validators = Validators.of("team", team_id, modified, last_modified=modified)
+    not_modified = conditional.evaluate(request, response, validators, cache_control=PRIVATE)
+    if not_modified is not None:
+        return not_modified
+    try:
+        return await crud.get_team(db, team_id)
+    except crud.TeamError:
+        raise _not_found(team_id)
+
+
+@router.get("/{team_id}/members", response_model=TeamMemberPage)
+async def team_members(
+    team_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    with_total: bool = False,
+    principal: Principal = Depends(require(Permission.team_read, "team_id")),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if await crud.get_team_state(db, team_id) is None:
+        raise _not_found(team_id)
+    try:
+        # Validators cover the requested page only; total_estimate is left out
+        state = await crud.get_members_state(db, team_id, cursor=cursor, limit=limit)
+        validators = Validators.of(
+            "team_members", team_id, state.next_cursor, state.prev_cursor,
+            [(row.id, row.modified_at) for row in state.items],
+            last_modified=max((row.modified_at for row in state.items), default=None),
+        )
+        not_modified = conditional.evaluate(request, response, validators, cache_control=PRIVATE)
+        if not_modified is not None:
+            return not_modified
+        return await crud.get_members(db, team_id, cursor=cursor, limit=limit, with_total=with_total)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except crud.TeamError:
+        raise _not_found(team_id)
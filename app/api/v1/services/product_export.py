@@ -0,0 +1,136 @@
+"""
+Streaming export of the product catalog as NDJSON or CSV.
+
+Rows come from a server-side cursor, EXPORT_BATCH_SIZE at a time
+(`stream()` with `yield_per`), and only the exported columns are selected,
+so no ORM object is built. Each batch is encoded, optionally gzipped, and
+sent as soon as it is fetched: memory is bounded by the batch size, not the
+catalog size, and the first bytes leave after the first fetch.
+
+The CSV layout is the one the import reads (tags pipe-separated, attributes
+a JSON object), so an export can be edited and imported back; the import
+ignores the read-only `id`, `version` and `updated_at` columns.
+"""
+import csv
+import io
+import json
+import time
+import zlib
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.crud.categories import in_subtree
+from app.models.category import Category
+from app.models.product import Product
+
+FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+EXPORT_COLUMNS = (
+    Product.id, Product.sku, Product.name, Product.description, Product.price, Product.stock,
+    Product.brand, Product.category_id, Product.tags, Product.attributes, Product.version,
+    Product.updated_at,
+)
+CSV_HEADER = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+def export_query(category_id: Optional[int] = None):
+    """Active products by id, optionally restricted to a category subtree."""
+    query = select(*EXPORT_COLUMNS).where(Product.is_active.is_(True)).order_by(Product.id)
+    if category_id is not None:
+        root_path = select(Category.path).where(Category.id == category_id).scalar_subquery()
+        query = query.where(Product.category_id.in_(
+            select(Category.id).where(in_subtree(root_path), Category.is_active.is_(True))
+        ))
+    return query
+
+
+def _ndjson_batch(rows) -> str:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({
+            "id": row.id,
+            "sku": row.sku,
+            "name": row.name,
+            "description": row.description,
+            "price": str(row.price),
+            "stock": row.stock,
+            "brand": row.brand,
+            "category_id": row.category_id,
+            "tags": row.tags or [],
+            "attributes": row.attributes,
+            "version": row.version,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }, separators=(",", ":"), ensure_ascii=False))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _csv_batch(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow((
+            row.id,
+            row.sku,
+            row.name,
+            row.description,
+            row.price,
+            row.stock,
+            row.brand,
+            row.category_id,
+            "|".join(row.tags or ()),
+            json.dumps(row.attributes, ensure_ascii=False) if row.attributes is not None else None,
+            row.version,
+            row.updated_at.isoformat() if row.updated_at else None,
+        ))
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_HEADER)
+    return buffer.getvalue()
+
+
+async def export_products(
+    db: AsyncSession,
+    fmt: str,
+    category_id: Optional[int] = None,
+    gzip: bool = False,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield the export as encoded chunks, one per fetched batch."""
+    encode = _csv_batch if fmt == "csv" else _ndjson_batch
+    # wbits=31: gzip container; every chunk is sync-flushed so clients can
+    # decompress what they have received so far
+    compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if gzip else None
+
+    def output(text: str) -> bytes:
+        data = text.encode("utf-8")
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    started = time.perf_counter()
+    rows = 0
+    if fmt == "csv":
+        yield output(_csv_header())
+    result = await db.stream(export_query(category_id).execution_options(yield_per=batch_size))
+    async for batch in result.partitions():
+        rows += len(batch)
+        yield output(encode(batch))
+    if compressor is not None:
+        yield compressor.flush()
+
+    logger.info("product export finished", extra={"extra": {
+        "format": fmt,
+        "category_id": category_id,
+        "gzip": gzip,
+        "rows": rows,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }})
@@ -0,0 +1,297 @@
+"""
+Streaming bulk import of products from CSV or NDJSON.
+
+The file is read row by row, validated in batches with `ProductImportRow`,
+and each batch of valid rows is loaded with COPY into a temporary staging
+table. Once the whole file is staged, a single INSERT ... ON CONFLICT (sku)
+merges it into `products`, bringing soft-deleted products whose SKU is
+imported back to life. The import runs in one transaction, so a failure
+leaves the catalog untouched. Memory use is bounded by the batch size, not
+the file size.
+
+Rows that fail validation, have columns the import does not know or name a
+missing or inactive category are written to a CSV error file instead of
+being imported. The read-only columns of an export (`id`, `version`,
+`updated_at`) are accepted and ignored, so an exported file imports back.
+"""
+import csv
+import io
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.database.sync.session import get_engine
+from app.schemas.product import ImportBatchProgress, ImportReport, ProductImportRow
+
+FORMATS = ("csv", "ndjson")
+
+# Written by the export (product_export.EXPORT_COLUMNS) but never imported
+EXPORT_ONLY_COLUMNS = frozenset({"id", "version", "updated_at"})
+
+# Column order shared by the staging table and the COPY payload
+STAGING_COLUMNS = (
+    "line_no", "sku", "name", "description", "price", "stock",
+    "brand", "category_id", "tags", "attributes",
+)
+
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE product_import_staging (
+        line_no integer NOT NULL,
+        sku varchar(64) NOT NULL,
+        name varchar(255) NOT NULL,
+        description text,
+        price numeric(12, 2) NOT NULL,
+        stock integer NOT NULL,
+        brand varchar(100),
+        category_id integer,
+        tags jsonb,
+        attributes jsonb
+    ) ON COMMIT DROP
+"""
+
+COPY_SQL = (
+    f"COPY product_import_staging ({', '.join(STAGING_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+# Rows pointing at a missing or deactivated category would make the merge
+# fail on fk_products_category_id; they are taken out and reported instead
+REJECT_UNKNOWN_CATEGORIES_SQL = """
+    DELETE FROM product_import_staging s
+    WHERE s.category_id IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM categories c WHERE c.id = s.category_id AND c.is_active
+      )
+    RETURNING s.line_no, s.sku, s.category_id
+"""
+
+# When a SKU appears several times in the file the last occurrence wins;
+# (xmax = 0) is true for freshly inserted rows, false for updated ones.
+# Importing the SKU of a soft-deleted product brings it back (is_active);
+# `inactive` is read from the snapshot before the upsert, so those rows are
+# counted as reactivated, apart from the plain updates.
+MERGE_SQL = """
+    WITH inactive AS (
+        SELECT p.sku FROM products p
+        WHERE p.is_active IS NOT TRUE
+          AND p.sku IN (SELECT s.sku FROM product_import_staging s)
+    ),
+    merged AS (
+        INSERT INTO products (
+            sku, name, description, price, stock, brand, category_id, tags,
+            attributes, is_active, version, created_at
+        )
+        SELECT DISTINCT ON (s.sku)
+            s.sku, s.name, s.description, s.price, s.stock, s.brand, s.category_id,
+            ARRAY(SELECT jsonb_array_elements_text(s.tags)), s.attributes,
+            true, 1, now()
+        FROM product_import_staging s
+        ORDER BY s.sku, s.line_no DESC
+        ON CONFLICT (sku) DO UPDATE SET
+            name = EXCLUDED.name,
+            description = EXCLUDED.description,
+            price = EXCLUDED.price,
+            stock = EXCLUDED.stock,
+            brand = EXCLUDED.brand,
+            category_id = EXCLUDED.category_id,
+            tags = EXCLUDED.tags,
+            attributes = EXCLUDED.attributes,
+            is_active = true,
+            version = products.version + 1,
+            updated_at = now()
+        RETURNING sku, (xmax = 0) AS inserted
+    )
+    SELECT count(*) FILTER (WHERE m.inserted),
+           count(*) FILTER (WHERE NOT m.inserted AND i.sku IS NULL),
+           count(i.sku)
+    FROM merged m
+    LEFT JOIN inactive i ON i.sku = m.sku
+"""
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename: Optional[str], explicit: Optional[str] = None) -> str:
+    fmt = (explicit or Path(filename or "").suffix.lstrip(".")).lower()
+    if fmt in ("jsonl", "json"):
+        fmt = "ndjson"
+    if fmt not in FORMATS:
+        raise ImportFormatError(f"Unsupported import format '{fmt}', expected one of {FORMATS}")
+    return fmt
+
+
+def iter_rows(stream: BinaryIO, fmt: str) -> Iterator[tuple]:
+    """
+    Yield (line_no, raw row) pairs without reading the whole file. A file that
+    is not UTF-8 or not parseable as CSV raises ImportFormatError: retrying
+    or skipping rows cannot fix it.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line_no = 0
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                line_no = reader.line_num
+                yield line_no, row
+        else:
+            for line_no, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, e
+    except UnicodeDecodeError as e:
+        # Decoding runs ahead in chunks, so there is no reliable line to report
+        raise ImportFormatError(f"File is not valid UTF-8: {e.reason}") from e
+    except csv.Error as e:
+        raise ImportFormatError(f"Malformed CSV after line {line_no}: {e}") from e
+    finally:
+        # Hand the stream back to the caller instead of closing it with the wrapper
+        text.detach()
+
+
+def _check_columns(raw: dict):
+    """Refuse fields the import does not know instead of dropping them silently."""
+    if None in raw:
+        # csv.DictReader files cells beyond the header under None
+        raise ValueError("row has more cells than the header has columns")
+    unknown = sorted(set(raw) - set(ProductImportRow.model_fields) - EXPORT_ONLY_COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown columns: {', '.join(map(str, unknown))}")
+
+
+def _copy_payload(rows: list) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line_no, row in rows:
+        writer.writerow((
+            line_no,
+            row.sku,
+            row.name,
+            row.description,
+            row.price,
+            row.stock,
+            row.brand,
+            row.category_id,
+            json.dumps(row.tags),
+            json.dumps(row.attributes) if row.attributes is not None else None,
+        ))
+    buffer.seek(0)
+    return buffer
+
+
+def _format_error(error) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+def import_products(
+    stream: BinaryIO,
+    fmt: str,
+    batch_size: int = settings.IMPORT_BATCH_SIZE,
+    on_progress: Optional[Callable[[ImportBatchProgress], None]] = None,
+) -> ImportReport:
+    """Stream `stream` into products; invalid rows go to a CSV error file."""
+    import_id = uuid.uuid4().hex
+    error_dir = Path(settings.IMPORT_ERROR_DIR)
+    error_path = error_dir / f"{import_id}_errors.csv"
+    error_file = None
+    error_writer = None
+
+    started = time.perf_counter()
+    total = valid = invalid = batches = 0
+
+    raw_conn = get_engine().raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        cursor.execute(CREATE_STAGING_SQL)
+
+        def write_error(line_no: int, sku: Optional[str], error: str):
+            nonlocal invalid, error_file, error_writer
+            if error_writer is None:
+                error_dir.mkdir(parents=True, exist_ok=True)
+                error_file = open(error_path, "w", newline="", encoding="utf-8")
+                error_writer = csv.writer(error_file)
+                error_writer.writerow(("line_no", "sku", "error"))
+            error_writer.writerow((line_no, sku, error))
+            invalid += 1
+
+        def flush(batch: list):
+            nonlocal valid, batches
+            good = []
+            for line_no, raw in batch:
+                try:
+                    if isinstance(raw, Exception):
+                        raise raw
+                    if isinstance(raw, dict):
+                        _check_columns(raw)
+                    good.append((line_no, ProductImportRow.model_validate(raw)))
+                except (ValidationError, ValueError) as e:
+                    sku = raw.get("sku") if isinstance(raw, dict) else None
+                    write_error(line_no, sku, _format_error(e))
+            if good:
+                cursor.copy_expert(COPY_SQL, _copy_payload(good))
+                valid += len(good)
+            batches += 1
+            if on_progress is not None:
+                on_progress(ImportBatchProgress(
+                    batch=batches,
+                    rows_read=total,
+                    valid_rows=valid,
+                    invalid_rows=invalid,
+                    elapsed_seconds=round(time.perf_counter() - started, 3),
+                ))
+
+        batch = []
+        for line_no, raw in iter_rows(stream, fmt):
+            batch.append((line_no, raw))
+            total += 1
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        if valid:
+            cursor.execute(REJECT_UNKNOWN_CATEGORIES_SQL)
+            for line_no, sku, category_id in cursor:
+                write_error(line_no, sku, f"category_id: category {category_id} not found")
+                valid -= 1
+
+        inserted = updated = reactivated = 0
+        if valid:
+            cursor.execute(MERGE_SQL)
+            inserted, updated, reactivated = cursor.fetchone()
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+        if error_file is not None:
+            error_file.close()
+
+    return ImportReport(
+        import_id=import_id,
+        total_rows=total,
+        valid_rows=valid,
+        invalid_rows=invalid,
+        inserted=inserted,
+        updated=updated,
+        reactivated=reactivated,
+        batches=batches,
+        duration_seconds=round(time.perf_counter() - started, 3),
+        error_file=str(error_path) if invalid else None,
+    )
@@ -0,0 +1,164 @@
+"""
+Entity audit trail: who changed which columns of which entity, and when.
+
+ORM writes to the audited models are captured from session events, with no
+extra query: `after_flush` reads each object's attribute history (the old
+value is whatever was loaded, null when it was never loaded) and buffers
+one entry per object in `session.info`. `before_commit` flushes what is
+left and writes the whole buffer with one multi-row INSERT in the same
+transaction, so an entry exists exactly when its change was committed.
+A rolled back savepoint only drops the entries buffered since it began;
+the buffer goes away with the outermost transaction.
+
+Set-based writes (UPDATE ... FROM unnest, bulk price updates, approvals)
+bypass the ORM; they call `record()` with the diffs they already have.
+
+The actor is taken from `audit_actor`, set by `get_current_user` for the
+current request (tasks may set it themselves).
+"""
+import contextvars
+import enum
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.models.audit import AuditEntry
+from app.models.category import Category
+from app.models.product import Product
+from app.models.user import Team, TeamMember, User
+
+# Audited models -> entity type name
+AUDITED = {
+    User: "user",
+    Team: "team",
+    TeamMember: "team_member",
+    Product: "product",
+    Category: "category",
+}
+# Never recorded (noise or derived); REDACTED are recorded as changed, without values
+IGNORED_COLUMNS = frozenset({"updated_at", "created_at", "added_at", "search_vector"})
+REDACTED_COLUMNS = frozenset({"password_hash"})
+REDACTED = "[redacted]"
+
+BUFFER_KEY = "audit_buffer"
+SAVEPOINTS_KEY = "audit_savepoints"   # open savepoint -> buffer length when it began
+
+audit_actor: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("audit_actor", default=None)
+
+
+def _json_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    return value
+
+
+def _entry(entity_type: str, entity_id, action: str, changes: dict) -> dict:
+    return {
+        "actor_id": audit_actor.get(),
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "changes": changes,
+    }
+
+
+def _column_changes(obj, inserted: bool) -> dict:
+    changes = {}
+    state = inspect(obj)
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if key in IGNORED_COLUMNS:
+            continue
+        history = state.attrs[key].history
+        if inserted:
+            value = state.dict.get(key)
+            if value is not None:
+                changes[key] = [None, REDACTED if key in REDACTED_COLUMNS else _json_value(value)]
+            continue
+        if not history.has_changes():
+            continue
+        if key in REDACTED_COLUMNS:
+            changes[key] = [REDACTED, REDACTED]
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            changes[key] = [_json_value(old), _json_value(new)]
+    return changes
+
+
+def _buffer(session: Session) -> list:
+    return session.info.setdefault(BUFFER_KEY, [])
+
+
+def record(session, entity_type: str, entity_id, action: str, changes: dict):
+    """Buffer an entry for a write done outside the ORM (AsyncSession or Session)."""
+    session = getattr(session, "sync_session", session)
+    _buffer(session).append(_entry(entity_type, entity_id, action, {
+        key: [_json_value(old), _json_value(new)] for key, (old, new) in changes.items()
+    }))
+
+
+# -----------------------------
+# Session hooks
+# -----------------------------
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context):
+    entries = None
+    for objects, action in ((session.new, "insert"), (session.dirty, "update"), (session.deleted, "delete")):
+        for obj in objects:
+            entity_type = AUDITED.get(type(obj))
+            if entity_type is None:
+                continue
+            changes = {} if action == "delete" else _column_changes(obj, inserted=action == "insert")
+            if action == "update" and not changes:
+                continue
+            if entries is None:
+                entries = _buffer(session)
+            # Identity keys of new objects are only assigned after this hook
+            entity_id = inspect(obj).mapper.primary_key_from_instance(obj)[0]
+            entries.append(_entry(entity_type, entity_id, action, changes))
+
+
+@event.listens_for(Session, "before_commit")
+def _write(session: Session):
+    # Commit flushes after this hook; flush now so the last changes are buffered too
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    entries = session.info.pop(BUFFER_KEY, None)
+    if entries:
+        session.execute(insert(AuditEntry), entries)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _mark_savepoint(session: Session, transaction):
+    if transaction.nested:
+        session.info.setdefault(SAVEPOINTS_KEY, {})[transaction] = len(_buffer(session))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard(session: Session, previous_transaction):
+    # Also fires for savepoints: only what they buffered is thrown away
+    if previous_transaction.nested:
+        mark = session.info.get(SAVEPOINTS_KEY, {}).pop(previous_transaction, None)
+        if mark is not None:
+            del _buffer(session)[mark:]
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget(session: Session, transaction):
+    if transaction.nested:
+        session.info.get(SAVEPOINTS_KEY, {}).pop(transaction, None)
+    elif transaction.parent is None:
+        # Committed (already written) or rolled back: nothing carries over
+        session.info.pop(BUFFER_KEY, None)
+        session.info.pop(SAVEPOINTS_KEY, None)
@@ -0,0 +1,40 @@
+from app.core.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from app.core.cache.cache import TwoTierCache, cached, make_key
+from app.core.config import settings
+
+_cache = None
+
+
+def get_cache() -> TwoTierCache:
+    """Return the process-wide cache, creating it from settings on first use."""
+    global _cache
+    if _cache is None:
+        if settings.REDIS_URL:
+            backend = RedisBackend(settings.REDIS_URL, prefix=settings.CACHE_KEY_PREFIX)
+        else:
+            backend = MemoryBackend()
+        _cache = TwoTierCache(
+            backend,
+            l1_size=settings.CACHE_L1_SIZE,
+            l1_ttl=settings.CACHE_L1_TTL,
+            default_ttl=settings.CACHE_DEFAULT_TTL,
+        )
+    return _cache
+
+
+def set_cache(cache: TwoTierCache):
+    """Replace the process-wide cache (e.g. with a MemoryBackend one in tests)."""
+    global _cache
+    _cache = cache
+
+
+__all__ = [
+    "CacheBackend",
+    "MemoryBackend",
+    "RedisBackend",
+    "TwoTierCache",
+    "cached",
+    "get_cache",
+    "make_key",
+    "set_cache",
+]
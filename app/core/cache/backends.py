@@ -0,0 +1,139 @@
+import asyncio
+import time
+
+
+class CacheBackend:
+    """
+    Interface of the shared (L2) cache tier.
+
+    Values are opaque bytes. Tags map to the set of keys stored under them so a
+    write to one entity can evict every cached list containing it.
+    """
+
+    async def get(self, key: str):
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float, tags=()):
+        raise NotImplementedError
+
+    async def delete(self, *keys: str):
+        raise NotImplementedError
+
+    async def invalidate_tags(self, *tags: str) -> list:
+        """Delete every key stored under `tags`, return the deleted keys."""
+        raise NotImplementedError
+
+    async def publish_invalidation(self, keys: list):
+        """Tell other workers to drop `keys` from their L1 (no-op if single process)."""
+
+    async def listen_invalidations(self, callback):
+        """Call `callback(keys)` for invalidations published by other workers."""
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local backend for tests and single-worker development."""
+
+    def __init__(self):
+        self._data = {}   # key -> (expires_at, value)
+        self._tags = {}   # tag -> set(keys)
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, tags=()):
+        async with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    async def delete(self, *keys: str):
+        async with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    async def invalidate_tags(self, *tags: str) -> list:
+        async with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.pop(tag, set())
+            for key in keys:
+                self._data.pop(key, None)
+        return list(keys)
+
+
+class RedisBackend(CacheBackend):
+    """Redis backend; tag sets live next to the values, invalidations go over pub/sub."""
+
+    CHANNEL = "cache:invalidate"
+
+    def __init__(self, url: str, prefix: str = "cf"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:v:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self._prefix}:t:{tag}"
+
+    async def get(self, key: str):
+        return await self._redis.get(self._key(key))
+
+    async def set(self, key: str, value: bytes, ttl: float, tags=()):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._key(key), value, px=int(ttl * 1000))
+            for tag in tags:
+                pipe.sadd(self._tag(tag), key)
+                # Tag sets must outlive the values they point at
+                pipe.expire(self._tag(tag), int(ttl) + 60, gt=True)
+                pipe.expire(self._tag(tag), int(ttl) + 60, nx=True)
+            await pipe.execute()
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._redis.delete(*(self._key(k) for k in keys))
+
+    async def invalidate_tags(self, *tags: str) -> list:
+        if not tags:
+            return []
+        tag_keys = [self._tag(t) for t in tags]
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.sunion(*tag_keys)
+            pipe.delete(*tag_keys)
+            members, _ = await pipe.execute()
+        keys = [m.decode() if isinstance(m, bytes) else m for m in members]
+        await self.delete(*keys)
+        return keys
+
+    async def publish_invalidation(self, keys: list):
+        if keys:
+            await self._redis.publish(self.CHANNEL, "\n".join(keys))
+
+    async def listen_invalidations(self, callback):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode()
+                if data:
+                    callback(data.split("\n"))
+        finally:
+            await pubsub.aclose()
+
+    async def close(self):
+        await self._redis.aclose()
@@ -0,0 +1,251 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache.backends import CacheBackend
+from app.utils.ttl_lru import TTLLRUCache
+
+
+class TwoTierCache:
+    """
+    Read-through cache: in-process LRU (L1) in front of a shared backend (L2).
+
+    - L1 holds decoded values for a short TTL, so hot keys cost a dict lookup.
+      Values returned from L1 are shared between callers and must not be mutated.
+    - L2 (Redis, or `MemoryBackend` in tests) holds JSON for the full TTL and
+      the tag -> keys index used by `invalidate_tags`.
+    - Concurrent misses on one key in this process are coalesced into a single
+      load (single-flight), so an expired hot key does not stampede the DB.
+    """
+
+    def __init__(self, backend: CacheBackend, l1_size: int = 2048, l1_ttl: float = 5.0, default_ttl: float = 300.0):
+        self.backend = backend
+        self.l1 = TTLLRUCache(maxsize=l1_size, ttl=l1_ttl, on_evict=self._untag)
+        self.l1_ttl = l1_ttl
+        self.default_ttl = default_ttl
+        self._l1_tags = {}    # tag -> set(keys) held in L1
+        self._l1_key_tags = {}  # key -> set(tags), to prune the above when L1 drops a key
+        self._inflight = {}   # key -> asyncio.Future of the running load
+        self._generation = 0  # bumped on every invalidation
+        self._listener = None
+
+        # Counters
+        self._stats_lock = threading.Lock()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    async def get(self, key: str, default=None):
+        value = self.l1.get(key, _MISS)
+        if value is not _MISS:
+            self._count("l1_hits")
+            return value
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            # A cache outage degrades to a miss, never to an error
+            self._count("errors")
+            raw = None
+        if raw is None:
+            self._count("misses")
+            return default
+        self._count("l2_hits")
+        value = json.loads(raw)
+        self.l1.set(key, value)
+        return value
+
+    async def get_or_load(self, key: str, loader, ttl: float = None, tags=()):
+        """Return the cached value for `key`, calling `await loader()` once on a miss."""
+        value = await self.get(key, _MISS)
+        if value is not _MISS:
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count("coalesced")
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self._count("loads")
+            generation = self._generation
+            value = jsonable_encoder(await loader())
+            # Don't store a value that may predate an invalidation issued while loading
+            if generation == self._generation:
+                await self.set(key, value, ttl=ttl, tags=tags)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # -------------------------
+    # Writes / invalidation
+    # -------------------------
+    async def set(self, key: str, value, ttl: float = None, tags=()):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.l1.set(key, value, ttl=min(ttl, self.l1_ttl))
+        for tag in tags:
+            self._l1_tags.setdefault(tag, set()).add(key)
+        if tags:
+            self._l1_key_tags.setdefault(key, set()).update(tags)
+        try:
+            await self.backend.set(key, json.dumps(value).encode(), ttl, tags)
+        except Exception:
+            self._count("errors")
+
+    async def delete(self, *keys: str):
+        self._drop_local(keys)
+        try:
+            await self.backend.delete(*keys)
+            await self.backend.publish_invalidation(list(keys))
+        except Exception:
+            self._count("errors")
+
+    async def invalidate_tags(self, *tags: str):
+        """Evict every entry stored under any of `tags`, in every tier and worker."""
+        keys = set()
+        for tag in tags:
+            keys |= self._l1_tags.pop(tag, set())
+        try:
+            keys |= set(await self.backend.invalidate_tags(*tags))
+            await self.backend.publish_invalidation(list(keys))
+        except Exception:
+            self._count("errors")
+        self._drop_local(keys)
+        self._count("invalidations")
+
+    def _drop_local(self, keys):
+        self._generation += 1
+        for key in keys:
+            self.l1.pop(key)
+            self._untag(key)
+
+    def _untag(self, key: str):
+        """Forget `key` in the L1 tag index once L1 no longer holds it."""
+        for tag in self._l1_key_tags.pop(key, ()):
+            keys = self._l1_tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._l1_tags[tag]
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self):
+        """Start listening for invalidations published by other workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self.backend.listen_invalidations(self._drop_local))
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = {
+                "l1_hits": self.l1_hits,
+                "l2_hits": self.l2_hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+        stats["l1_size"] = len(self.l1)
+        stats["l1_tagged_keys"] = len(self._l1_key_tags)
+        return stats
+
+
+_MISS = object()
+
+
+def _key_value(value):
+    # json.dumps fallback for argument types without a JSON form of their own
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (Decimal, date)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot build a cache key from a {type(value).__name__} argument")
+
+
+def make_key(namespace: str, args: tuple, kwargs: dict) -> str:
+    """
+    Build a stable key from every argument of a call. Values without a stable
+    JSON form raise TypeError rather than being left out of the key, which
+    would let different calls share an entry.
+    """
+    raw = json.dumps([list(args), kwargs], sort_keys=True, separators=(",", ":"), default=_key_value)
+    if len(raw) > 128:
+        raw = hashlib.sha1(raw.encode()).hexdigest()
+    return f"{namespace}:{raw}"
+
+
+def cached(namespace: str, ttl: float = None, tags=(), exclude=(), key_builder=None, cache_getter=None):
+    """
+    Cache the result of an async function (service or read endpoint).
+
+    The key is built with `make_key` from every argument except those named
+    in `exclude` (sessions, requests, principals), so an argument that cannot
+    be keyed raises instead of being ignored. `tags` is a list of tag names or
+    a callable `(args, kwargs) -> tags`. The wrapped function keeps its
+    signature, so FastAPI dependencies still work.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        unknown = set(exclude) - set(signature.parameters)
+        if unknown:
+            raise ValueError(f"{func.__name__} has no parameters {', '.join(sorted(unknown))}")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if cache_getter is not None:
+                cache = cache_getter()
+            else:
+                from app.core.cache import get_cache
+                cache = get_cache()
+            if key_builder is not None:
+                key = key_builder(*args, **kwargs)
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = make_key(namespace, (), {k: v for k, v in bound.arguments.items() if k not in exclude})
+            entry_tags = tags(args, kwargs) if callable(tags) else tags
+            return await cache.get_or_load(key, lambda: func(*args, **kwargs), ttl=ttl, tags=entry_tags)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,87 @@
+"""
+Conditional GET: weak ETag / Last-Modified validators and 304 responses.
+
+A read endpoint computes its validators first, from a narrow query (an
+entity's version, or a list's row count and latest modification time), and
+hands them to `evaluate`. When the client's If-None-Match (or, without it,
+If-Modified-Since) still matches, `evaluate` returns the 304 right away and
+the endpoint returns it without loading or serializing the rows. Otherwise
+the validators are set on the response and the endpoint carries on.
+
+ETags are weak: they identify the data a response was built from, not its
+bytes. They also cover the app version, so a deploy that changes a
+response's shape does not answer 304 to a client holding the old one.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def of(cls, scope: str, *parts, last_modified: Optional[datetime] = None) -> "Validators":
+        """Validators for the data identified by `parts` (versions, counts, timestamps)."""
+        state = repr((settings.PROJECT_VERSION, scope, parts)).encode()
+        return cls(f'W/"{hashlib.blake2b(state, digest_size=12).hexdigest()}"', last_modified)
+
+    def headers(self, cache_control: str) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): the W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _unmodified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return last_modified.replace(microsecond=0) <= since
+
+
+def evaluate(
+    request: Request,
+    response: Response,
+    validators: Validators,
+    cache_control: str = "no-cache",
+) -> Optional[Response]:
+    """
+    The 304 to return when the client's copy is current; otherwise None,
+    after setting ETag / Last-Modified / Cache-Control on `response`.
+    "no-cache" lets clients keep a copy but revalidate it on every use.
+    """
+    headers = validators.headers(cache_control)
+    if request.method in ("GET", "HEAD"):
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            fresh = _etag_matches(if_none_match, validators.etag)
+        elif if_modified_since is not None and validators.last_modified is not None:
+            fresh = _unmodified_since(if_modified_since, validators.last_modified)
+        else:
+            fresh = False
+        if fresh:
+            return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
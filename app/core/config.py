@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,12 +9,73 @@ class Settings(BaseSettings):
     APP_ENV: str = "development"
     LOG_LEVEL: str = "INFO"
 
+    # DB log sink (batched, see app/core/logger_db_handler.py)
+    LOG_DB_QUEUE_SIZE: int = 10000
+    LOG_DB_BATCH_SIZE: int = 500
+    LOG_DB_FLUSH_INTERVAL: float = 1.0     # seconds
+    LOG_DB_OVERFLOW_POLICY: str = "drop"   # drop | sample | block
+    LOG_DB_SAMPLE_RATE: int = 10           # keep 1 in N records under pressure ("sample")
+    LOG_DB_BLOCK_TIMEOUT: float = 0.05     # max wait for queue room ("block")
+
+    # logs table partitions (see app/tasks/log_partitions.py)
+    LOG_RETENTION_DAYS: int = 30
+    LOG_PARTITION_PREMAKE_DAYS: int = 7
+
+    # Per-request logging from the timing middleware (see app/core/metrics.py)
+    REQUEST_LOG_SAMPLE_RATE: float = 0.0   # share of requests logged, 0 disables
+    REQUEST_LOG_SLOW_MS: float = 1000.0    # always log slower requests, 0 disables
+
     # Database
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0          # seconds to wait for a connection before failing
+    DB_POOL_RECYCLE: int = 1800            # seconds before a connection is replaced, -1 to never
+    DB_POOL_PRE_PING: bool = True          # test connections on checkout
+    DB_POOL_WARMUP: int = 10               # connections opened concurrently at startup, 0 to skip
+    DB_PGBOUNCER: bool = False             # behind PgBouncer transaction pooling: no prepared statements
+
+    # Read replicas (see app/database/asyncio/replicas.py); same credentials as the primary
+    DB_REPLICA_HOSTS: str = ""             # comma-separated host[:port], empty sends all reads to the primary
+    DB_REPLICA_BALANCING: str = "round_robin"  # round_robin | least_connections
+    DB_REPLICA_MAX_LAG: float = 5.0        # seconds of replay lag before a replica is skipped
+    DB_REPLICA_HEALTH_INTERVAL: float = 5.0    # seconds between replica health / lag checks
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # reads stay on the primary this long after a client's write
+
+    # Cache (see app/core/cache); no REDIS_URL means a process-local backend
+    REDIS_URL: str = ""
+    CACHE_KEY_PREFIX: str = "catalogflow"
+    CACHE_L1_SIZE: int = 2048              # entries kept in-process
+    CACHE_L1_TTL: float = 5.0              # seconds, bounds cross-worker staleness
+    CACHE_DEFAULT_TTL: float = 300.0       # seconds in Redis
+
+    # Bulk product import (see app/api/v1/services/product_import.py)
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_ERROR_DIR: str = "import_errors"
+    BULK_UPDATE_CHUNK_SIZE: int = 1000     # rows per UPDATE statement
+
+    # Streaming catalog export (see app/api/v1/services/product_export.py)
+    EXPORT_BATCH_SIZE: int = 2000          # rows fetched per server-side cursor round trip
+    EXPORT_GZIP_LEVEL: int = 5             # 1 (fastest) .. 9 (smallest)
+
+    # Background jobs (see app/tasks/queue.py); run workers with `python -m app.tasks.worker`
+    JOB_CONCURRENCY: int = 4               # jobs run at once by one worker process (threads)
+    JOB_POLL_INTERVAL: float = 1.0         # seconds between claims while the queue is empty
+    JOB_VISIBILITY_TIMEOUT: float = 300.0  # seconds a claimed job stays hidden without a heartbeat
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE: float = 10.0           # seconds before the first retry, doubled per attempt
+    JOB_RETRY_MAX: float = 3600.0          # cap of the retry delay
+    JOB_RETENTION_DAYS: int = 7            # finished jobs older than this are pruned
+    JOB_FILES_DIR: str = "job_files"       # uploads handed to jobs; shared by API and worker hosts
+
+    # Product search (see app/crud/search.py)
+    SEARCH_MAX_MATCHES: int = 2000         # best-scoring matches kept for hits and facets
+    SEARCH_FACET_LIMIT: int = 20           # values returned per facet
+    SEARCH_CACHE_TTL: float = 30.0         # seconds
 
     # Security
     SECRET_KEY: str
@@ -20,6 +83,28 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES :int= 30
     REFRESH_TOKEN_EXPIRE_DAYS:int = 7
+    PAGINATION_CURSOR_SECRET: str = ""     # signs list cursors, defaults to SECRET_KEY
+
+    # Verified access token cache (see app/core/dependencies.py)
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: float = 60.0          # seconds
+
+    # Refresh sessions and revocation (see app/core/revocation.py)
+    REVOCATION_SYNC_INTERVAL: float = 30.0 # seconds between reloads, bounds cross-worker lag without Redis
+    SESSION_RETENTION_DAYS: int = 30       # expired sessions older than this are pruned
+
+    # Rate limiting (see app/core/rate_limit.py); buckets are shared through Redis when REDIS_URL is set
+    RATE_LIMIT_ROUTES: dict = {            # "METHOD /path": {"ip": "N/period", "account": "N/period"}, {} disables
+        "POST /api/v1/auth/login": {"ip": "30/minute", "account": "10/minute"},
+        "POST /api/v1/auth/refresh": {"ip": "60/minute"},
+    }
+    RATE_LIMIT_PROXY_HOPS: int = 0         # trusted proxies appending to X-Forwarded-For, 0 uses the peer address
+    RATE_LIMIT_MEMORY_KEYS: int = 100000   # in-process buckets kept per worker
+
+    # Password hashing process pool (see app/utils/password_pool.py)
+    PASSWORD_POOL_WORKERS: int = os.cpu_count() or 2
+    PASSWORD_POOL_MAX_QUEUE: int = 64      # waiting jobs before logins get 503
+    PASSWORD_POOL_RETRY_AFTER: int = 1     # seconds, sent in Retry-After
 
     class Config:
         env_file = ".env"
@@ -28,4 +113,16 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg2://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    @property
+    def ASYNC_REPLICA_URLS(self) -> list:
+        urls = []
+        for host in filter(None, (h.strip() for h in self.DB_REPLICA_HOSTS.split(","))):
+            host, _, port = host.partition(":")
+            urls.append(f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{host}:{port or self.DB_PORT}/{self.DB_NAME}")
+        return urls
+
 settings = Settings()
@@ -0,0 +1,177 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import audit
+from app.core.config import settings
+from app.core.permissions import Permission, allows, decode_memberships, permission_matrix
+from app.core.revocation import revocations
+from app.crud.sessions import revoke_user_sessions
+from app.database.asyncio.session import new_async_session
+from app.models.user import GlobalRole, User
+from app.utils.ttl_lru import TTLLRUCache
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Snapshot of the authenticated user taken when the token was verified."""
+    user_id: int
+    global_role: GlobalRole
+    is_active: bool
+    token_version: int
+    # Login session the token belongs to ("sid"), revoked by logout
+    session_id: Optional[str] = None
+    # Compiled permission bitmasks: outside any team, and per team membership
+    global_mask: int = 0
+    team_masks: Dict[int, int] = field(default_factory=dict)
+
+    def can(self, permission: Permission, team_id: Optional[int] = None) -> bool:
+        mask = self.global_mask if team_id is None else self.team_masks.get(team_id, self.global_mask)
+        return allows(mask, permission)
+
+    def team_ids_with(self, permission: Permission) -> Optional[List[int]]:
+        """Teams where `permission` is held; None means every team (org-wide roles)."""
+        if allows(self.global_mask, permission):
+            return None
+        return sorted(team_id for team_id, mask in self.team_masks.items() if allows(mask, permission))
+
+
+# Verified access token -> Principal. Entries never outlive the token itself.
+# Revocations are checked against `revocations` on every hit, not by a cache scan.
+_token_cache = TTLLRUCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
+
+def _credentials_exception(detail: str = "Could not validate credentials"):
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _is_revoked(principal: Principal) -> bool:
+    return revocations.is_revoked(principal.user_id, principal.token_version, principal.session_id)
+
+
+async def _load_principal(token: str) -> tuple:
+    """Verify the token signature and load the principal from the DB."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("type") != "access":
+            raise _credentials_exception("Invalid token type")
+        user_id = int(payload.get("sub"))
+        token_version = int(payload.get("ver", 0))
+        session_id = payload.get("sid")
+        expires_at = float(payload["exp"])
+        # Memberships are resolved at login/refresh, not per request
+        memberships = decode_memberships(payload.get("tm"))
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise _credentials_exception()
+
+    async with new_async_session() as db:
+        result = await db.execute(
+            select(User.global_role, User.is_active, User.token_version).where(User.id == user_id)
+        )
+        row = result.first()
+    if row is None:
+        raise _credentials_exception()
+
+    # Tokens issued before the last revocation carry an older version
+    revocations.raise_version(user_id, row.token_version)
+    if revocations.is_revoked(user_id, token_version, session_id):
+        raise _credentials_exception("Token has been revoked")
+
+    principal = Principal(
+        user_id=user_id,
+        global_role=row.global_role,
+        is_active=bool(row.is_active),
+        token_version=token_version,
+        session_id=session_id,
+        global_mask=permission_matrix.mask(row.global_role),
+        team_masks={
+            team_id: permission_matrix.mask(row.global_role, team_role)
+            for team_id, team_role in memberships.items()
+        },
+    )
+    return principal, expires_at
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Resolve the bearer token to a `Principal`.
+
+    Repeat requests with the same token are served from an in-process LRU, so
+    they skip both the signature check and the DB round-trip.
+    """
+    principal = _token_cache.get(token)
+    if principal is None:
+        principal, expires_at = await _load_principal(token)
+        # Convert the token's wall-clock expiry into a monotonic deadline
+        remaining = expires_at - time.time()
+        if remaining > 0:
+            _token_cache.set(
+                token,
+                principal,
+                expires_at=time.monotonic() + min(remaining, settings.TOKEN_CACHE_TTL),
+            )
+    elif _is_revoked(principal):
+        _token_cache.pop(token)
+        raise _credentials_exception("Token has been revoked")
+
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    # Attributes this request's writes in the audit trail
+    audit.audit_actor.set(principal.user_id)
+    return principal
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: int) -> int:
+    """
+    Invalidate every token issued to `user_id` so far.
+
+    Bumps the user's token version and revokes their refresh sessions in the
+    DB, then in the revocation list of this worker and, through Redis, of the
+    others (without Redis, within REVOCATION_SYNC_INTERVAL). Returns the new
+    version.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+    )
+    new_version = result.scalar_one()
+    audit.record(db, "user", user_id, "update", {"token_version": (new_version - 1, new_version)})
+    await revoke_user_sessions(db, user_id, "logout_all")
+    await db.commit()
+    await revocations.revoke_user(user_id, new_version)
+    return new_version
+
+
+def require(permission: Permission, team_id: Union[int, str, None] = None):
+    """
+    Dependency factory: the current principal, if it holds `permission`.
+
+    `team_id` scopes the check to a team, either a fixed id or the name of
+    a path parameter (`require(Permission.team_manage, "team_id")`).
+    """
+    def dependency(request: Request, principal: Principal = Depends(get_current_user)) -> Principal:
+        scope = team_id
+        if isinstance(scope, str):
+            try:
+                scope = int(request.path_params[scope])
+            except (KeyError, ValueError):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid team id")
+        if not principal.can(permission, scope):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Missing permission {permission.value}")
+        return principal
+
+    return dependency
@@ -4,12 +4,9 @@ from pythonjsonlogger import jsonlogger
 from pathlib import Path
 import sys
 from datetime import datetime
-from app.database.sync.session import get_db
-from app.models.logs import Log
-from app.core.logger_db_handler import DBHandler
+from app.core.logger_db_handler import BatchedDBHandler
 
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
 
 def get_log_file():
     """Return log file path based on current date."""
@@ -36,6 +33,7 @@ def setup_logger(name: str = "app", level=logging.INFO, log_to_db: bool = False)
     logger.setLevel(level)
 
     if not logger.handlers:
+        LOG_DIR.mkdir(exist_ok=True)
         log_file = get_log_file()
 
         # File handler with JSON
@@ -55,13 +53,28 @@ def setup_logger(name: str = "app", level=logging.INFO, log_to_db: bool = False)
 
         # Optional DB handler
         if log_to_db:
-            db_handler = DBHandler()
+            db_handler = BatchedDBHandler()
             db_handler.setFormatter(file_formatter)
             logger.addHandler(db_handler)
 
     return logger
 
 
+def get_db_handler(logger: logging.Logger):
+    """Return the batched DB handler attached to `logger`, if any."""
+    for handler in logger.handlers:
+        if isinstance(handler, BatchedDBHandler):
+            return handler
+    return None
+
+
+def shutdown_logger(logger: logging.Logger):
+    """Flush pending DB log records and stop the writer thread."""
+    db_handler = get_db_handler(logger)
+    if db_handler is not None:
+        db_handler.close()
+        logger.removeHandler(db_handler)
+
 
 # Custom log level for execution
 EXECUTION = 25
@@ -73,5 +86,6 @@ def log_execution(self, message, extra=None):
 
 logging.Logger.execution = log_execution
 
-# Global logger instance
-logger = setup_logger(log_to_db=True)
+# Global logger instance; its handlers (and the DB writer thread) are attached
+# by `setup_logger` during application startup, not at import time
+logger = logging.getLogger("app")
@@ -1,26 +1,238 @@
 import logging
-from app.database.sync.session import SessionLocal
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.database.sync.session import get_engine
 from app.models.logs import Log
-import json
 
-class DBHandler(logging.Handler):
+
+class OverflowPolicy:
+    DROP = "drop"      # discard the new record when the queue is full
+    SAMPLE = "sample"  # keep 1 in N records once the queue passes the high watermark
+    BLOCK = "block"    # wait up to LOG_DB_BLOCK_TIMEOUT for room, then drop
+
+
+_STOP = object()
+
+
+class BatchedDBHandler(logging.Handler):
     """
-    Custom logging handler to write logs into the database
+    Logging handler that writes logs into the database in batches.
+
+    `emit` only converts the record into a row and puts it on a bounded queue,
+    so the request thread never touches the DB. A daemon worker drains the
+    queue and writes multi-row inserts whenever `batch_size` rows are pending
+    or `flush_interval` seconds have passed, whichever comes first.
     """
+
+    def __init__(
+        self,
+        queue_size: int = settings.LOG_DB_QUEUE_SIZE,
+        batch_size: int = settings.LOG_DB_BATCH_SIZE,
+        flush_interval: float = settings.LOG_DB_FLUSH_INTERVAL,
+        overflow_policy: str = settings.LOG_DB_OVERFLOW_POLICY,
+        sample_rate: int = settings.LOG_DB_SAMPLE_RATE,
+        block_timeout: float = settings.LOG_DB_BLOCK_TIMEOUT,
+        level=logging.NOTSET,
+    ):
+        super().__init__(level)
+        if overflow_policy not in (OverflowPolicy.DROP, OverflowPolicy.SAMPLE, OverflowPolicy.BLOCK):
+            raise ValueError(f"Unknown log overflow policy: {overflow_policy}")
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_rate = max(1, sample_rate)
+        self.block_timeout = block_timeout
+        # Sampling kicks in once the queue is this full
+        self.high_watermark = max(1, int(queue_size * 0.8))
+
+        # Counters (read through `stats()`)
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.failed = 0
+        self.batches = 0
+        self._stats_lock = threading.Lock()
+
+        self._flush_requested = threading.Event()
+        self._flush_done = threading.Condition()
+        # Set by close(); the worker stops once the queue is empty, even if
+        # the _STOP sentinel never made it into a full queue
+        self._stop = threading.Event()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="log-db-writer", daemon=True)
+        self._worker.start()
+
+    # -------------------------
+    # Producer side
+    # -------------------------
     def emit(self, record: logging.LogRecord):
+        if self._closed:
+            return
+        try:
+            row = self._to_row(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        policy = self.overflow_policy
+        if policy == OverflowPolicy.SAMPLE and self.queue.qsize() >= self.high_watermark:
+            if random.randrange(self.sample_rate) != 0:
+                self._count("sampled_out")
+                return
+
         try:
-            session = SessionLocal()
-            log_entry = Log(
-                level=record.levelname,
-                message=record.getMessage(),
-                module=record.module,
-                func_name=record.funcName,
-                line_no=record.lineno,
-                extra=getattr(record, "extra", None)
+            if policy == OverflowPolicy.BLOCK:
+                self.queue.put(row, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(row)
+        except queue.Full:
+            self._count("dropped")
+            return
+        self._count("enqueued")
+
+    @staticmethod
+    def _to_row(record: logging.LogRecord) -> dict:
+        return {
+            # Keep the time the record was created, not the time it was flushed
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "func_name": record.funcName,
+            "line_no": record.lineno,
+            "extra": getattr(record, "extra", None),
+        }
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    # -------------------------
+    # Consumer side
+    # -------------------------
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if item is not None and not stop:
+                batch.append(item)
+                # Drain whatever is already waiting without blocking
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if item is not None:
+                        batch.append(item)
+            if not stop and self._stop.is_set() and self.queue.empty():
+                stop = True
+
+            flush_now = (
+                stop
+                or len(batch) >= self.batch_size
+                or time.monotonic() >= deadline
+                or self._flush_requested.is_set()
             )
-            session.add(log_entry)
-            session.commit()
+            if flush_now:
+                if self._flush_requested.is_set() and not stop:
+                    batch.extend(self._drain())
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+                with self._flush_done:
+                    self._flush_requested.clear()
+                    self._flush_done.notify_all()
+
+            if stop:
+                return
+
+    def _drain(self) -> list:
+        rows = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return rows
+            if item is _STOP:
+                # The loop stops through the event once the queue is empty
+                self._stop.set()
+                return rows
+            if item is not None:
+                rows.append(item)
+
+    def _write(self, rows: list):
+        try:
+            # executemany on a single connection; SQLAlchemy batches this into
+            # multi-row INSERT ... VALUES statements
+            with get_engine().begin() as conn:
+                conn.execute(insert(Log), rows)
         except Exception as e:
+            self._count("failed", len(rows))
             print(f"Failed to log to DB: {e}")
-        finally:
-            session.close()
+            return
+        self._count("flushed", len(rows))
+        self._count("batches")
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def flush(self, timeout: float = 5.0):
+        """Ask the worker to write everything queued so far and wait for it."""
+        if self._closed or not self._worker.is_alive():
+            return
+        with self._flush_done:
+            self._flush_requested.set()
+            # Wake the worker if it is waiting on an empty queue
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._flush_done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Stop accepting records, flush the queue and stop the worker, within `timeout` seconds."""
+        if not self._closed:
+            self._closed = True
+            deadline = time.monotonic() + timeout
+            self._stop.set()
+            try:
+                # Wakes a worker waiting on an empty queue right away
+                self.queue.put(_STOP, timeout=min(1.0, timeout))
+            except queue.Full:
+                # A full queue means a busy worker: it sees the event once drained
+                pass
+            self._worker.join(max(0.0, deadline - time.monotonic()))
+        super().close()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "queued": self.queue.qsize(),
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "sampled_out": self.sampled_out,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
@@ -0,0 +1,227 @@
+import bisect
+import random
+import threading
+import time
+
+from app.core.config import settings
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUANTILES = (0.5, 0.95, 0.99)
+# Width of the sliding window used for the throughput gauge
+THROUGHPUT_WINDOW = 60
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated within buckets."""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                # The overflow bucket has no upper bound, report its lower edge
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else lower
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return LATENCY_BUCKETS[-1]
+
+
+class RequestMetrics:
+    """In-memory request metrics keyed by (method, route template, status)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.in_flight = 0
+        self.started_at = time.time()
+        # One counter per second over the last THROUGHPUT_WINDOW seconds
+        self._window = [0] * THROUGHPUT_WINDOW
+        self._window_second = int(time.monotonic())
+
+    def _advance_window(self, now_second: int):
+        gap = now_second - self._window_second
+        if gap <= 0:
+            return
+        for i in range(1, min(gap, THROUGHPUT_WINDOW) + 1):
+            self._window[(self._window_second + i) % THROUGHPUT_WINDOW] = 0
+        self._window_second = now_second
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route, status)
+        now_second = int(time.monotonic())
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+            self._advance_window(now_second)
+            self._window[now_second % THROUGHPUT_WINDOW] += 1
+
+    def throughput(self) -> float:
+        """Requests per second over the last full window."""
+        with self._lock:
+            now_second = int(time.monotonic())
+            self._advance_window(now_second)
+            # Exclude the current, still-filling second
+            current = self._window[now_second % THROUGHPUT_WINDOW]
+            return (sum(self._window) - current) / (THROUGHPUT_WINDOW - 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                key: (list(h.counts), h.count, h.total, {q: h.quantile(q) for q in QUANTILES})
+                for key, h in self.histograms.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self._window = [0] * THROUGHPUT_WINDOW
+
+
+# Global metrics registry shared by the middleware and the /metrics endpoint
+request_metrics = RequestMetrics()
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware recording per-route, per-status latency.
+
+    Unlike `@app.middleware("http")` it does not wrap responses in
+    `BaseHTTPMiddleware`, and it uses `perf_counter` instead of wall-clock
+    time. Routes are labelled by their template (`/items/{id}`) so the
+    number of series stays bounded. Per-request logging is opt-in: a random
+    `log_sample_rate` share of requests, plus any slower than `slow_ms`.
+    """
+
+    def __init__(
+        self,
+        app,
+        metrics: RequestMetrics = request_metrics,
+        log_sample_rate: float = settings.REQUEST_LOG_SAMPLE_RATE,
+        slow_ms: float = settings.REQUEST_LOG_SLOW_MS,
+    ):
+        self.app = app
+        self.metrics = metrics
+        self.log_sample_rate = log_sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        self.metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            self.metrics.request_finished(scope["method"], route_path, status_holder[0], elapsed)
+            self._maybe_log(scope, status_holder[0], elapsed)
+
+    def _maybe_log(self, scope, status: int, elapsed: float):
+        elapsed_ms = elapsed * 1000
+        slow = self.slow_ms and elapsed_ms >= self.slow_ms
+        if not slow and not (self.log_sample_rate and random.random() < self.log_sample_rate):
+            return
+        from app.core.logger import logger
+        # Fields go in `extra` so they land in the logs.extra JSONB column
+        logger.info("request", extra={"extra": {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status,
+            "execution_time_ms": round(elapsed_ms, 2),
+            "slow": bool(slow),
+        }})
+
+
+# -----------------------------
+# Prometheus text exposition
+# -----------------------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def render_prometheus(extra_gauges: dict = None) -> str:
+    """
+    Render request metrics (and `extra_gauges`: name -> value or
+    {labels-tuple: value}) in the Prometheus text format.
+    """
+    snapshot = request_metrics.snapshot()
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route and status.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route, status), (counts, count, total, _) in sorted(snapshot.items()):
+        cumulative = 0
+        for bound, n in zip(LATENCY_BUCKETS + ("+Inf",), counts):
+            cumulative += n
+            labels = _labels(method=method, route=route, status=status, le=bound)
+            lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+        labels = _labels(method=method, route=route, status=status)
+        lines.append(f"http_request_duration_seconds_sum{labels} {total:.6f}")
+        lines.append(f"http_request_duration_seconds_count{labels} {count}")
+
+    lines += [
+        "# HELP http_request_duration_quantile_seconds Estimated latency quantiles by route and status.",
+        "# TYPE http_request_duration_quantile_seconds gauge",
+    ]
+    for (method, route, status), (_, _, _, quantiles) in sorted(snapshot.items()):
+        for q, value in quantiles.items():
+            labels = _labels(method=method, route=route, status=status, quantile=q)
+            lines.append(f"http_request_duration_quantile_seconds{labels} {value:.6f}")
+
+    lines += [
+        "# HELP http_requests_in_flight Requests currently being served.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {request_metrics.in_flight}",
+        "# HELP http_requests_per_second Throughput over the last minute.",
+        "# TYPE http_requests_per_second gauge",
+        f"http_requests_per_second {request_metrics.throughput():.3f}",
+    ]
+
+    for name, value in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        if isinstance(value, dict):
+            for labels, v in value.items():
+                lines.append(f"{name}{_labels(**dict(labels))} {v}")
+        else:
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,112 @@
+"""
+Role-based permissions, compiled once into bitmasks.
+
+Rules are declared per global role and per team role below. The team role
+overrides the global role inside that team (docs/user_authentication_and_authorization.md):
+for team-scoped permissions only the membership counts, while org-wide roles
+(superadmin, admin) keep their full set in every team.
+
+`PermissionMatrix.compile` turns the rules into one int per
+(global role, team role) pair, and a user's memberships travel in the access
+token, so a check is a dict lookup and a bitwise AND, with no query.
+"""
+import enum
+from typing import Dict, Optional
+
+from app.models.user import GlobalRole, TeamMemberRole
+
+
+class Permission(str, enum.Enum):
+    catalog_read = "catalog:read"
+    catalog_write = "catalog:write"
+    changes_submit = "changes:submit"    # propose catalog changes for approval
+    changes_approve = "changes:approve"
+    logs_read = "logs:read"
+    system_read = "system:read"        # pool stats, internal diagnostics
+    team_read = "team:read"
+    team_manage = "team:manage"        # add/remove members
+    users_manage = "users:manage"
+
+
+ALL_PERMISSIONS = frozenset(Permission)
+
+# Only granted inside a team by a membership (or by an org-wide role)
+TEAM_SCOPED = frozenset({
+    Permission.team_read, Permission.team_manage, Permission.changes_submit, Permission.changes_approve,
+})
+
+ORG_WIDE_ROLES = frozenset({GlobalRole.superadmin, GlobalRole.admin})
+
+GLOBAL_ROLE_PERMISSIONS = {
+    GlobalRole.superadmin: ALL_PERMISSIONS,
+    GlobalRole.admin: ALL_PERMISSIONS,
+    GlobalRole.team_leader: {Permission.catalog_read, Permission.catalog_write},
+    GlobalRole.team_member: {Permission.catalog_read},
+    GlobalRole.viewer: {Permission.catalog_read},
+}
+
+TEAM_ROLE_PERMISSIONS = {
+    TeamMemberRole.leader: {Permission.team_read, Permission.team_manage, Permission.changes_submit, Permission.changes_approve},
+    TeamMemberRole.member: {Permission.team_read, Permission.changes_submit},
+    TeamMemberRole.viewer: {Permission.team_read},
+}
+
+# One-letter codes used for memberships in the token claim
+TEAM_ROLE_CODES = {TeamMemberRole.leader: "l", TeamMemberRole.member: "m", TeamMemberRole.viewer: "v"}
+_ROLES_BY_CODE = {code: role for role, code in TEAM_ROLE_CODES.items()}
+
+_BITS = {permission: 1 << i for i, permission in enumerate(Permission)}
+
+
+def mask_of(permissions) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= _BITS[permission]
+    return mask
+
+
+def allows(mask: int, permission: Permission) -> bool:
+    return bool(mask & _BITS[permission])
+
+
+class PermissionMatrix:
+    """(global role, team role or None) -> permission bitmask."""
+
+    __slots__ = ("_masks",)
+
+    def __init__(self, masks: Dict[tuple, int]):
+        self._masks = masks
+
+    @classmethod
+    def compile(cls, global_rules: dict, team_rules: dict) -> "PermissionMatrix":
+        team_scoped = mask_of(TEAM_SCOPED)
+        masks = {}
+        for global_role in GlobalRole:
+            base = mask_of(global_rules.get(global_role, ()))
+            org_wide = global_role in ORG_WIDE_ROLES
+            # Outside any membership team-scoped permissions need an org-wide role
+            masks[global_role, None] = base if org_wide else base & ~team_scoped
+            for team_role in TeamMemberRole:
+                team = mask_of(team_rules.get(team_role, ()))
+                masks[global_role, team_role] = base | team if org_wide else (base & ~team_scoped) | team
+        return cls(masks)
+
+    def mask(self, global_role: GlobalRole, team_role: Optional[TeamMemberRole] = None) -> int:
+        return self._masks[global_role, team_role]
+
+
+permission_matrix = PermissionMatrix.compile(GLOBAL_ROLE_PERMISSIONS, TEAM_ROLE_PERMISSIONS)
+
+
+# -----------------------------
+# Membership claim
+# -----------------------------
+def encode_memberships(memberships: Dict[int, TeamMemberRole]) -> str:
+    """{5: leader, 9: viewer} -> "5l,9v" (kept short, it rides on every request)."""
+    return ",".join(f"{team_id}{TEAM_ROLE_CODES[role]}" for team_id, role in sorted(memberships.items()))
+
+
+def decode_memberships(claim: Optional[str]) -> Dict[int, TeamMemberRole]:
+    if not claim:
+        return {}
+    return {int(item[:-1]): _ROLES_BY_CODE[item[-1]] for item in claim.split(",")}
@@ -0,0 +1,339 @@
+"""
+Token-bucket rate limiting for expensive endpoints (login, refresh).
+
+`RateLimitMiddleware` runs before routing, so a rejected request never
+reaches the database or bcrypt. Routes are configured in RATE_LIMIT_ROUTES:
+
+    {"POST /api/v1/auth/login": {"ip": "30/minute", "account": "10/minute"}}
+
+"N/period" is a bucket of N tokens refilled at N per period: a burst of N,
+then a steady N per period. "ip" buckets are keyed by the client address,
+"account" buckets by a form or JSON field of the body ("username" unless
+"account_field" says otherwise). The body is read to find it and replayed
+to the endpoint. A request is rejected with 429 and Retry-After as soon as
+one of its buckets is empty.
+
+Every worker checks its own in-process buckets first; with REDIS_URL the
+request must then also pass the shared bucket in Redis, so the limit holds
+across workers. A worker's local bucket never holds fewer tokens than the
+shared one (every hit it allows is also taken from Redis, and both refill
+alike), so a local rejection is always right and a flood against one worker
+is turned away without a round trip. If Redis fails, the local decision
+stands.
+"""
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from starlette.requests import Request
+
+from app.core.config import settings
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+# Bodies are only buffered to find the account; auth forms are tiny
+MAX_BODY_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: float
+    rate: float         # tokens per second
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """'10/minute' -> a bucket of 10 refilled at 10 per minute."""
+        count, _, period = value.partition("/")
+        try:
+            count, seconds = float(count), PERIODS[period.strip()]
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid rate limit '{value}', expected N/{'|'.join(PERIODS)}")
+        if count <= 0:
+            raise ValueError(f"Invalid rate limit '{value}', N must be positive")
+        return cls(capacity=count, rate=count / seconds)
+
+
+# -----------------------------
+# Buckets
+# -----------------------------
+class MemoryBuckets:
+    """
+    In-process buckets, the least recently used dropped beyond `max_keys`.
+    Also the whole limiter in tests and single-worker setups.
+    """
+
+    def __init__(self, max_keys: int = settings.RATE_LIMIT_MEMORY_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # key -> [tokens, updated_at]
+
+    def take(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        """Take `cost` tokens; 0 when allowed, else seconds until they are available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [limit.capacity, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / limit.rate
+
+
+# Refill, take and store in one step; Redis' clock keeps workers consistent.
+# The wait is returned as a string: Lua numbers become integers in replies.
+TAKE_SCRIPT = """
+local capacity, rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Buckets shared by every worker, one Redis hash each, expiring once full again."""
+
+    def __init__(self, url: str, prefix: str = "cf"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+        self._take = self._redis.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        wait = await self._take(keys=[f"{self._prefix}:rl:{key}"], args=[limit.capacity, limit.rate, cost])
+        return float(wait)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+class RateLimiter:
+    """Local buckets first, then the shared ones if configured (see module docstring)."""
+
+    def __init__(self, local: Optional[MemoryBuckets] = None, shared: Optional[RedisBuckets] = None):
+        self.local = local or MemoryBuckets()
+        self.shared = shared
+        self.allowed = 0
+        self.rejected = 0
+        self.shared_errors = 0
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        wait = self.local.take(key, limit)
+        if not wait and self.shared is not None:
+            try:
+                wait = await self.shared.take(key, limit)
+            except Exception:
+                # Counted, not logged: logging here would flood the log sink
+                # exactly when the limiter is under attack
+                self.shared_errors += 1
+        if wait:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "shared_errors": self.shared_errors,
+            "local_keys": len(self.local._buckets),
+        }
+
+    async def close(self):
+        if self.shared is not None:
+            await self.shared.close()
+
+
+_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter, sharing its buckets through Redis when REDIS_URL is set."""
+    global _limiter
+    if _limiter is None:
+        shared = RedisBuckets(settings.REDIS_URL, prefix=settings.CACHE_KEY_PREFIX) if settings.REDIS_URL else None
+        _limiter = RateLimiter(shared=shared)
+    return _limiter
+
+
+def set_rate_limiter(limiter: RateLimiter):
+    """Replace the process-wide limiter (e.g. with a memory-only one in tests)."""
+    global _limiter
+    _limiter = limiter
+
+
+# -----------------------------
+# Middleware
+# -----------------------------
+@dataclass(frozen=True)
+class RouteRule:
+    route: str                          # "POST /api/v1/auth/login", also the key namespace
+    ip: Optional[RateLimit] = None
+    account: Optional[RateLimit] = None
+    account_field: str = "username"
+
+
+def parse_rules(routes: dict) -> dict:
+    """RATE_LIMIT_ROUTES -> {(method, path): RouteRule}."""
+    rules = {}
+    for route, config in routes.items():
+        method, _, path = route.partition(" ")
+        unknown = set(config) - {"ip", "account", "account_field"}
+        if not path or unknown:
+            raise ValueError(f"Invalid rate limit rule '{route}': {config}")
+        rules[(method.upper(), path)] = RouteRule(
+            route=f"{method.upper()} {path}",
+            ip=RateLimit.parse(config["ip"]) if config.get("ip") else None,
+            account=RateLimit.parse(config["account"]) if config.get("account") else None,
+            account_field=config.get("account_field", "username"),
+        )
+    return rules
+
+
+def client_ip(scope, proxy_hops: int = settings.RATE_LIMIT_PROXY_HOPS) -> str:
+    """
+    The peer address, or behind `proxy_hops` trusted proxies the address the
+    outermost of them saw. Entries further left in X-Forwarded-For are
+    client-supplied and never used.
+    """
+    if proxy_hops:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                hops = [h.strip() for h in value.decode("latin-1").split(",")]
+                if len(hops) >= proxy_hops:
+                    return hops[-proxy_hops]
+                break
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware enforcing RATE_LIMIT_ROUTES. Other routes pass
+    through untouched, their bodies unread.
+    """
+
+    def __init__(
+        self,
+        app,
+        routes: Optional[dict] = None,
+        limiter: Optional[RateLimiter] = None,
+        proxy_hops: int = settings.RATE_LIMIT_PROXY_HOPS,
+    ):
+        self.app = app
+        self.rules = parse_rules(settings.RATE_LIMIT_ROUTES if routes is None else routes)
+        self.limiter = limiter
+        self.proxy_hops = proxy_hops
+
+    async def __call__(self, scope, receive, send):
+        rule = self.rules.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+        limiter = self.limiter or get_rate_limiter()
+
+        # Per address first: it needs no body, so a flood is shed cheaply
+        if rule.ip is not None:
+            wait = await limiter.take(f"{rule.route}:ip:{client_ip(scope, self.proxy_hops)}", rule.ip)
+            if wait:
+                await _too_many_requests(send, wait)
+                return
+
+        if rule.account is not None:
+            try:
+                body = await _read_body(receive)
+            except ValueError as e:
+                await _error(send, 413, str(e))
+                return
+            account = await _account(scope, _replay(body, receive), rule.account_field)
+            if account:
+                digest = hashlib.blake2b(account.encode(), digest_size=16).hexdigest()
+                wait = await limiter.take(f"{rule.route}:account:{digest}", rule.account)
+                if wait:
+                    await _too_many_requests(send, wait)
+                    return
+            receive = _replay(body, receive)
+
+        await self.app(scope, receive, send)
+
+
+async def _read_body(receive) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, receive):
+    """A receive callable yielding `body` once, then deferring to the real one (disconnects)."""
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _account(scope, receive, field: str) -> Optional[str]:
+    """The normalized account named by the body's `field`, None if absent or unparsable."""
+    request = Request(scope, receive)
+    value = None
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            data = json.loads(await request.body())
+            value = data.get(field) if isinstance(data, dict) else None
+        else:
+            form = await request.form(max_files=0)
+            value = form.get(field)
+            await form.close()
+    except Exception:
+        return None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+async def _too_many_requests(send, wait: float):
+    await _error(send, 429, "Too many requests, retry later", [(b"retry-after", str(math.ceil(wait)).encode())])
+
+
+async def _error(send, status: int, detail: str, headers: Optional[List[tuple]] = None):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *(headers or []),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,168 @@
+"""
+Revoked sessions and token versions, held in memory by every worker.
+
+Checking a token is a dict lookup for its session ("sid") and one for its
+user's lowest accepted token version ("ver"): no query on any request.
+`get_current_user` uses it for access tokens, `/auth/refresh` to refuse a
+revoked refresh token before touching the database.
+
+Workers stay in sync three ways:
+- at startup the list is loaded from the database (revoked, unexpired
+  sessions and bumped token versions);
+- a worker revoking something publishes it over Redis pub/sub (REDIS_URL),
+  and the others apply it right away;
+- the list is reloaded every REVOCATION_SYNC_INTERVAL seconds, the only
+  sync without Redis and the backstop for missed messages.
+
+The database stays authoritative for refreshes: a refresh rotates the
+session row and fails on a revoked one, so a lagging worker can at worst
+accept an access token of a revoked session until its next sync.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.crud import sessions as sessions_crud
+from app.database.asyncio.session import new_async_session
+from app.models.user import User
+
+
+class RevocationList:
+    CHANNEL = "auth:revoked"
+
+    def __init__(self, redis_url: str = "", prefix: str = "cf", sync_interval: float = 30.0):
+        self.sessions = {}          # session id -> expiry (epoch seconds), dropped once expired
+        self.min_versions = {}      # user id -> lowest token version accepted
+        self.sync_interval = sync_interval
+        self.loaded_at: Optional[float] = None
+        self._redis_url = redis_url
+        self._channel = f"{prefix}:{self.CHANNEL}"
+        self._redis = None
+        self._tasks = []
+
+    def is_revoked(self, user_id: int, token_version: int, session_id: Optional[str] = None) -> bool:
+        if token_version < self.min_versions.get(user_id, 0):
+            return True
+        return session_id is not None and session_id in self.sessions
+
+    # -------------------------
+    # Local updates
+    # -------------------------
+    def add_session(self, session_id: str, expires_at: float):
+        self.sessions[session_id] = expires_at
+
+    def raise_version(self, user_id: int, token_version: int):
+        if token_version > self.min_versions.get(user_id, 0):
+            self.min_versions[user_id] = token_version
+
+    # -------------------------
+    # Revoking (this worker now, the others through Redis)
+    # -------------------------
+    async def revoke_session(self, session_id: str, expires_at: float):
+        self.add_session(session_id, expires_at)
+        await self._publish(f"s {session_id} {expires_at:.0f}")
+
+    async def revoke_user(self, user_id: int, token_version: int):
+        """Refuse every token of `user_id` older than `token_version`."""
+        self.raise_version(user_id, token_version)
+        await self._publish(f"u {user_id} {token_version}")
+
+    async def _publish(self, message: str):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.publish(self._channel, message)
+        except Exception as e:
+            # The periodic reload catches the other workers up
+            logger.warning(f"Revocation not published, other workers sync on reload: {e}")
+
+    def _apply(self, message: str):
+        kind, *fields = message.split()
+        if kind == "s" and len(fields) == 2:
+            self.add_session(fields[0], float(fields[1]))
+        elif kind == "u" and len(fields) == 2:
+            self.raise_version(int(fields[0]), int(fields[1]))
+
+    # -------------------------
+    # Sync
+    # -------------------------
+    async def reload(self):
+        """Merge the database's revocations in and drop expired sessions."""
+        async with new_async_session() as db:
+            revoked = await sessions_crud.revoked_sessions(db)
+            versions = (await db.execute(
+                select(User.id, User.token_version).where(User.token_version > 0)
+            )).all()
+        # Merged, not replaced: a revocation published during the query is kept
+        for session_id, expires_at in revoked:
+            self.add_session(session_id, expires_at.timestamp())
+        for user_id, token_version in versions:
+            self.raise_version(user_id, token_version)
+        now = time.time()
+        self.sessions = {sid: expires_at for sid, expires_at in self.sessions.items() if expires_at > now}
+        self.loaded_at = now
+
+    async def _reload_forever(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Revocation list reload failed: {e}")
+
+    async def _listen_forever(self):
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        self._apply(data.decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Revocation channel lost, resubscribing: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self):
+        if self._redis_url and self._redis is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self._redis_url)
+            self._tasks.append(asyncio.create_task(self._listen_forever()))
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.error(f"Revocation list not loaded, retrying in {self.sync_interval:.0f}s: {e}")
+        self._tasks.append(asyncio.create_task(self._reload_forever()))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "users": len(self.min_versions),
+            "age_seconds": round(time.time() - self.loaded_at, 1) if self.loaded_at else -1,
+        }
+
+
+# Process-wide list, started by the application lifespan
+revocations = RevocationList(
+    settings.REDIS_URL,
+    prefix=settings.CACHE_KEY_PREFIX,
+    sync_interval=settings.REVOCATION_SYNC_INTERVAL,
+)
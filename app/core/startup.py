@@ -0,0 +1,41 @@
+"""
+Per-phase timing of application startup.
+
+Kept dependency-free so `app/main.py` can import it before anything else
+and time its own imports. Phases are recorded in order; the report is
+logged once startup completes and exported on /metrics as
+`app_startup_phase_seconds{phase="..."}`.
+"""
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.ready_after = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def mark_ready(self):
+        self.ready_after = time.perf_counter() - self.started
+
+    def report(self) -> dict:
+        return {
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "ready_after_seconds": round(self.ready_after, 4) if self.ready_after is not None else None,
+        }
+
+
+# Created when app/main.py starts importing
+startup_profiler = StartupProfiler()
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.pagination import Page, SortKey, paginate
+from app.models.audit import AuditEntry
+
+# Newest first; served by the (entity_type, entity_id, at, id) index
+HISTORY_SORT_KEY = SortKey.of(AuditEntry.at.desc(), AuditEntry.id.desc())
+
+
+async def entity_history(
+    db: AsyncSession,
+    entity_type: str,
+    entity_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Page:
+    """One page of an entity's audit entries, newest first."""
+    query = select(AuditEntry).where(AuditEntry.entity_type == entity_type, AuditEntry.entity_id == entity_id)
+    return await paginate(db, query, HISTORY_SORT_KEY, scope=f"audit:{entity_type}:{entity_id}", cursor=cursor, limit=limit)
@@ -0,0 +1,292 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import Integer, and_, any_, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import audit
+from app.core.cache import cached, get_cache
+from app.crud.pagination import Page, SortKey, paginate
+from app.models.category import Category
+from app.models.product import Product
+
+# Cache keys / tags; product counts also depend on product writes
+CATEGORY_TAG = "categories"
+TREE_VALIDATORS_KEY = "categories:tree:validators"
+
+# Transaction-level advisory lock taken by every write that reads or rewrites
+# paths; 0x63617467 is "catg"
+TREE_LOCK_KEY = 0x63617467
+
+PRODUCT_SORT_KEY = SortKey.of(Product.id)
+
+# Latest change to a row; rows never updated only have created_at
+CATEGORY_MODIFIED = func.coalesce(Category.updated_at, Category.created_at)
+PRODUCT_MODIFIED = func.coalesce(Product.updated_at, Product.created_at)
+
+
+class CategoryError(ValueError):
+    pass
+
+
+def _child_path(parent: Optional[Category], category_id: int) -> str:
+    return f"{parent.path if parent else '/'}{category_id}/"
+
+
+def in_subtree(root_path):
+    """
+    Range condition matching `root_path` and every path below it. Paths
+    under "/1/5/" sort between "/1/5/" and "/1/50" ("0" follows "/"), and a
+    range works with a subquery bound where LIKE 'prefix%' needs a literal.
+    """
+    return and_(Category.path >= root_path, Category.path < func.rtrim(root_path, "/") + "0")
+
+
+def path_ids(path: str) -> list:
+    """"/1/5/12/" -> [1, 5, 12]"""
+    return [int(part) for part in path.strip("/").split("/") if part]
+
+
+async def get_active_category(db: AsyncSession, category_id: int, refresh: bool = False) -> Category:
+    """`refresh` re-reads the row even if the session already holds it (after `_lock_tree`)."""
+    category = await db.get(Category, category_id, populate_existing=refresh)
+    if category is None or not category.is_active:
+        raise CategoryError(f"Category {category_id} not found")
+    return category
+
+
+async def invalidate_category_cache():
+    await get_cache().invalidate_tags(CATEGORY_TAG)
+
+
+# -----------------------------
+# Writes (caller commits, then calls invalidate_category_cache)
+# -----------------------------
+# Creates, moves and deletes compute paths from other nodes' paths, so they
+# are serialized tree-wide and read those paths only once the lock is held:
+# two crossing moves, or a child created under a moving node, would
+# otherwise work from stale prefixes. Renames do not touch paths.
+async def _lock_tree(db: AsyncSession):
+    await db.execute(select(func.pg_advisory_xact_lock(TREE_LOCK_KEY)))
+
+
+async def create_category(db: AsyncSession, name: str, parent_id: Optional[int] = None) -> Category:
+    await _lock_tree(db)
+    parent = await get_active_category(db, parent_id, refresh=True) if parent_id is not None else None
+    category = Category(name=name, parent_id=parent_id, depth=(parent.depth + 1) if parent else 0)
+    db.add(category)
+    # The path embeds the node's own id, so it is set once the id is known
+    await db.flush()
+    category.path = _child_path(parent, category.id)
+    await db.flush()
+    # Load the server-side timestamps now; lazy loads are not possible in async
+    await db.refresh(category)
+    return category
+
+
+async def move_category(db: AsyncSession, category_id: int, new_parent_id: Optional[int]) -> Category:
+    """
+    Re-parent a node; its whole subtree is rewritten with one UPDATE that
+    swaps the old path prefix for the new one.
+    """
+    await _lock_tree(db)
+    category = await get_active_category(db, category_id, refresh=True)
+    new_parent = await get_active_category(db, new_parent_id, refresh=True) if new_parent_id is not None else None
+    if new_parent is not None and new_parent.path.startswith(category.path):
+        raise CategoryError("A category cannot be moved under itself or its descendants")
+
+    old_parent_id = category.parent_id
+    old_prefix = category.path
+    new_prefix = _child_path(new_parent, category.id)
+    depth_delta = ((new_parent.depth + 1) if new_parent else 0) - category.depth
+
+    await db.execute(
+        update(Category)
+        .where(Category.path.startswith(old_prefix, autoescape=True))
+        .values(
+            path=literal(new_prefix) + func.substr(Category.path, len(old_prefix) + 1),
+            depth=Category.depth + depth_delta,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(Category)
+        .where(Category.id == category_id)
+        .values(parent_id=new_parent_id, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    audit.record(db, "category", category_id, "update", {"parent_id": (old_parent_id, new_parent_id)})
+    await db.refresh(category)
+    return category
+
+
+async def rename_category(db: AsyncSession, category_id: int, name: str) -> Category:
+    category = await get_active_category(db, category_id)
+    category.name = name
+    await db.flush()
+    await db.refresh(category)
+    return category
+
+
+async def soft_delete_category(db: AsyncSession, category_id: int) -> int:
+    """Deactivate a node and its subtree; returns the number of nodes affected."""
+    await _lock_tree(db)
+    category = await get_active_category(db, category_id, refresh=True)
+    result = await db.execute(
+        update(Category)
+        .where(Category.path.startswith(category.path, autoescape=True), Category.is_active.is_(True))
+        .values(is_active=False, updated_at=func.now())
+        .returning(Category.id)
+        .execution_options(synchronize_session=False)
+    )
+    deactivated = result.scalars().all()
+    for node_id in deactivated:
+        audit.record(db, "category", node_id, "update", {"is_active": (True, False)})
+    return len(deactivated)
+
+
+# -----------------------------
+# Reads: one indexed query each
+# -----------------------------
+async def get_subtree(db: AsyncSession, category_id: int) -> list:
+    """The node and all its active descendants, parents before children."""
+    root_path = select(Category.path).where(Category.id == category_id).scalar_subquery()
+    result = await db.execute(
+        select(Category)
+        .where(in_subtree(root_path), Category.is_active.is_(True))
+        .order_by(Category.depth, Category.name)
+    )
+    return result.scalars().all()
+
+
+async def get_breadcrumb(db: AsyncSession, category_id: int) -> list:
+    """Ancestors from the root down to the node itself."""
+    node_path = select(Category.path).where(Category.id == category_id).scalar_subquery()
+    ancestor_ids = cast(func.string_to_array(func.btrim(node_path, "/"), "/"), ARRAY(Integer))
+    result = await db.execute(
+        select(Category)
+        .where(Category.id == any_(ancestor_ids))
+        .order_by(Category.depth)
+    )
+    return result.scalars().all()
+
+
+def _subtree_products_query(category_id: int, *columns):
+    root_path = select(Category.path).where(Category.id == category_id).scalar_subquery()
+    return (
+        select(*columns)
+        .join(Category, Category.id == Product.category_id)
+        .where(in_subtree(root_path), Product.is_active.is_(True))
+    )
+
+
+async def get_subtree_products(
+    db: AsyncSession, category_id: int, cursor: Optional[str] = None, limit: int = 50, with_total: bool = False
+) -> Page:
+    """Active products in the node or any of its descendants, by id."""
+    return await paginate(
+        db, _subtree_products_query(category_id, Product), PRODUCT_SORT_KEY,
+        scope=f"categories:{category_id}:products", cursor=cursor, limit=limit, with_total=with_total,
+    )
+
+
+async def _load_tree(db: AsyncSession) -> list:
+    result = await db.execute(
+        select(Category.id, Category.name, Category.parent_id, Category.path, Category.depth)
+        .where(Category.is_active.is_(True))
+        .order_by(Category.path)
+    )
+    nodes = {}
+    roots = []
+    # Ordered by path, so every parent is seen before its children
+    for row in result:
+        node = {"id": row.id, "name": row.name, "parent_id": row.parent_id,
+                "path": row.path, "depth": row.depth, "children": []}
+        nodes[row.id] = node
+        parent = nodes.get(row.parent_id)
+        (parent["children"] if parent else roots).append(node)
+    return roots
+
+
+@cached("categories:tree", tags=[CATEGORY_TAG], exclude=("db",))
+async def get_tree(db: AsyncSession) -> list:
+    """The full active tree, nested; cached until the next category write."""
+    return await _load_tree(db)
+
+
+async def get_product_counts(db: AsyncSession) -> dict:
+    """{category_id: {"direct": n, "total": n incl. descendants}}, uncached (see the endpoint)."""
+    # One round-trip: direct counts come from a GROUP BY over
+    # ix_products_category_id, subtree totals are rolled up the paths in memory
+    direct = (
+        select(Product.category_id, func.count().label("n"))
+        .where(Product.category_id.is_not(None), Product.is_active.is_(True))
+        .group_by(Product.category_id)
+        .subquery()
+    )
+    rows = await db.execute(
+        select(Category.id, Category.path, func.coalesce(direct.c.n, 0))
+        .outerjoin(direct, direct.c.category_id == Category.id)
+        .where(Category.is_active.is_(True))
+    )
+
+    counts = {}
+    for category_id, path, n in rows:
+        counts.setdefault(category_id, {"direct": 0, "total": 0})["direct"] = n
+        for ancestor_id in path_ids(path):
+            counts.setdefault(ancestor_id, {"direct": 0, "total": 0})["total"] += n
+    # JSON object keys are strings once cached
+    return {str(k): v for k, v in counts.items()}
+
+
+# -----------------------------
+# Conditional GET validators (see app/core/conditional.py)
+# -----------------------------
+# Each is a narrow query the endpoint runs before its full load; a change to
+# anything the response shows changes the count or the latest modification.
+# A move rewrites the paths of the whole subtree, and bumps its updated_at.
+async def _categories_state(db: AsyncSession, *conditions) -> Tuple[int, Optional[datetime]]:
+    """(rows, latest modification) of the categories matching `conditions`, inactive ones included."""
+    row = (await db.execute(select(func.count(), func.max(CATEGORY_MODIFIED)).where(*conditions))).one()
+    return row[0], row[1]
+
+
+async def _load_tree_state(db: AsyncSession) -> list:
+    # count(*) reads the primary key index, max() one entry of ix_categories_modified_at
+    return list(await _categories_state(db))
+
+
+async def get_tree_state(db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+    """Validators of the tree, cached alongside it until the next category write."""
+    count, modified = await get_cache().get_or_load(
+        TREE_VALIDATORS_KEY, lambda: _load_tree_state(db), tags=[CATEGORY_TAG]
+    )
+    return count, datetime.fromisoformat(modified) if modified else None
+
+
+async def get_subtree_state(db: AsyncSession, category_id: int) -> Tuple[int, Optional[datetime]]:
+    root_path = select(Category.path).where(Category.id == category_id).scalar_subquery()
+    return await _categories_state(db, in_subtree(root_path))
+
+
+async def get_breadcrumb_state(db: AsyncSession, category_id: int) -> Tuple[int, Optional[datetime]]:
+    node_path = select(Category.path).where(Category.id == category_id).scalar_subquery()
+    ancestor_ids = cast(func.string_to_array(func.btrim(node_path, "/"), "/"), ARRAY(Integer))
+    return await _categories_state(db, Category.id == any_(ancestor_ids))
+
+
+async def get_subtree_products_state(
+    db: AsyncSession, category_id: int, cursor: Optional[str] = None, limit: int = 50
+) -> Page:
+    """
+    The page `get_subtree_products` would return, as (id, version,
+    modified_at) rows: every product write bumps its version, and moved
+    categories change which ids are on the page.
+    """
+    query = _subtree_products_query(category_id, Product.id, Product.version, PRODUCT_MODIFIED.label("modified_at"))
+    return await paginate(
+        db, query, PRODUCT_SORT_KEY, scope=f"categories:{category_id}:products", cursor=cursor, limit=limit,
+    )
+
@@ -0,0 +1,370 @@
+"""
+Change requests: team members propose product changes, team leaders approve
+them (docs/architecture_and_scope.md, "Approval Workflow").
+
+A change is stored as a compact JSON diff, only the fields that differ from
+the product at submission, plus the product version it was made against.
+Approval applies a whole batch in the caller's transaction with one
+statement per action (create / update / delete), whatever the batch size.
+Conflicts are detected optimistically: an update or delete only touches the
+product while `version` still equals the change's `base_version`, so no
+product row is locked ahead of time, and a change whose product moved on is
+marked `conflict` instead of overwriting the newer edit. A change the
+database refuses (a constraint it violates) is marked `failed` with the
+error as its review note, and the rest of the batch is still applied.
+"""
+import json
+from typing import List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import audit
+from app.crud.pagination import Page, SortKey, paginate
+from app.models.category import Category
+from app.models.change_request import ChangeAction, ChangeEntityType, ChangeRequest, ChangeStatus
+from app.models.product import Product
+from app.models.user import Team
+
+# Oldest first; served by the partial (team_id, created_at, id) index
+QUEUE_SORT_KEY = SortKey.of(ChangeRequest.created_at, ChangeRequest.id)
+
+
+class ChangeError(ValueError):
+    pass
+
+
+class ChangeConflict(ChangeError):
+    pass
+
+
+# -----------------------------
+# Set-based apply statements
+# -----------------------------
+# Changes travel as parallel arrays, so each statement (and its plan) is the
+# same for 1 or 1,000 changes. jsonb_populate_record overlays the diff on the
+# current row: fields absent from the diff keep their value.
+APPLY_UPDATES_SQL = text("""
+    WITH c AS (
+        SELECT *
+        FROM unnest(
+            CAST(:change_ids AS integer[]),
+            CAST(:entity_ids AS integer[]),
+            CAST(:base_versions AS integer[]),
+            CAST(:diffs AS jsonb[])
+        ) AS c(change_id, entity_id, base_version, diff)
+    ),
+    merged AS (
+        SELECT c.change_id, c.base_version,
+               (SELECT jsonb_object_agg(k, to_jsonb(p) -> k) FROM jsonb_object_keys(c.diff) k) AS old_values,
+               r.*
+        FROM c
+        JOIN products p ON p.id = c.entity_id
+        CROSS JOIN LATERAL jsonb_populate_record(p, c.diff) r
+    )
+    UPDATE products p
+    SET name = m.name,
+        description = m.description,
+        price = m.price,
+        stock = m.stock,
+        brand = m.brand,
+        category_id = m.category_id,
+        tags = m.tags,
+        attributes = m.attributes,
+        version = p.version + 1,
+        updated_at = now()
+    FROM merged m
+    WHERE p.id = m.id
+      AND p.version = m.base_version
+      AND p.is_active IS TRUE
+    RETURNING m.change_id, p.id AS entity_id, p.version, m.old_values
+""")
+
+APPLY_DELETES_SQL = text("""
+    UPDATE products p
+    SET is_active = false,
+        version = p.version + 1,
+        updated_at = now()
+    FROM unnest(
+        CAST(:change_ids AS integer[]),
+        CAST(:entity_ids AS integer[]),
+        CAST(:base_versions AS integer[])
+    ) AS c(change_id, entity_id, base_version)
+    WHERE p.id = c.entity_id
+      AND p.version = c.base_version
+      AND p.is_active IS TRUE
+    RETURNING c.change_id, p.id AS entity_id, p.version
+""")
+
+# A create whose SKU exists by now is a conflict, not an error
+APPLY_CREATES_SQL = text("""
+    WITH c AS (
+        SELECT * FROM unnest(CAST(:change_ids AS integer[]), CAST(:diffs AS jsonb[])) AS c(change_id, diff)
+    ),
+    ins AS (
+        INSERT INTO products (sku, name, description, price, stock, brand, category_id, tags, attributes, is_active, version, created_at)
+        SELECT r.sku, r.name, r.description, coalesce(r.price, 0), coalesce(r.stock, 0), r.brand,
+               r.category_id, r.tags, r.attributes, true, 1, now()
+        FROM c CROSS JOIN LATERAL jsonb_populate_record(NULL::products, c.diff) r
+        ON CONFLICT (sku) DO NOTHING
+        RETURNING id, sku, version
+    )
+    SELECT c.change_id, ins.id AS entity_id, ins.version
+    FROM c JOIN ins ON ins.sku = c.diff ->> 'sku'
+""")
+
+FINISH_REVIEW_SQL = text("""
+    UPDATE change_requests cr
+    SET status = CAST(v.status AS changestatus),
+        entity_id = coalesce(v.entity_id, cr.entity_id),
+        applied_version = v.version,
+        reviewed_by = :reviewer_id,
+        reviewed_at = now(),
+        review_note = coalesce(v.error, :note)
+    FROM unnest(
+        CAST(:ids AS integer[]),
+        CAST(:statuses AS text[]),
+        CAST(:entity_ids AS integer[]),
+        CAST(:versions AS integer[]),
+        CAST(:errors AS text[])
+    ) AS v(id, status, entity_id, version, error)
+    WHERE cr.id = v.id
+""")
+
+
+# -----------------------------
+# Submission
+# -----------------------------
+def _diff(product: Product, proposed: dict) -> dict:
+    """The proposed fields whose value differs from the product's."""
+    return {field: value for field, value in proposed.items() if getattr(product, field) != value}
+
+
+async def submit_change(
+    db: AsyncSession,
+    team_id: int,
+    user_id: int,
+    action: ChangeAction,
+    changes,
+    entity_id: Optional[int] = None,
+    base_version: Optional[int] = None,
+    note: Optional[str] = None,
+) -> ChangeRequest:
+    """
+    Store a pending change to a product. `changes` is a `ProductChanges`;
+    only the fields that were sent are considered. The caller commits.
+    """
+    team = await db.get(Team, team_id)
+    if team is None or not team.is_active:
+        raise ChangeError(f"Team {team_id} not found")
+
+    proposed = changes.model_dump(exclude_unset=True)
+    if proposed.get("category_id") is not None:
+        category = await db.get(Category, proposed["category_id"])
+        if category is None or not category.is_active:
+            raise ChangeError(f"Category {proposed['category_id']} not found")
+
+    if action == ChangeAction.create:
+        if await db.scalar(select(Product.id).where(Product.sku == proposed["sku"])) is not None:
+            raise ChangeConflict(f"SKU {proposed['sku']} already exists")
+        fields = list(proposed)
+    else:
+        product = await db.get(Product, entity_id)
+        if product is None or not product.is_active:
+            raise ChangeError(f"Product {entity_id} not found")
+        if base_version is not None and base_version != product.version:
+            raise ChangeConflict(f"Product {entity_id} is at version {product.version}, not {base_version}")
+        base_version = product.version
+        fields = list(_diff(product, proposed)) if action == ChangeAction.update else []
+        if action == ChangeAction.update and not fields:
+            raise ChangeError("The change does not differ from the current product")
+
+    change = ChangeRequest(
+        team_id=team_id,
+        submitted_by=user_id,
+        entity_type=ChangeEntityType.product,
+        entity_id=entity_id,
+        action=action,
+        base_version=base_version if action != ChangeAction.create else None,
+        # JSON-safe values (Decimal -> string), only for the fields that change
+        diff=changes.model_dump(mode="json", include=set(fields)),
+        note=note,
+    )
+    db.add(change)
+    await db.flush()
+    await db.refresh(change)
+    return change
+
+
+async def get_change(db: AsyncSession, change_id: int) -> ChangeRequest:
+    change = await db.get(ChangeRequest, change_id)
+    if change is None:
+        raise ChangeError(f"Change {change_id} not found")
+    return change
+
+
+async def pending_changes(
+    db: AsyncSession,
+    team_ids: Optional[List[int]],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    with_total: bool = False,
+) -> Page:
+    """Pending changes of `team_ids` (None: every team), oldest first."""
+    query = select(ChangeRequest).where(ChangeRequest.status == ChangeStatus.pending)
+    if team_ids is not None:
+        query = query.where(ChangeRequest.team_id.in_(team_ids))
+    return await paginate(
+        db, query, QUEUE_SORT_KEY, scope="changes:pending", cursor=cursor, limit=limit, with_total=with_total,
+    )
+
+
+# -----------------------------
+# Review (caller commits)
+# -----------------------------
+async def _lock_pending(db: AsyncSession, ids: List[int], team_ids: Optional[List[int]]) -> list:
+    # Locks the change rows only, in id order so concurrent reviewers cannot
+    # deadlock; a reviewer that waited sees them as no longer pending
+    query = (
+        select(ChangeRequest.id, ChangeRequest.action, ChangeRequest.entity_id,
+               ChangeRequest.base_version, ChangeRequest.diff)
+        .where(ChangeRequest.id.in_(ids), ChangeRequest.status == ChangeStatus.pending)
+        .order_by(ChangeRequest.id)
+        .with_for_update()
+    )
+    if team_ids is not None:
+        query = query.where(ChangeRequest.team_id.in_(team_ids))
+    return (await db.execute(query)).all()
+
+
+def _db_error(error: DBAPIError) -> str:
+    # asyncpg's message without the exception class the driver adapter prefixes
+    return str(error.orig).split(": ", 1)[-1].splitlines()[0]
+
+
+async def _apply(db: AsyncSession, statement, group: list, params) -> tuple:
+    """
+    Run `statement` for the changes in `group` (`params(changes)` builds its
+    parameters); returns (rows, {change id: error}). The batch runs in a
+    savepoint; if the database refuses it, each change is retried in its own
+    so that only the offending ones fail.
+    """
+    try:
+        async with db.begin_nested():
+            return (await db.execute(statement, params(group))).all(), {}
+    except DBAPIError:
+        pass
+    rows, errors = [], {}
+    for change in group:
+        try:
+            async with db.begin_nested():
+                rows += (await db.execute(statement, params([change]))).all()
+        except DBAPIError as e:
+            errors[change.id] = _db_error(e)
+    return rows, errors
+
+
+async def approve_changes(
+    db: AsyncSession,
+    ids: List[int],
+    reviewer_id: int,
+    team_ids: Optional[List[int]],
+    note: Optional[str] = None,
+) -> dict:
+    """
+    Apply the pending changes among `ids` that belong to `team_ids` (None:
+    any team). Returns {change id: (status, entity id, applied version, error)}
+    where status is "approved", "conflict", "failed" or "not_pending".
+    """
+    changes = await _lock_pending(db, ids, team_ids)
+    outcome = {change_id: ("not_pending", None, None, None) for change_id in ids}
+
+    # Within a batch the oldest change to a product (or SKU) wins; the
+    # others were made against the same version and now conflict with it
+    creates, updates, deletes, claimed = [], [], [], set()
+    for change in changes:
+        key = ("sku", change.diff.get("sku")) if change.action == ChangeAction.create else ("id", change.entity_id)
+        outcome[change.id] = ("conflict", change.entity_id, None, None)
+        if key in claimed:
+            continue
+        claimed.add(key)
+        {ChangeAction.create: creates, ChangeAction.update: updates, ChangeAction.delete: deletes}[change.action].append(change)
+
+    applied, failed = [], {}
+    if updates:
+        rows, errors = await _apply(db, APPLY_UPDATES_SQL, updates, lambda group: {
+            "change_ids": [c.id for c in group],
+            "entity_ids": [c.entity_id for c in group],
+            "base_versions": [c.base_version for c in group],
+            "diffs": [json.dumps(c.diff) for c in group],
+        })
+        diffs = {c.id: c.diff for c in updates}
+        for row in rows:
+            audit.record(db, "product", row.entity_id, "update", {
+                field: (row.old_values.get(field), new) for field, new in diffs[row.change_id].items()
+            })
+        applied += rows
+        failed.update(errors)
+    if deletes:
+        rows, errors = await _apply(db, APPLY_DELETES_SQL, deletes, lambda group: {
+            "change_ids": [c.id for c in group],
+            "entity_ids": [c.entity_id for c in group],
+            "base_versions": [c.base_version for c in group],
+        })
+        for row in rows:
+            audit.record(db, "product", row.entity_id, "update", {"is_active": (True, False)})
+        applied += rows
+        failed.update(errors)
+    if creates:
+        rows, errors = await _apply(db, APPLY_CREATES_SQL, creates, lambda group: {
+            "change_ids": [c.id for c in group],
+            "diffs": [json.dumps(c.diff) for c in group],
+        })
+        diffs = {c.id: c.diff for c in creates}
+        for row in rows:
+            audit.record(db, "product", row.entity_id, "insert", {
+                field: (None, value) for field, value in diffs[row.change_id].items()
+            })
+        applied += rows
+        failed.update(errors)
+    for row in applied:
+        outcome[row.change_id] = ("approved", row.entity_id, row.version, None)
+    for change_id, error in failed.items():
+        outcome[change_id] = ("failed", outcome[change_id][1], None, error)
+
+    reviewed = [change.id for change in changes]
+    if reviewed:
+        await db.execute(FINISH_REVIEW_SQL, {
+            "ids": reviewed,
+            "statuses": [outcome[i][0] for i in reviewed],
+            "entity_ids": [outcome[i][1] for i in reviewed],
+            "versions": [outcome[i][2] for i in reviewed],
+            "errors": [outcome[i][3] for i in reviewed],
+            "reviewer_id": reviewer_id,
+            "note": note,
+        })
+    return outcome
+
+
+async def reject_changes(
+    db: AsyncSession,
+    ids: List[int],
+    reviewer_id: int,
+    team_ids: Optional[List[int]],
+    note: Optional[str] = None,
+) -> dict:
+    """Reject the pending changes among `ids`; returns {change id: status} like `approve_changes`."""
+    conditions = "id = ANY(:ids) AND status = 'pending'"
+    params = {"ids": ids, "reviewer_id": reviewer_id, "note": note}
+    if team_ids is not None:
+        conditions += " AND team_id = ANY(:team_ids)"
+        params["team_ids"] = team_ids
+    result = await db.execute(text(f"""
+        UPDATE change_requests
+        SET status = 'rejected', reviewed_by = :reviewer_id, reviewed_at = now(), review_note = :note
+        WHERE {conditions}
+        RETURNING id
+    """), params)
+    rejected = set(result.scalars().all())
+    return {change_id: ("rejected" if change_id in rejected else "not_pending", None, None, None) for change_id in ids}
@@ -0,0 +1,58 @@
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+
+# Live counts come from the partial indexes on queued / running jobs, the
+# timings from ix_jobs_finished over the window
+JOB_STATS_SQL = text("""
+    WITH live AS (
+        SELECT queue, name,
+               count(*) FILTER (WHERE status = 'queued' AND run_at <= now()) AS ready,
+               count(*) FILTER (WHERE status = 'queued' AND run_at > now()) AS scheduled,
+               count(*) FILTER (WHERE status = 'running') AS running,
+               extract(epoch FROM now() - min(run_at) FILTER (WHERE status = 'queued' AND run_at <= now()))
+                   AS oldest_ready_seconds
+        FROM jobs
+        WHERE status IN ('queued', 'running')
+        GROUP BY queue, name
+    ),
+    recent AS (
+        SELECT queue, name,
+               count(*) FILTER (WHERE status = 'succeeded') AS succeeded,
+               count(*) FILTER (WHERE status = 'failed') AS failed,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY extract(epoch FROM finished_at - started_at)) AS run_p50_seconds,
+               percentile_cont(0.95) WITHIN GROUP (ORDER BY extract(epoch FROM finished_at - started_at)) AS run_p95_seconds,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY extract(epoch FROM started_at - run_at)) AS wait_p50_seconds,
+               percentile_cont(0.95) WITHIN GROUP (ORDER BY extract(epoch FROM started_at - run_at)) AS wait_p95_seconds
+        FROM jobs
+        WHERE finished_at >= now() - make_interval(secs => :window)
+        GROUP BY queue, name
+    )
+    SELECT *
+    FROM live FULL JOIN recent USING (queue, name)
+    ORDER BY queue, name
+""")
+
+
+class JobError(ValueError):
+    pass
+
+
+async def get_job(db: AsyncSession, job_id: int, name: Optional[str] = None) -> Job:
+    """The job, optionally only if it is a `name` job."""
+    query = select(Job).where(Job.id == job_id)
+    if name is not None:
+        query = query.where(Job.name == name)
+    job = (await db.execute(query)).scalar_one_or_none()
+    if job is None:
+        raise JobError(f"Job {job_id} not found")
+    return job
+
+
+async def job_stats(db: AsyncSession, window: int = 3600) -> list:
+    """Per (queue, job name): backlog now, outcomes and timings over the last `window` seconds."""
+    rows = (await db.execute(JOB_STATS_SQL, {"window": window})).mappings().all()
+    return [{key: value for key, value in row.items() if value is not None} for row in rows]
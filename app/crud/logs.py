@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.pagination import Page, SortKey, paginate
+from app.models.logs import Log
+
+# Newest first; served by the (level|module, timestamp, id) indexes
+LOG_SORT_KEY = SortKey.of(Log.timestamp.desc(), Log.id.desc())
+
+
+async def query_logs(
+    db: AsyncSession,
+    level: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    module: Optional[str] = None,
+    extra: Optional[dict] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    with_total: bool = False,
+) -> Page:
+    """
+    Return one page of logs, newest first.
+
+    Paging is keyset on (timestamp, id), so deep pages cost the same as the
+    first one. The time bounds let Postgres prune partitions, `extra` is
+    matched with JSONB containment (@>) which the GIN index serves.
+    """
+    query = select(Log)
+    if level:
+        query = query.where(Log.level == level.upper())
+    if module:
+        query = query.where(Log.module == module)
+    if start:
+        query = query.where(Log.timestamp >= start)
+    if end:
+        query = query.where(Log.timestamp < end)
+    if extra:
+        query = query.where(Log.extra.contains(extra))
+    return await paginate(
+        db, query, LOG_SORT_KEY, scope="logs", cursor=cursor, limit=limit, with_total=with_total
+    )
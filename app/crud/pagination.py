@@ -0,0 +1,238 @@
+"""
+Keyset pagination shared by the list endpoints.
+
+A list declares its sort key, e.g. `(Log.timestamp.desc(), Log.id.desc())`;
+the last column must make the key unique. A page is fetched with
+`WHERE (sort key) > (values of the last row seen)` instead of OFFSET, so
+page 10,000 is one index range scan just like page 1.
+
+Cursors are opaque: base64 JSON of the boundary row's key values and the
+paging direction, signed with HMAC-SHA256 over the list's `scope` so a
+cursor cannot be forged, edited or replayed against another endpoint.
+Totals are optional and estimated from planner statistics, never COUNT(*).
+"""
+import base64
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import Select, and_, false, or_, text, tuple_
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from app.core.config import settings
+
+NEXT = "n"
+PREV = "p"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """Ordered (column, descending) pairs, parsed from ORDER BY expressions."""
+    columns: tuple = field(default_factory=tuple)
+
+    @classmethod
+    def of(cls, *order_by) -> "SortKey":
+        columns = []
+        for expression in order_by:
+            descending = False
+            if isinstance(expression, UnaryExpression) and expression.modifier in (operators.desc_op, operators.asc_op):
+                descending = expression.modifier is operators.desc_op
+                expression = expression.element
+            columns.append((expression, descending))
+        return cls(tuple(columns))
+
+    def order_by(self, reverse: bool = False) -> list:
+        return [
+            column.desc() if descending != reverse else column.asc()
+            for column, descending in self.columns
+        ]
+
+    def after(self, values: Sequence, reverse: bool = False):
+        """Condition selecting the rows that sort after `values` (before, if `reverse`)."""
+        directions = {descending for _, descending in self.columns}
+        if len(directions) == 1:
+            # Uniform direction: a row comparison, which a composite index serves directly
+            columns = tuple_(*(column for column, _ in self.columns))
+            if directions.pop() != reverse:
+                return columns < tuple_(*values)
+            return columns > tuple_(*values)
+
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        clauses = []
+        for i, (column, descending) in enumerate(self.columns):
+            equal = [c == v for (c, _), v in zip(self.columns[:i], values)]
+            step = column < values[i] if descending != reverse else column > values[i]
+            clauses.append(and_(*equal, step))
+        return or_(*clauses) if clauses else false()
+
+    def values_of(self, row) -> list:
+        return [getattr(row, column.key) for column, _ in self.columns]
+
+
+# -----------------------------
+# Cursor encoding
+# -----------------------------
+def _to_json(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(scope: str, payload: bytes) -> bytes:
+    key = (settings.PAGINATION_CURSOR_SECRET or settings.SECRET_KEY).encode()
+    return hmac.new(key, scope.encode() + b"\x00" + payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(scope: str, values: Sequence, direction: str = NEXT) -> str:
+    payload = json.dumps([direction, [_to_json(v) for v in values]], separators=(",", ":")).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_signature(scope, payload))}"
+
+
+def decode_cursor(scope: str, cursor: str, key_length: int) -> tuple:
+    """Return (direction, values); raises InvalidCursor on anything unexpected."""
+    try:
+        payload_part, signature_part = cursor.split(".", 1)
+        payload = _b64decode(payload_part)
+        if not hmac.compare_digest(_b64decode(signature_part), _signature(scope, payload)):
+            raise InvalidCursor("Invalid cursor")
+        direction, values = json.loads(payload)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if direction not in (NEXT, PREV) or not isinstance(values, list) or len(values) != key_length:
+        raise InvalidCursor("Invalid cursor")
+    return direction, [_from_json(v) for v in values]
+
+
+# -----------------------------
+# Totals
+# -----------------------------
+async def estimate_table_rows(db: AsyncSession, table_name: str) -> int:
+    """Row count from pg_class statistics; partitioned tables sum their partitions."""
+    result = await db.execute(text("""
+        SELECT coalesce(sum(greatest(c.reltuples, 0)), 0)::bigint
+        FROM pg_class c
+        WHERE c.oid = to_regclass(:table)
+           OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table))
+    """), {"table": table_name})
+    return result.scalar_one()
+
+
+async def estimate_query_rows(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    The planner's row estimate for `query` (EXPLAIN only plans, it does not
+    run it). None when a bound value cannot be rendered inline.
+    """
+    try:
+        compiled = query.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    except (CompileError, NotImplementedError):
+        return None
+    # Driver-level SQL: the rendered literals must not be re-parsed as binds
+    conn = await db.connection()
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def estimate_total(db: AsyncSession, query: Select) -> Optional[int]:
+    # Unfiltered single-table lists read pg_class; anything else asks the planner
+    froms = query.get_final_froms()
+    if query.whereclause is None and len(froms) == 1 and hasattr(froms[0], "name"):
+        return await estimate_table_rows(db, froms[0].name)
+    return await estimate_query_rows(db, query)
+
+
+# -----------------------------
+# Paging
+# -----------------------------
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_key: SortKey,
+    scope: str,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    with_total: bool = False,
+) -> Page:
+    """
+    Fetch one page of `query` (which must not be ordered or limited yet).
+
+    `next_cursor` continues after the last item, `prev_cursor` goes back to
+    the page before the first one; each is None when there is nothing there.
+    """
+    total = await estimate_total(db, query) if with_total else None
+
+    direction, reverse, paged = NEXT, False, query
+    if cursor:
+        direction, values = decode_cursor(scope, cursor, len(sort_key.columns))
+        reverse = direction == PREV
+        paged = paged.where(sort_key.after(values, reverse=reverse))
+
+    # One extra row tells whether there is another page in the paging direction
+    paged = paged.order_by(*sort_key.order_by(reverse=reverse)).limit(limit + 1)
+    result = await db.execute(paged)
+    rows = result.scalars().all() if _selects_entity(query) else result.all()
+    has_more = len(rows) > limit
+    rows = list(rows[:limit])
+    if reverse:
+        rows.reverse()
+
+    page = Page(items=rows, total_estimate=total)
+    if not rows:
+        return page
+    first, last = sort_key.values_of(rows[0]), sort_key.values_of(rows[-1])
+    if reverse:
+        # Came backwards from a cursor, so there is always a page after this one
+        page.next_cursor = encode_cursor(scope, last, NEXT)
+        page.prev_cursor = encode_cursor(scope, first, PREV) if has_more else None
+    else:
+        page.next_cursor = encode_cursor(scope, last, NEXT) if has_more else None
+        page.prev_cursor = encode_cursor(scope, first, PREV) if cursor else None
+    return page
+
+
+def _selects_entity(query: Select) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["entity"] is not None and descriptions[0]["expr"] is descriptions[0]["entity"]
@@ -0,0 +1,104 @@
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import audit
+from app.core.config import settings
+from app.models.product import Product
+
+
+class ProductError(ValueError):
+    pass
+
+
+# One statement per chunk: the changes travel as four parallel arrays, so the
+# statement (and its plan) is the same whatever the chunk size. The final
+# SELECT reads `products` as of before the UPDATE, which is what explains the
+# rows that were not updated.
+BULK_PRICE_STOCK_SQL = text("""
+    WITH v AS (
+        SELECT *
+        FROM unnest(
+            CAST(:skus AS varchar[]),
+            CAST(:prices AS numeric[]),
+            CAST(:stock_deltas AS integer[]),
+            CAST(:expected_versions AS integer[])
+        ) AS v(sku, price, stock_delta, expected_version)
+    ),
+    upd AS (
+        UPDATE products p
+        SET price = COALESCE(v.price, p.price),
+            stock = p.stock + COALESCE(v.stock_delta, 0),
+            version = p.version + 1,
+            updated_at = now()
+        FROM v
+        WHERE p.sku = v.sku
+          AND (v.expected_version IS NULL OR p.version = v.expected_version)
+          AND p.stock + COALESCE(v.stock_delta, 0) >= 0
+        RETURNING p.sku, p.price, p.stock, p.version
+    )
+    SELECT
+        v.sku,
+        CASE
+            WHEN upd.sku IS NOT NULL THEN 'updated'
+            WHEN p.sku IS NULL THEN 'not_found'
+            WHEN v.expected_version IS NOT NULL AND p.version <> v.expected_version THEN 'conflict'
+            ELSE 'insufficient_stock'
+        END AS status,
+        COALESCE(upd.price, p.price) AS price,
+        COALESCE(upd.stock, p.stock) AS stock,
+        COALESCE(upd.version, p.version) AS version,
+        p.id,
+        p.price AS old_price,
+        p.stock AS old_stock
+    FROM v
+    LEFT JOIN upd ON upd.sku = v.sku
+    LEFT JOIN products p ON p.sku = v.sku
+""")
+
+
+async def bulk_update_price_stock(
+    db: AsyncSession,
+    items: list,
+    chunk_size: int = settings.BULK_UPDATE_CHUNK_SIZE,
+) -> list:
+    """
+    Apply (sku, price, stock_delta) changes set-based, one statement per chunk.
+
+    Rows whose `expected_version` no longer matches, or whose stock would go
+    negative, are left untouched and reported instead of failing the batch.
+    Returns one result mapping per item, in request order. The caller commits.
+    """
+    results = []
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        rows = await db.execute(BULK_PRICE_STOCK_SQL, {
+            "skus": [item.sku for item in chunk],
+            "prices": [item.price for item in chunk],
+            "stock_deltas": [item.stock_delta for item in chunk],
+            "expected_versions": [item.expected_version for item in chunk],
+        })
+        by_sku = {row.sku: row._mapping for row in rows}
+        results.extend(by_sku[item.sku] for item in chunk)
+        for row in by_sku.values():
+            if row["status"] != "updated":
+                continue
+            changes = {"price": (row["old_price"], row["price"]), "stock": (row["old_stock"], row["stock"])}
+            audit.record(db, "product", row["id"], "update", {k: v for k, v in changes.items() if v[0] != v[1]})
+    return results
+
+
+async def get_product(db: AsyncSession, product_id: int) -> Product:
+    product = await db.get(Product, product_id)
+    if product is None or not product.is_active:
+        raise ProductError(f"Product {product_id} not found")
+    return product
+
+
+async def get_product_state(db: AsyncSession, product_id: int):
+    """(version, modified_at) of an active product, None if there is none; validates GET responses."""
+    result = await db.execute(
+        select(Product.version, func.coalesce(Product.updated_at, Product.created_at).label("modified_at"))
+        .where(Product.id == product_id, Product.is_active.is_(True))
+    )
+    return result.one_or_none()
+
@@ -0,0 +1,151 @@
+"""
+Product search backed by Postgres.
+
+A query matches a product when any of these hold, each served by its own
+GIN index (Postgres ORs them with a BitmapOr):
+
+- full-text: `search_vector @@ tsquery`, the last word as a prefix ("runn:*"),
+- typo-tolerant: `term <% name`, pg_trgm word similarity against the name,
+- SKU prefix: `sku ILIKE 'term%'`, through the trigram index on sku.
+
+Hits, the total and the brand / tag / category facets are computed from the
+same MATERIALIZED set of matches in a single statement, so a search is one
+round-trip. Every match is scored, but only the SEARCH_MAX_MATCHES best are
+kept (a top-N sort) for the hits and facets, which keeps very broad queries
+("a") within the latency budget. The cut is by score, so the best hits are
+never lost to it; the facets then count the kept matches only, which the
+response flags with `facets.capped`.
+"""
+import re
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.core.cache.cache import make_key
+from app.core.config import settings
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Filters are fixed SQL fragments; user values only ever go through binds
+_FILTERS = {
+    "brand": "AND p.brand = :brand",
+    "category_id": """AND p.category_id IN (
+        SELECT c.id FROM categories c, categories root
+        WHERE root.id = :category_id
+          AND c.path >= root.path AND c.path < rtrim(root.path, '/') || '0'
+          AND c.is_active IS TRUE
+    )""",
+    "tags": "AND p.tags @> :tags",
+    "min_price": "AND p.price >= :min_price",
+    "max_price": "AND p.price <= :max_price",
+}
+
+SEARCH_SQL = """
+    WITH q AS (
+        SELECT to_tsquery('english', :tsquery) AS tsq, CAST(:term AS text) AS term
+    ),
+    matches AS MATERIALIZED (
+        SELECT p.id, p.sku, p.name, p.brand, p.category_id, p.tags, p.price, p.stock,
+               ts_rank_cd(p.search_vector, q.tsq) + word_similarity(q.term, p.name) AS score
+        FROM products p, q
+        WHERE p.is_active IS TRUE
+          AND (p.search_vector @@ q.tsq OR q.term <% p.name OR p.sku ILIKE :sku_prefix)
+          {filters}
+        ORDER BY score DESC, p.id
+        LIMIT :max_matches
+    )
+    SELECT
+        (SELECT count(*) FROM matches) AS total,
+        (SELECT coalesce(json_agg(h), '[]') FROM (
+            SELECT * FROM matches ORDER BY score DESC, id LIMIT :limit OFFSET :offset
+        ) h) AS hits,
+        (SELECT coalesce(json_agg(f), '[]') FROM (
+            SELECT brand AS value, count(*) AS count FROM matches
+            WHERE brand IS NOT NULL
+            GROUP BY brand ORDER BY count(*) DESC, brand LIMIT :facet_limit
+        ) f) AS brands,
+        (SELECT coalesce(json_agg(f), '[]') FROM (
+            SELECT tag AS value, count(*) AS count FROM (SELECT unnest(tags) AS tag FROM matches) t
+            GROUP BY tag ORDER BY count(*) DESC, tag LIMIT :facet_limit
+        ) f) AS tags,
+        (SELECT coalesce(json_agg(f), '[]') FROM (
+            SELECT m.category_id AS id, c.name, count(*) AS count
+            FROM matches m JOIN categories c ON c.id = m.category_id
+            GROUP BY m.category_id, c.name ORDER BY count(*) DESC, m.category_id LIMIT :facet_limit
+        ) f) AS categories
+"""
+
+
+def build_tsquery(term: str) -> Optional[str]:
+    """'red runn' -> 'red & runn:*'; None when the term has no words."""
+    words = _WORD.findall(term.lower())
+    if not words:
+        return None
+    return " & ".join(words[:-1] + [words[-1] + ":*"])
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _run_search(db: AsyncSession, params: dict, filters: List[str]) -> dict:
+    statement = text(SEARCH_SQL.format(filters="\n          ".join(_FILTERS[f] for f in filters)))
+    if "tags" in filters:
+        statement = statement.bindparams(bindparam("tags", type_=ARRAY(String)))
+    row = (await db.execute(statement, params)).one()
+    capped = row.total >= params["max_matches"]
+    return {
+        "total": row.total,
+        "total_capped": capped,
+        "hits": row.hits,
+        "facets": {"brands": row.brands, "tags": row.tags, "categories": row.categories, "capped": capped},
+    }
+
+
+async def search_products(
+    db: AsyncSession,
+    term: str,
+    brand: Optional[str] = None,
+    category_id: Optional[int] = None,
+    tags: Optional[List[str]] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    limit: int = 20,
+    offset: int = 0,
+    use_cache: bool = True,
+) -> dict:
+    """Ranked hits plus facet counts; results are cached briefly per query."""
+    term = term.strip()
+    tsquery = build_tsquery(term)
+    if tsquery is None:
+        raise ValueError("Search term must contain at least one word")
+
+    params = {
+        "tsquery": tsquery,
+        "term": term,
+        "sku_prefix": _escape_like(term) + "%",
+        "brand": brand,
+        "category_id": category_id,
+        "tags": sorted(tags) if tags else None,
+        "min_price": min_price,
+        "max_price": max_price,
+        "limit": limit,
+        "offset": offset,
+        "max_matches": settings.SEARCH_MAX_MATCHES,
+        "facet_limit": settings.SEARCH_FACET_LIMIT,
+    }
+    filters = [name for name in _FILTERS if params[name] is not None]
+    params = {k: v for k, v in params.items() if k not in _FILTERS or k in filters}
+
+    if not use_cache:
+        return await _run_search(db, params, filters)
+    return await get_cache().get_or_load(
+        make_key("search", (), params),
+        lambda: _run_search(db, params, filters),
+        ttl=settings.SEARCH_CACHE_TTL,
+        tags=["products", "categories"],
+    )
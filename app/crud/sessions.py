@@ -0,0 +1,106 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import RefreshSession, Team, TeamMember
+
+SESSION_LIFETIME = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+class SessionError(ValueError):
+    pass
+
+
+def new_token_id() -> str:
+    return str(uuid.uuid4())
+
+
+async def create_session(db: AsyncSession, user_id: int) -> Tuple[str, str]:
+    """Start a session for a login; returns (session id, jti of its first refresh token). The caller commits."""
+    session_id, jti = new_token_id(), new_token_id()
+    await db.execute(insert(RefreshSession).values(
+        id=session_id,
+        user_id=user_id,
+        jti=jti,
+        expires_at=datetime.now(timezone.utc) + SESSION_LIFETIME,
+    ))
+    return session_id, jti
+
+
+async def rotate_session(db: AsyncSession, session_id: str, jti: str) -> Optional[Tuple[dict, str]]:
+    """
+    Swap the session's refresh token `jti` for a new one and read the user's
+    memberships, in one statement. Returns (memberships, new jti), or None
+    when `jti` is not the session's current token or the session is revoked
+    or expired. The caller commits.
+    """
+    new_jti = new_token_id()
+    rotated = (
+        update(RefreshSession)
+        .where(
+            RefreshSession.id == session_id,
+            RefreshSession.jti == jti,
+            RefreshSession.revoked_at.is_(None),
+            RefreshSession.expires_at > func.now(),
+        )
+        .values(jti=new_jti, rotated_at=func.now(), expires_at=func.now() + SESSION_LIFETIME)
+        .returning(RefreshSession.user_id)
+        .cte("rotated")
+    )
+    # Same filter as auth.load_memberships
+    memberships = (
+        select(TeamMember.user_id, TeamMember.team_id, TeamMember.role)
+        .join(Team, Team.id == TeamMember.team_id)
+        .where(TeamMember.is_active.is_(True), Team.is_active.is_(True))
+        .subquery()
+    )
+    result = await db.execute(
+        select(rotated.c.user_id, memberships.c.team_id, memberships.c.role)
+        .select_from(rotated)
+        .outerjoin(memberships, memberships.c.user_id == rotated.c.user_id)
+    )
+    rows = result.all()
+    if not rows:
+        return None
+    return {row.team_id: row.role for row in rows if row.team_id is not None}, new_jti
+
+
+async def get_session(db: AsyncSession, session_id: str) -> RefreshSession:
+    session = await db.get(RefreshSession, session_id)
+    if session is None:
+        raise SessionError(f"Session {session_id} not found")
+    return session
+
+
+async def revoke_session(db: AsyncSession, session_id: str, reason: str) -> Optional[datetime]:
+    """Revoke a live session; returns its expiry, None if it was already revoked or does not exist."""
+    result = await db.execute(
+        update(RefreshSession)
+        .where(RefreshSession.id == session_id, RefreshSession.revoked_at.is_(None))
+        .values(revoked_at=func.now(), revoked_reason=reason)
+        .returning(RefreshSession.expires_at)
+    )
+    return result.scalar_one_or_none()
+
+
+async def revoke_user_sessions(db: AsyncSession, user_id: int, reason: str) -> int:
+    """Revoke every live session of a user; returns how many there were."""
+    result = await db.execute(
+        update(RefreshSession)
+        .where(RefreshSession.user_id == user_id, RefreshSession.revoked_at.is_(None))
+        .values(revoked_at=func.now(), revoked_reason=reason)
+    )
+    return result.rowcount
+
+
+async def revoked_sessions(db: AsyncSession) -> List[Tuple[str, datetime]]:
+    """(session id, expiry) of revoked sessions whose tokens have not expired yet."""
+    result = await db.execute(
+        select(RefreshSession.id, RefreshSession.expires_at)
+        .where(and_(RefreshSession.revoked_at.isnot(None), RefreshSession.expires_at > func.now()))
+    )
+    return result.all()
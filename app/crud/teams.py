@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.pagination import Page, SortKey, paginate
+from app.models.user import Team, TeamMember
+
+# Latest change to a row; rows never updated only have their creation time
+TEAM_MODIFIED = func.coalesce(Team.updated_at, Team.created_at)
+MEMBER_MODIFIED = func.coalesce(TeamMember.updated_at, TeamMember.added_at)
+
+# Oldest membership first
+MEMBER_SORT_KEY = SortKey.of(TeamMember.id)
+
+
+class TeamError(ValueError):
+    pass
+
+
+async def get_team(db: AsyncSession, team_id: int) -> Team:
+    team = await db.get(Team, team_id)
+    if team is None or not team.is_active:
+        raise TeamError(f"Team {team_id} not found")
+    return team
+
+
+def _members_query(team_id: int, *columns):
+    return select(*(columns or (TeamMember,))).where(TeamMember.team_id == team_id, TeamMember.is_active.is_(True))
+
+
+async def get_members(
+    db: AsyncSession,
+    team_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    with_total: bool = False,
+) -> Page:
+    """Active memberships of an active team, oldest first, one keyset page at a time."""
+    await get_team(db, team_id)
+    return await paginate(
+        db, _members_query(team_id), MEMBER_SORT_KEY,
+        scope=f"teams:{team_id}:members", cursor=cursor, limit=limit, with_total=with_total,
+    )
+
+
+# -----------------------------
+# Conditional GET validators (see app/core/conditional.py)
+# -----------------------------
+async def get_team_state(db: AsyncSession, team_id: int) -> Optional[datetime]:
+    """Latest modification of an active team, None if there is none."""
+    result = await db.execute(
+        select(TEAM_MODIFIED).where(Team.id == team_id, Team.is_active.is_(True))
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_members_state(
+    db: AsyncSession, team_id: int, cursor: Optional[str] = None, limit: int = 100
+) -> Page:
+    """
+    The page `get_members` would return, as (id, modified_at) rows: a role
+    change moves modified_at, an added or removed membership changes which
+    ids are on the page.
+    """
+    return await paginate(
+        db, _members_query(team_id, TeamMember.id, MEMBER_MODIFIED.label("modified_at")), MEMBER_SORT_KEY,
+        scope=f"teams:{team_id}:members", cursor=cursor, limit=limit,
+    )
@@ -0,0 +1,5 @@
+# app/database/asyncio/base.py
+# Async sessions work on the same models, so they share the sync declarative Base
+from app.database.sync.base import Base
+
+__all__ = ["Base"]
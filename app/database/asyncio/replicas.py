@@ -0,0 +1,254 @@
+"""
+Read replica routing for the async session layer.
+
+Read-only endpoints depend on `get_read_db` instead of `get_async_db`. With
+DB_REPLICA_HOSTS set, their session is bound to one of the replicas, picked
+round-robin or by fewest checked-out connections (DB_REPLICA_BALANCING).
+Everything else keeps using the primary.
+
+A replica is skipped while it is down or its replay lag exceeds
+DB_REPLICA_MAX_LAG; a background task re-checks every replica each
+DB_REPLICA_HEALTH_INTERVAL seconds. If the chosen replica refuses the
+connection the request falls back to the primary and the replica is marked
+down until the next check.
+
+Read-your-writes: `ReadYourWritesMiddleware` sets a short-lived cookie on
+any successful write, and reads from a client holding a fresh cookie go to
+the primary, so a client never reads a replica that has not replayed its
+own write yet. Cached reads refilled from a replica can be stale by at most
+DB_REPLICA_MAX_LAG on top of their TTL.
+"""
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.database.asyncio.session import new_async_session
+from app.database.pool import engine_options, get_pool_monitor
+
+READ_YOUR_WRITES_COOKIE = "cf_rw"
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# Fail over quickly instead of waiting for asyncpg's 60 s default
+REPLICA_CONNECT_TIMEOUT = 2.0
+
+# Silence after which a replica that still reports 'streaming' is not trusted
+# to be caught up; matches the default wal_receiver_timeout
+REPLICA_RECEIPT_TIMEOUT = 60.0
+
+# Zero when the replica has replayed everything it received and is still
+# hearing from the primary (an idle primary does not make a replica look
+# lagged); otherwise the age of the last replay, so a replica cut off from
+# the primary ages instead of reporting zero forever. NULL (nothing replayed
+# and not streaming) marks the replica down. Reading pg_stat_wal_receiver
+# needs pg_monitor / pg_read_all_stats; without it the age of the last replay
+# is always used.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+             AND EXISTS (
+                 SELECT 1 FROM pg_stat_wal_receiver
+                 WHERE status = 'streaming'
+                   AND last_msg_receipt_time > now() - make_interval(secs => :receipt_timeout)
+             ) THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class Replica:
+    """One replica engine plus its last known health."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        options = engine_options(name, is_async=True)
+        options.setdefault("connect_args", {})["timeout"] = REPLICA_CONNECT_TIMEOUT
+        self.engine = create_async_engine(url, echo=False, **options)
+        get_pool_monitor(name).attach(self.engine.sync_engine)
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        self.healthy = True
+        self.lag_seconds = 0.0
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def in_use(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+
+    async def check(self, max_lag: float):
+        try:
+            async with self.engine.connect() as conn:
+                lag = (await conn.execute(text(LAG_SQL), {"receipt_timeout": REPLICA_RECEIPT_TIMEOUT})).scalar_one()
+            if lag is None:
+                raise RuntimeError("not streaming from the primary and nothing replayed yet")
+            lag = float(lag)
+        except Exception as e:
+            self.mark_down(e)
+        else:
+            self.lag_seconds = lag
+            self.healthy = lag <= max_lag
+            self.last_error = None if self.healthy else f"replay lag {lag:.1f}s"
+        self.checked_at = time.time()
+
+    def mark_down(self, error: Exception):
+        if self.healthy:
+            logger.warning(f"Replica {self.name} unavailable, reading from the primary: {error}")
+        self.healthy = False
+        self.last_error = str(error) or type(error).__name__
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": round(self.lag_seconds, 3),
+            "in_use": self.in_use,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at,
+        }
+
+
+class ReplicaRouter:
+    """Chooses a replica per read session and keeps replica health current."""
+
+    def __init__(self, urls: List[str], balancing: str = "round_robin", max_lag: float = 5.0, interval: float = 5.0):
+        if balancing not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica balancing {balancing!r}")
+        self.replicas = [Replica(f"replica-{i}", url) for i, url in enumerate(urls)]
+        self.balancing = balancing
+        self.max_lag = max_lag
+        self.interval = interval
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """A healthy replica, or None to read from the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.balancing == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_use)
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check(self):
+        await asyncio.gather(*(replica.check(self.max_lag) for replica in self.replicas))
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def start(self):
+        await self.check()
+        self._task = asyncio.create_task(self._health_loop(), name="replica-health")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.gather(*(replica.engine.dispose() for replica in self.replicas))
+
+    def stats(self) -> dict:
+        return {
+            "balancing": self.balancing,
+            "max_lag_seconds": self.max_lag,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+
+_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """The process-wide router, created on first use; None without replicas."""
+    global _router
+    if _router is None and settings.ASYNC_REPLICA_URLS:
+        _router = ReplicaRouter(
+            settings.ASYNC_REPLICA_URLS,
+            balancing=settings.DB_REPLICA_BALANCING,
+            max_lag=settings.DB_REPLICA_MAX_LAG,
+            interval=settings.DB_REPLICA_HEALTH_INTERVAL,
+        )
+    return _router
+
+
+async def close_replica_router():
+    global _router
+    if _router is not None:
+        await _router.close()
+        _router = None
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def _open_read_session(request: Request) -> AsyncSession:
+    router = get_replica_router()
+    replica = router.choose() if router is not None and not wrote_recently(request) else None
+    if replica is None:
+        return new_async_session()
+    session = replica.sessionmaker()
+    try:
+        # Connect now so a dead replica is noticed before the endpoint runs
+        await session.connection()
+    except Exception as e:
+        await session.close()
+        replica.mark_down(e)
+        return new_async_session()
+    return session
+
+
+# Dependency for read-only async FastAPI endpoints
+async def get_read_db(request: Request):
+    """
+    Yields a session on a replica when one is healthy and the client has not
+    written recently, on the primary otherwise. Never write through it.
+    """
+    async with await _open_read_session(request) as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: a successful POST/PUT/PATCH/DELETE sets a cookie
+    holding the time until which the client's reads stay on the primary.
+    """
+
+    def __init__(self, app, window: float = settings.READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={int(self.window) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
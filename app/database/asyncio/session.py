@@ -0,0 +1,64 @@
+# app/database/asyncio/session.py
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.database.pool import engine_options, get_pool_monitor
+from app.core import audit  # noqa: F401  registers the audit trail session hooks
+
+# Built on first use, like the sync engine (see app/database/sync/session.py)
+_async_engine = None
+
+# Async session factory, bound to the engine by `get_async_engine`; use
+# `new_async_session()` so the engine is guaranteed to exist
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+def get_async_engine():
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            echo=False,
+            **engine_options("async", is_async=True),
+        )
+        get_pool_monitor("async").attach(_async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def new_async_session() -> AsyncSession:
+    get_async_engine()
+    return AsyncSessionLocal()
+
+
+async def warm_up_async_pool(connections: int):
+    """Open `connections` pooled connections concurrently, then return them to the pool."""
+    engine = get_async_engine()
+    conns = await asyncio.gather(*(engine.connect() for _ in range(max(1, connections))))
+    try:
+        await conns[0].execute(text("SELECT 1"))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns))
+
+
+async def dispose_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+# Dependency for async FastAPI endpoints
+async def get_async_db():
+    """
+    Yields an async DB session for each request, ensures proper closure.
+    """
+    async with new_async_session() as db:
+        yield db
@@ -0,0 +1,169 @@
+"""
+Connection pool configuration and instrumentation shared by the sync and
+async engines.
+
+`engine_options(name)` returns the create_engine kwargs built from settings.
+The pool classes time `_do_get`, i.e. how long a caller waited for a
+connection (including opening a new one), and pool events record how long
+connections are held and how far into overflow the pool goes. This tells
+"Postgres is slow" apart from "we are queueing for a connection".
+
+With DB_PGBOUNCER the async engine stops relying on server-side prepared
+statements, which do not survive PgBouncer's transaction pooling (the next
+transaction may run on another server connection). psycopg2 never prepares
+statements server-side, so the sync engine needs no change.
+"""
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+_monitors = {}
+
+
+class PoolMonitor:
+    """Counters and latency histograms of one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.engine = None
+        self.wait = Histogram()
+        self.hold = Histogram()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.max_overflow_seen = 0
+
+    def attach(self, engine):
+        """Register the pool event listeners; they survive `engine.dispose()`."""
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        self.engine = engine
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait.observe(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        pool = self.engine.pool
+        overflow = max(0, pool.checkedout() - pool.size())
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+                self.max_overflow_seen = max(self.max_overflow_seen, overflow)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            with self._lock:
+                self.hold.observe(time.perf_counter() - checked_out_at)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "max_overflow_seen": self.max_overflow_seen,
+                "wait_p50_ms": round(self.wait.quantile(0.5) * 1000, 3),
+                "wait_p99_ms": round(self.wait.quantile(0.99) * 1000, 3),
+                "wait_total_seconds": round(self.wait.total, 6),
+                "hold_p50_ms": round(self.hold.quantile(0.5) * 1000, 3),
+                "hold_p99_ms": round(self.hold.quantile(0.99) * 1000, 3),
+            }
+        if self.engine is not None:
+            pool = self.engine.pool
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(0, pool.overflow()),
+            })
+        return stats
+
+
+def get_pool_monitor(name: str) -> PoolMonitor:
+    monitor = _monitors.get(name)
+    if monitor is None:
+        monitor = _monitors[name] = PoolMonitor(name)
+    return monitor
+
+
+def pool_stats() -> dict:
+    """{engine name: stats} for every engine created so far."""
+    return {name: monitor.stats() for name, monitor in _monitors.items()}
+
+
+class _TimedCheckoutMixin:
+    # The pool's logging name ("sync" / "async") doubles as the monitor key,
+    # since SQLAlchemy keeps it when it recreates the pool
+    def _do_get(self):
+        monitor = _monitors.get(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            if monitor is not None:
+                monitor.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if monitor is not None:
+            monitor.observe_wait(time.perf_counter() - start)
+        return record
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
+def engine_options(name: str, is_async: bool) -> dict:
+    """create_engine / create_async_engine kwargs for the `name` engine."""
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if is_async and settings.DB_PGBOUNCER:
+        options["connect_args"] = {
+            # No asyncpg statement cache and no SQLAlchemy prepared statement
+            # cache; unique names avoid "prepared statement already exists"
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return options
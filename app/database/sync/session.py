@@ -1,31 +1,59 @@
 # app/database/sync/session.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.database.pool import engine_options, get_pool_monitor
+from app.core import audit  # noqa: F401  registers the audit trail session hooks
 
-# Database URL from .env
-DATABASE_URL =settings.DATABASE_URL
+# The engine is built on first use, not at import time, so importing the app
+# (CLIs, workers, tests) never touches the DB
+_engine = None
 
-# Create engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,        # Log SQL queries for debugging
-    pool_size=10,
-    max_overflow=20
-)
-
-# Session factory
+# Session factory, bound to the engine by `get_engine`
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine
 )
 
+
+def get_engine():
+    """Return the process-wide engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            settings.DATABASE_URL,
+            echo=False,        # Log SQL queries for debugging
+            **engine_options("sync", is_async=False),
+        )
+        get_pool_monitor("sync").attach(_engine)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def warm_up_pool(connections: int):
+    """Check that the DB answers and open `connections` pooled connections."""
+    engine = get_engine()
+    conns = [engine.connect() for _ in range(max(1, connections))]
+    try:
+        conns[0].execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def dispose_engine():
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
 # Dependency for FastAPI endpoints
 def get_db():
     """
     Yields a DB session for each request, ensures proper closure.
     """
+    get_engine()
     db = SessionLocal()
     try:
         yield db
@@ -1,46 +1,103 @@
-from fastapi import FastAPI,Request
-from app.database.sync.session import engine
-from contextlib import asynccontextmanager
-from app.core.config import settings
-from app.core.logger import logger
-import time 
-from sqlalchemy import text
+from app.core.startup import startup_profiler
 
+with startup_profiler.phase("settings"):
+    from app.core.config import settings
+
+with startup_profiler.phase("imports"):
+    from fastapi import FastAPI
+    from app.database.sync.session import dispose_engine, get_engine, warm_up_pool
+    from app.database.asyncio.session import dispose_async_engine, get_async_engine, warm_up_async_pool
+    from app.database.asyncio.replicas import ReadYourWritesMiddleware, close_replica_router, get_replica_router
+    from contextlib import asynccontextmanager
+    from app.core.logger import logger, setup_logger, shutdown_logger
+    from app.utils.password_pool import password_pool
+    from app.core.cache import get_cache
+    from app.core.metrics import TimingMiddleware
+    from app.core.rate_limit import RateLimitMiddleware, get_rate_limiter
+    from app.core.revocation import revocations
+    import asyncio
+    import time
+
+    #import all routes
+    from app.api.v1.routers import health
+    from app.api.v1.routers import auth
+    from app.api.v1.routers import metrics
+    from app.api.v1.routers import logs
+    from app.api.v1.routers import products
+    from app.api.v1.routers import categories
+    from app.api.v1.routers import search
+    from app.api.v1.routers import admin
+    from app.api.v1.routers import changes
+    from app.api.v1.routers import audit
+    from app.api.v1.routers import teams
+
+
+async def _timed(name: str, fn, *args):
+    """Run a blocking warm-up step in a thread and record how long it took."""
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(fn, *args)
+    except Exception as e:
+        logger.error(f"Warm-up step {name} failed: {e}")
+    finally:
+        startup_profiler.record(name, time.perf_counter() - start)
+
+
+async def _warm_up_databases():
+    connections = min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE)
+    try:
+        # The async pool serves requests; the sync one only logs and imports
+        await asyncio.gather(warm_up_async_pool(connections), asyncio.to_thread(warm_up_pool, 1))
+        logger.info(f"Database reachable, {connections} pooled connections opened")
+    except Exception as e:
+        logger.error(f"Database connection failed: {e}")
 
-#import all routes
-from app.api.v1.routers import health
-from app.api.v1.routers import auth
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Handles startup/shutdown events:
-    - Tests DB connection
-    - Pre-warms connection pool
-    - Initializes logger
+    - Attaches the log handlers (file, console, batched DB writer)
+    - Creates the DB engines
+    - Warms up the DB pools concurrently, the password hashing workers in the background
+    - Checks the read replicas, if any, and keeps checking them in the background
+    - Starts cache invalidation sync
+    - Loads the revoked sessions and keeps them in sync with the other workers
+    Each phase is timed by `startup_profiler`.
     """
     # -------------------------
     # Startup
     # -------------------------
+    with startup_profiler.phase("logging"):
+        setup_logger(log_to_db=True)
     logger.info("Application startup initiated")
 
-    # Test DB connection
-    try:
-        from sqlalchemy import text
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        logger.info("Database initialized and connection pool ready")
-    except Exception as e:
-        logger.error(f"Database connection failed: {e}")
+    with startup_profiler.phase("engine"):
+        get_engine()
+        get_async_engine()
+
+    with startup_profiler.phase("warm-up"):
+        if settings.DB_POOL_WARMUP > 0:
+            await _warm_up_databases()
+
+    replica_router = get_replica_router()
+    if replica_router is not None:
+        with startup_profiler.phase("replicas"):
+            await replica_router.start()
 
-    # Pre-warm connection pool
-    conns = []
-    for _ in range(10):  # pool_size
-        conn = engine.connect()
-        conns.append(conn)
-    for conn in conns:
-        conn.close()
-    logger.info("DB connection pool pre-warmed")
+    # Spawning the hashing workers takes seconds; do it in the background so
+    # readiness does not wait for it (an early login just waits for a worker)
+    password_warm_up = asyncio.create_task(_timed("password-pool", password_pool.warm_up))
+
+    with startup_profiler.phase("cache"):
+        # Keep this worker's L1 cache in sync with invalidations from other workers
+        get_cache().start()
+
+    with startup_profiler.phase("revocations"):
+        await revocations.start()
+
+    startup_profiler.mark_ready()
+    logger.info("Application startup complete", extra={"extra": startup_profiler.report()})
 
     yield  # Application is running
 
@@ -49,40 +106,52 @@ async def lifespan(app: FastAPI):
     # -------------------------
     logger.info("Application shutdown initiated")
     # Cleanup tasks like cache, queues can be added here
+    await get_cache().close()
+    await revocations.close()
+    await get_rate_limiter().close()
+    await close_replica_router()
+    await dispose_async_engine()
+    await password_warm_up
+    password_pool.shutdown()
     logger.info("Application shutdown complete")
-    
-
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.PROJECT_VERSION,
-    lifespan=lifespan,
-    debug=settings.APP_ENV == "development"
-)
-
+    # Flush buffered DB log records last so the shutdown messages are kept
+    shutdown_logger(logger)
+    dispose_engine()
 
-# -----------------------------
-# Middleware: log each request
-# -----------------------------
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time_ms = round((time.time() - start_time) * 1000, 2)
 
-    logger.info({
-        "method": request.method,
-        "path": request.url.path,
-        "status_code": response.status_code,
-        "execution_time_ms": process_time_ms
-    })
+with startup_profiler.phase("routers"):
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.PROJECT_VERSION,
+        lifespan=lifespan,
+        debug=settings.APP_ENV == "development"
+    )
 
-    return response
+    # -----------------------------
+    # Middleware: rate limits on auth routes, per-route latency metrics (sampled request logging)
+    # -----------------------------
+    if settings.RATE_LIMIT_ROUTES:
+        # Added first so it runs inside the timing middleware: rejections are measured too
+        app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(TimingMiddleware)
+    if settings.DB_REPLICA_HOSTS:
+        # Pins a client's reads to the primary for a moment after it writes
+        app.add_middleware(ReadYourWritesMiddleware)
 
+    # Include routers
+    app.include_router(health.router, prefix="/api/v1")
+    app.include_router(auth.router, prefix="/api/v1")
+    app.include_router(logs.router, prefix="/api/v1")
+    app.include_router(products.router, prefix="/api/v1")
+    app.include_router(categories.router, prefix="/api/v1")
+    app.include_router(search.router, prefix="/api/v1")
+    app.include_router(admin.router, prefix="/api/v1")
+    app.include_router(changes.router, prefix="/api/v1")
+    app.include_router(audit.router, prefix="/api/v1")
+    app.include_router(teams.router, prefix="/api/v1")
+    app.include_router(metrics.router)
 
-# Include routers
-app.include_router(health.router, prefix="/api/v1")
-app.include_router(auth.router, prefix="/api/v1")
 
 @app.get("/")
 def root():
-    return {"message": f"Welcome to {settings.PROJECT_NAME}"}
\ No newline at end of file
+    return {"message": f"Welcome to {settings.PROJECT_NAME}"}
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.database.sync.base import Base
+
+class AuditEntry(Base):
+    """
+    One change to one entity, written by app/core/audit.py. Append-only: the
+    migration installs a trigger rejecting UPDATE and DELETE.
+    """
+    __tablename__ = "audit_log"
+    # "History of this entity", newest first, is one index range scan
+    __table_args__ = (
+        Index("ix_audit_log_entity_history", "entity_type", "entity_id", "at", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    actor_id = Column(Integer, nullable=True)      # no FK: kept even if the user row goes
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(BigInteger, nullable=False)
+    action = Column(String(10), nullable=False)    # insert | update | delete
+    # {column: [old, new]}, changed columns only; old is null when unknown
+    changes = Column(JSONB, nullable=False)
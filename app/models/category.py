@@ -0,0 +1,46 @@
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
+)
+from sqlalchemy.orm import relationship
+from app.database.sync.base import Base
+
+# =============================
+# CATEGORY MODEL
+# =============================
+
+class Category(Base):
+    """
+    Category tree node.
+
+    `parent_id` is the adjacency list; `path` is the materialized path of ids
+    from the root down to this node ("/1/5/12/"), so a subtree is a single
+    indexed range scan (`'/1/5/' <= path < '/1/50'`) and the breadcrumb is the list
+    of ids in the path. `path` and `depth` are maintained by app/crud/categories.py.
+    """
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
+    # "C" collation: byte order, so prefix LIKE and range scans can use the index
+    path = Column(String(1024, collation="C"), nullable=False, default="/", index=True)
+    depth = Column(Integer, nullable=False, default=0)
+
+    # Soft delete flag
+    is_active = Column(Boolean, default=True)
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Latest change to any node (new rows only have created_at) is one index
+    # probe; it validates cached tree responses (see app/core/conditional.py)
+    __table_args__ = (
+        Index("ix_categories_modified_at", func.coalesce(updated_at, created_at)),
+    )
+
+    # Relationships
+    parent = relationship("Category", remote_side=[id])
+
+    def __repr__(self):
+        return f"<Category(id={self.id}, path='{self.path}')>"
@@ -0,0 +1,72 @@
+from sqlalchemy import (
+    Column, Integer, Enum, Text, DateTime, ForeignKey, Index, func, text
+)
+from sqlalchemy.dialects.postgresql import JSONB
+import enum
+from app.database.sync.base import Base
+
+# =============================
+# ENUMS
+# =============================
+
+class ChangeEntityType(enum.Enum):
+    product = "product"
+
+
+class ChangeAction(enum.Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"           # soft delete
+
+
+class ChangeStatus(enum.Enum):
+    pending = "pending"
+    approved = "approved"
+    rejected = "rejected"
+    conflict = "conflict"       # the entity moved past base_version before approval
+    failed = "failed"           # the database refused it at approval, review_note says why
+
+
+# =============================
+# CHANGE REQUEST MODEL
+# =============================
+
+class ChangeRequest(Base):
+    """
+    A change submitted by a team member, applied once a team leader approves
+    it (see app/crud/changes.py). `diff` only holds the fields that change,
+    as JSON, and `base_version` is the entity version it was made against.
+    """
+    __tablename__ = "change_requests"
+    __table_args__ = (
+        # The approval queue: pending changes of a set of teams, oldest first
+        Index(
+            "ix_change_requests_pending_queue", "team_id", "created_at", "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index("ix_change_requests_entity", "entity_type", "entity_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey("auth.teams.id"), nullable=False)
+    submitted_by = Column(Integer, ForeignKey("auth.users.id"), nullable=False)
+
+    entity_type = Column(Enum(ChangeEntityType), nullable=False)
+    # Null for a create until it is applied
+    entity_id = Column(Integer, nullable=True)
+    action = Column(Enum(ChangeAction), nullable=False)
+    base_version = Column(Integer, nullable=True)
+    diff = Column(JSONB, nullable=False, default=dict)
+    note = Column(Text, nullable=True)
+
+    status = Column(Enum(ChangeStatus), nullable=False, default=ChangeStatus.pending, server_default="pending")
+    reviewed_by = Column(Integer, ForeignKey("auth.users.id"), nullable=True)
+    reviewed_at = Column(DateTime(timezone=True), nullable=True)
+    review_note = Column(Text, nullable=True)
+    # Entity version written by the approval
+    applied_version = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ChangeRequest(id={self.id}, {self.action.value} {self.entity_type.value}={self.entity_id}, status={self.status.value})>"
@@ -0,0 +1,65 @@
+from sqlalchemy import (
+    BigInteger, Column, Integer, SmallInteger, String, Enum, Text, DateTime, Index, func, text
+)
+from sqlalchemy.dialects.postgresql import JSONB
+import enum
+from app.database.sync.base import Base
+
+# =============================
+# ENUMS
+# =============================
+
+class JobStatus(enum.Enum):
+    queued = "queued"           # waiting for run_at, or for a free worker
+    running = "running"         # claimed; invisible to other workers until locked_until
+    succeeded = "succeeded"
+    failed = "failed"           # out of attempts, or failed permanently
+
+
+# =============================
+# JOB MODEL
+# =============================
+
+class Job(Base):
+    """
+    A unit of background work, run by `python -m app.tasks.worker` (see
+    app/tasks/queue.py). Workers claim jobs with FOR UPDATE SKIP LOCKED, so
+    any number of them, on any host, share the table without a broker.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # The claim query: ready jobs of a queue, most urgent first
+        Index(
+            "ix_jobs_ready", "queue", text("priority DESC"), "run_at", "id",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        # Running jobs whose lease expired (their worker died)
+        Index("ix_jobs_lease", "locked_until", postgresql_where=text("status = 'running'")),
+        # Timing stats over recent jobs and pruning of old ones
+        Index("ix_jobs_finished", "finished_at", postgresql_where=text("finished_at IS NOT NULL")),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    queue = Column(String(50), nullable=False, server_default="default")
+    name = Column(String(100), nullable=False)          # registered handler, e.g. "products.import"
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    status = Column(Enum(JobStatus), nullable=False, server_default=JobStatus.queued.value)
+    priority = Column(SmallInteger, nullable=False, server_default="0")    # higher runs first
+
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())   # not before
+    locked_by = Column(String(100), nullable=True)      # worker id while running
+    locked_until = Column(DateTime(timezone=True), nullable=True)   # visibility timeout, extended by heartbeats
+
+    result = Column(JSONB, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_by = Column(Integer, nullable=True)         # no FK, like the audit log; the actor of the job's writes
+
+    # Timing: wait = started_at - run_at, run = finished_at - started_at (last attempt)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, name='{self.name}', status='{self.status.value}')>"
@@ -1,15 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.database.sync.base import Base
 
 class Log(Base):
     __tablename__ = "logs"
+    # Range-partitioned by day on timestamp, partitions are managed by
+    # app/tasks/log_partitions.py; the partition key has to be part of the PK
+    __table_args__ = (
+        Index("ix_logs_timestamp_brin", "timestamp", postgresql_using="brin"),
+        Index("ix_logs_extra_gin", "extra", postgresql_using="gin", postgresql_ops={"extra": "jsonb_path_ops"}),
+        Index("ix_logs_level_timestamp", "level", "timestamp", "id"),
+        Index("ix_logs_module_timestamp", "module", "timestamp", "id"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     level = Column(String, nullable=False)
     message = Column(String, nullable=False)
     module = Column(String, nullable=True)
     func_name = Column(String, nullable=True)
     line_no = Column(Integer, nullable=True)
-    extra = Column(JSON, nullable=True)  
+    extra = Column(JSONB, nullable=True)  
@@ -0,0 +1,55 @@
+from sqlalchemy import (
+    Column, Computed, Index, Integer, String, Numeric, Boolean, DateTime, Text, ForeignKey, func
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
+from app.database.sync.base import Base
+
+# SKU is indexed with the 'simple' config so codes are not stemmed
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(sku, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+# =============================
+# PRODUCT MODEL
+# =============================
+
+class Product(Base):
+    __tablename__ = "products"
+    # Search indexes (see app/crud/search.py); the trigram ones need pg_trgm
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_products_sku_trgm", "sku", postgresql_using="gin", postgresql_ops={"sku": "gin_trgm_ops"}),
+        Index("ix_products_tags", "tags", postgresql_using="gin"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    sku = Column(String(64), unique=True, nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    price = Column(Numeric(12, 2), nullable=False, default=0)
+    stock = Column(Integer, nullable=False, default=0)
+    attributes = Column(JSONB, nullable=True)
+
+    brand = Column(String(100), nullable=True, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
+    tags = Column(ARRAY(String(50)), nullable=True)
+
+    # Maintained by Postgres on every write; deferred so ORM loads skip it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
+    # Soft delete flag
+    is_active = Column(Boolean, default=True)
+
+    # Incremented on every write, used for optimistic concurrency checks
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<Product(id={self.id}, sku='{self.sku}')>"
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Enum, ForeignKey,
-    Boolean, DateTime, func, Text, UniqueConstraint
+    Boolean, DateTime, func, Text, UniqueConstraint, Index, Uuid, text
 )
 from sqlalchemy.orm import relationship
 import enum
@@ -42,6 +42,9 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
 
+    # Bumped to revoke every token issued so far (tokens carry it as "ver")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Metadata / audit
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -105,7 +108,8 @@ class TeamMember(Base):
 
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey("auth.teams.id"))
-    user_id = Column(Integer, ForeignKey("auth.users.id"))
+    # Indexed: memberships are looked up by user at login and refresh
+    user_id = Column(Integer, ForeignKey("auth.users.id"), index=True)
     role = Column(Enum(TeamMemberRole), nullable=False, default=TeamMemberRole.member)
 
     # Soft delete flag
@@ -114,6 +118,7 @@ class TeamMember(Base):
     # For audit and role control
     added_by = Column(Integer, ForeignKey("auth.users.id"), nullable=True)
     added_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     team = relationship("Team", back_populates="members")
@@ -130,3 +135,36 @@ class TeamMember(Base):
 
     def __repr__(self):
         return f"<TeamMember(team={self.team_id}, user={self.user_id}, role={self.role.value})>"
+
+
+# =============================
+# REFRESH SESSION
+# =============================
+
+class RefreshSession(Base):
+    """
+    One login. Its refresh token rotates on every use and only the latest
+    one (`jti`) is accepted: an older one coming back means the token was
+    copied, and the whole session is revoked (see app/crud/sessions.py).
+    """
+    __tablename__ = "refresh_sessions"
+    __table_args__ = (
+        # Live sessions of a user, revoked together by logout-all
+        Index("ix_refresh_sessions_user_live", "user_id", postgresql_where=text("revoked_at IS NULL")),
+        # Revoked, unexpired sessions: the set every worker keeps in memory
+        Index("ix_refresh_sessions_revoked", "expires_at", postgresql_where=text("revoked_at IS NOT NULL")),
+        {"schema": "auth"},
+    )
+
+    id = Column(Uuid(as_uuid=False), primary_key=True)         # "sid" claim of its tokens
+    user_id = Column(Integer, ForeignKey("auth.users.id", ondelete="CASCADE"), nullable=False)
+    jti = Column(Uuid(as_uuid=False), nullable=False)          # the only refresh token accepted now
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)    # of the latest refresh token
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_reason = Column(String(20), nullable=True)         # logout | logout_all | reuse
+
+    def __repr__(self):
+        return f"<RefreshSession(id={self.id}, user={self.user_id}, revoked={self.revoked_at is not None})>"
@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+# =============================
+# ADMIN SCHEMAS
+# =============================
+
+class PoolStats(BaseModel):
+    # Live state (absent until the engine exists)
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+
+    # Since process start
+    checkouts: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    overflow_checkouts: int
+    max_overflow_seen: int
+    wait_p50_ms: float
+    wait_p99_ms: float
+    wait_total_seconds: float
+    hold_p50_ms: float
+    hold_p99_ms: float
+
+class PoolSettings(BaseModel):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pre_ping: bool
+    pgbouncer: bool
+
+class PoolReport(BaseModel):
+    settings: PoolSettings
+    pools: Dict[str, PoolStats]
+
+
+class ReplicaStats(BaseModel):
+    name: str
+    healthy: bool
+    lag_seconds: float
+    in_use: int
+    last_error: Optional[str] = None
+    checked_at: Optional[float] = None
+
+class ReplicaReport(BaseModel):
+    enabled: bool
+    balancing: Optional[str] = None
+    max_lag_seconds: Optional[float] = None
+    read_your_writes_seconds: float
+    replicas: List[ReplicaStats] = []
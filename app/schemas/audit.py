@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+
+class AuditEntryResponse(BaseModel):
+    id: int
+    at: datetime
+    actor_id: Optional[int] = None
+    entity_type: str
+    entity_id: int
+    action: str
+    changes: Dict[str, Any]
+
+    class Config:
+        from_attributes = True
+
+
+class AuditPage(BaseModel):
+    items: List[AuditEntryResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
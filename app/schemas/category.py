@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import datetime
+
+# =============================
+# CATEGORY SCHEMAS
+# =============================
+
+class CategoryBase(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+
+class CategoryCreate(CategoryBase):
+    parent_id: Optional[int] = None
+
+class CategoryUpdate(BaseModel):
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+
+class CategoryMove(BaseModel):
+    parent_id: Optional[int] = None   # None moves the node to the root
+
+class CategoryResponse(CategoryBase):
+    id: int
+    parent_id: Optional[int]
+    path: str
+    depth: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class CategoryTreeNode(CategoryBase):
+    id: int
+    parent_id: Optional[int]
+    path: str
+    depth: int
+    children: List["CategoryTreeNode"] = []
+
+class CategoryProductCount(BaseModel):
+    direct: int
+    total: int
+
+class CategoryProductCounts(BaseModel):
+    counts: Dict[int, CategoryProductCount]
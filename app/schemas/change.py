@@ -0,0 +1,138 @@
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from decimal import Decimal
+
+from app.schemas.product import Tag
+
+# =============================
+# ENUMS (mirror DB enums)
+# =============================
+
+class ChangeEntityType(str, Enum):
+    product = "product"
+
+class ChangeAction(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+class ChangeStatus(str, Enum):
+    pending = "pending"
+    approved = "approved"
+    rejected = "rejected"
+    conflict = "conflict"
+    failed = "failed"
+
+# =============================
+# CHANGE REQUEST SCHEMAS
+# =============================
+
+class ProductChanges(BaseModel):
+    """Proposed product fields; only the fields sent are part of the change."""
+    sku: Optional[str] = Field(default=None, min_length=1, max_length=64)
+    name: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    price: Optional[Decimal] = Field(default=None, ge=0, max_digits=12, decimal_places=2)
+    stock: Optional[int] = Field(default=None, ge=0)
+    brand: Optional[str] = Field(default=None, max_length=100)
+    category_id: Optional[int] = None
+    tags: Optional[List[Tag]] = None
+    attributes: Optional[Dict[str, Any]] = None
+
+    # Leaving these out keeps the current value; an explicit null would
+    # only fail at approval against the NOT NULL columns
+    @field_validator("sku", "name", "price", "stock", mode="before")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+class ChangeSubmit(BaseModel):
+    team_id: int
+    action: ChangeAction
+    entity_type: ChangeEntityType = ChangeEntityType.product
+    entity_id: Optional[int] = None
+    # Version the change was made against; defaults to the current one
+    base_version: Optional[int] = None
+    changes: ProductChanges = ProductChanges()
+    note: Optional[str] = Field(default=None, max_length=2000)
+
+    @model_validator(mode="after")
+    def matches_action(self):
+        sent = self.changes.model_fields_set
+        if self.action == ChangeAction.create:
+            missing = {"sku", "name", "price"} - sent
+            if missing:
+                raise ValueError(f"a create needs {', '.join(sorted(missing))}")
+            if self.entity_id is not None:
+                raise ValueError("a create takes no entity_id")
+        else:
+            if self.entity_id is None:
+                raise ValueError(f"an {self.action.value} needs entity_id")
+            if self.action == ChangeAction.update and not sent:
+                raise ValueError("an update needs at least one changed field")
+            if "sku" in sent:
+                raise ValueError("sku cannot be changed")
+        return self
+
+class ChangeResponse(BaseModel):
+    id: int
+    team_id: int
+    submitted_by: int
+    entity_type: ChangeEntityType
+    entity_id: Optional[int]
+    action: ChangeAction
+    base_version: Optional[int]
+    diff: Dict[str, Any]
+    note: Optional[str]
+    status: ChangeStatus
+    reviewed_by: Optional[int]
+    reviewed_at: Optional[datetime]
+    review_note: Optional[str]
+    applied_version: Optional[int]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ChangePage(BaseModel):
+    items: List[ChangeResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+# =============================
+# BATCH REVIEW SCHEMAS
+# =============================
+
+class ReviewStatus(str, Enum):
+    approved = "approved"
+    rejected = "rejected"
+    conflict = "conflict"          # the entity changed since the submission
+    failed = "failed"              # the database refused the change, see review_note
+    not_pending = "not_pending"    # unknown, already reviewed or outside the reviewer's teams
+
+class ChangeBatchRequest(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=1000)
+    note: Optional[str] = Field(default=None, max_length=2000)
+
+class ChangeBatchResult(BaseModel):
+    id: int
+    status: ReviewStatus
+    entity_id: Optional[int] = None
+    applied_version: Optional[int] = None
+    error: Optional[str] = None
+
+class ChangeBatchResponse(BaseModel):
+    approved: int = 0
+    rejected: int = 0
+    conflict: int = 0
+    failed: int = 0
+    not_pending: int = 0
+    results: List[ChangeBatchResult]
@@ -0,0 +1,56 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Any, List, Optional
+from datetime import datetime
+
+# =============================
+# ENUMS (mirror DB enums)
+# =============================
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+# =============================
+# JOB SCHEMAS
+# =============================
+
+class JobResponse(BaseModel):
+    id: int
+    queue: str
+    name: str
+    status: JobStatus
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    result: Optional[Any] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobQueueStats(BaseModel):
+    queue: str
+    name: str
+    # Now
+    ready: int = 0
+    scheduled: int = 0              # waiting for run_at (delayed or backing off)
+    running: int = 0
+    oldest_ready_seconds: Optional[float] = None
+    # Finished within the window (last attempt of each job)
+    succeeded: int = 0
+    failed: int = 0
+    run_p50_seconds: Optional[float] = None
+    run_p95_seconds: Optional[float] = None
+    wait_p50_seconds: Optional[float] = None
+    wait_p95_seconds: Optional[float] = None
+
+class JobReport(BaseModel):
+    window_seconds: int
+    jobs: List[JobQueueStats]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Any, List, Optional
+from datetime import datetime
+
+
+class LogEntry(BaseModel):
+    id: int
+    timestamp: datetime
+    level: str
+    message: str
+    module: Optional[str] = None
+    func_name: Optional[str] = None
+    line_no: Optional[int] = None
+    extra: Optional[Any] = None
+
+    class Config:
+        from_attributes = True
+
+
+class LogPage(BaseModel):
+    items: List[LogEntry]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,171 @@
+import json
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Annotated, Any, Dict, List, Optional
+from datetime import datetime
+from decimal import Decimal
+
+# =============================
+# PRODUCT SCHEMAS
+# =============================
+
+# products.tags is varchar(50)[]: a longer tag must fail validation, not the INSERT
+Tag = Annotated[str, Field(max_length=50)]
+
+class ProductBase(BaseModel):
+    sku: str = Field(min_length=1, max_length=64)
+    name: str = Field(min_length=1, max_length=255)
+    description: Optional[str] = None
+    price: Decimal = Field(ge=0, max_digits=12, decimal_places=2)
+    stock: int = Field(default=0, ge=0)
+    brand: Optional[str] = Field(default=None, max_length=100)
+    category_id: Optional[int] = None
+    tags: List[Tag] = []
+    attributes: Optional[Dict[str, Any]] = None
+
+class ProductCreate(ProductBase):
+    pass
+
+class ProductResponse(ProductBase):
+    id: int
+    is_active: bool
+    version: int
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class ProductPage(BaseModel):
+    items: List[ProductResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+# =============================
+# BULK IMPORT SCHEMAS
+# =============================
+
+class ProductImportRow(ProductBase):
+    """
+    One row of a CSV or NDJSON import file.
+
+    CSV cells are all strings, so empty cells become None, `tags` may be
+    pipe-separated ("red|summer") and `attributes` may be a JSON object string.
+    """
+
+    @field_validator("description", "brand", "category_id", mode="before")
+    @classmethod
+    def empty_to_none(cls, value):
+        return None if value == "" else value
+
+    @field_validator("stock", mode="before")
+    @classmethod
+    def empty_stock(cls, value):
+        return 0 if value in ("", None) else value
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def split_tags(cls, value):
+        if value in ("", None):
+            return []
+        if isinstance(value, str):
+            return [t.strip() for t in value.split("|") if t.strip()]
+        return value
+
+    @field_validator("attributes", mode="before")
+    @classmethod
+    def parse_attributes(cls, value):
+        if value == "":
+            return None
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    @model_validator(mode="after")
+    def no_nul(self):
+        # Postgres text and jsonb cannot store NUL; it would fail the COPY
+        def walk(value):
+            if isinstance(value, str):
+                return "\x00" in value
+            if isinstance(value, dict):
+                return any(walk(k) or walk(v) for k, v in value.items())
+            if isinstance(value, list):
+                return any(walk(v) for v in value)
+            return False
+
+        for field in type(self).model_fields:
+            if walk(getattr(self, field)):
+                raise ValueError(f"{field} contains a NUL character")
+        return self
+
+class ImportBatchProgress(BaseModel):
+    batch: int
+    rows_read: int
+    valid_rows: int
+    invalid_rows: int
+    elapsed_seconds: float
+
+class ImportReport(BaseModel):
+    import_id: str
+    total_rows: int
+    valid_rows: int
+    invalid_rows: int
+    inserted: int
+    updated: int
+    reactivated: int = 0   # soft-deleted products brought back by the import
+    batches: int
+    duration_seconds: float
+    error_file: Optional[str] = None
+
+# =============================
+# BULK PRICE / STOCK UPDATE SCHEMAS
+# =============================
+
+class BulkUpdateStatus(str, Enum):
+    updated = "updated"
+    not_found = "not_found"
+    conflict = "conflict"                      # expected_version did not match
+    insufficient_stock = "insufficient_stock"  # stock_delta would go below zero
+
+class BulkPriceStockItem(BaseModel):
+    sku: str = Field(min_length=1, max_length=64)
+    price: Optional[Decimal] = Field(default=None, ge=0, max_digits=12, decimal_places=2)
+    stock_delta: Optional[int] = None
+    # Optimistic concurrency: only apply if the product is still at this version
+    expected_version: Optional[int] = None
+
+    @model_validator(mode="after")
+    def has_change(self):
+        if self.price is None and self.stock_delta is None:
+            raise ValueError("price or stock_delta is required")
+        return self
+
+class BulkPriceStockRequest(BaseModel):
+    items: List[BulkPriceStockItem] = Field(min_length=1, max_length=50000)
+
+    @model_validator(mode="after")
+    def unique_skus(self):
+        seen = set()
+        for item in self.items:
+            if item.sku in seen:
+                raise ValueError(f"duplicate sku '{item.sku}'")
+            seen.add(item.sku)
+        return self
+
+class BulkPriceStockResult(BaseModel):
+    sku: str
+    status: BulkUpdateStatus
+    price: Optional[Decimal] = None
+    stock: Optional[int] = None
+    version: Optional[int] = None   # new version when updated, current one otherwise
+
+class BulkPriceStockResponse(BaseModel):
+    updated: int
+    not_found: int
+    conflict: int
+    insufficient_stock: int
+    results: List[BulkPriceStockResult]
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from decimal import Decimal
+
+# =============================
+# SEARCH SCHEMAS
+# =============================
+
+class SearchHit(BaseModel):
+    id: int
+    sku: str
+    name: str
+    brand: Optional[str]
+    category_id: Optional[int]
+    tags: Optional[List[str]]
+    price: Decimal
+    stock: int
+    score: float
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class CategoryFacetCount(BaseModel):
+    id: int
+    name: str
+    count: int
+
+class SearchFacets(BaseModel):
+    brands: List[FacetCount]
+    tags: List[FacetCount]
+    categories: List[CategoryFacetCount]
+    capped: bool = False  # True when the counts cover only the SEARCH_MAX_MATCHES best matches
+
+class SearchResponse(BaseModel):
+    total: int
+    total_capped: bool   # True when more products match than were kept for hits and facets
+    hits: List[SearchHit]
+    facets: SearchFacets
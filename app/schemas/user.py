@@ -73,6 +73,16 @@ class TeamMemberBase(BaseModel):
 class TeamMemberResponse(TeamMemberBase):
     id: int
     added_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class TeamMemberPage(BaseModel):
+    items: List[TeamMemberResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -84,4 +94,4 @@ class Token(BaseModel):
 
 
 class TokenRefresh(BaseModel):
-    refresh_token: str
\ No newline at end of file
+    refresh_token: str
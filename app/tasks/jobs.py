@@ -0,0 +1,84 @@
+"""
+Job handlers run by the workers (see app/tasks/queue.py). Each takes the
+job's payload and returns a JSON-serializable result, stored on the job.
+"""
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, func
+
+from app.api.v1.services.product_import import ImportFormatError, import_products
+from app.core.cache import RedisBackend, TwoTierCache
+from app.core.config import settings
+from app.database.sync.session import get_engine
+from app.models.user import RefreshSession
+from app.tasks.log_partitions import run_maintenance
+from app.tasks.queue import PermanentJobError, job
+
+
+def invalidate_cache_tags(*tags: str):
+    """
+    Invalidate cache tags from a worker thread. API workers hold the cache,
+    so this needs Redis to reach them; without it there is nothing to do
+    from here. A throwaway client is used: the process-wide one belongs to
+    an event loop this thread does not run.
+    """
+    if not settings.REDIS_URL:
+        return
+
+    async def invalidate():
+        cache = TwoTierCache(RedisBackend(settings.REDIS_URL, prefix=settings.CACHE_KEY_PREFIX))
+        try:
+            await cache.invalidate_tags(*tags)
+        finally:
+            await cache.close()
+
+    asyncio.run(invalidate())
+
+
+@job("logs.maintain_partitions", queue="maintenance", max_attempts=3)
+def maintain_log_partitions(payload: dict) -> dict:
+    result = run_maintenance(
+        days_ahead=payload.get("days_ahead", settings.LOG_PARTITION_PREMAKE_DAYS),
+        retention_days=payload.get("retention_days", settings.LOG_RETENTION_DAYS),
+    )
+    if result["failed"]:
+        # Retried: the steps that went through are not repeated
+        raise RuntimeError(f"Log partition maintenance incomplete: {result['failed']}")
+    return result
+
+
+@job("auth.prune_sessions", queue="maintenance", max_attempts=3)
+def prune_sessions(payload: dict) -> dict:
+    """Delete refresh sessions expired more than SESSION_RETENTION_DAYS ago."""
+    days = payload.get("retention_days", settings.SESSION_RETENTION_DAYS)
+    with get_engine().begin() as conn:
+        deleted = conn.execute(
+            delete(RefreshSession).where(RefreshSession.expires_at < func.now() - timedelta(days=days))
+        ).rowcount
+    return {"deleted": deleted}
+
+
+@job("products.import", queue="imports")
+def import_product_file(payload: dict) -> dict:
+    """Import a file saved under JOB_FILES_DIR; the file is deleted once imported."""
+    path = Path(payload["path"])
+    if not path.is_file():
+        raise PermanentJobError(f"Import file {path} not found")
+    with open(path, "rb") as stream:
+        try:
+            report = import_products(stream, payload["format"])
+        except ImportFormatError as e:
+            raise PermanentJobError(str(e)) from e
+    if report.inserted or report.updated or report.reactivated:
+        invalidate_cache_tags("products")
+    path.unlink(missing_ok=True)
+    return report.model_dump()
+
+
+@job("cache.invalidate", queue="default", priority=10)
+def invalidate_cache(payload: dict) -> dict:
+    tags = payload.get("tags") or []
+    invalidate_cache_tags(*tags)
+    return {"tags": tags}
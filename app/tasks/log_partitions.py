@@ -0,0 +1,183 @@
+"""
+Maintenance of the daily partitions of the `logs` table.
+
+- Creates partitions `days_ahead` days in advance so inserts never fall
+  through to `logs_default`. Rows that did fall through for a day (the task
+  did not run in time) are moved into that day's partition as it is
+  created; a plain CREATE ... PARTITION OF would fail on them.
+- Drops partitions older than `retention_days`. Dropping a partition is a
+  metadata operation, so retention costs the same whatever the volume and
+  leaves no bloat behind (unlike DELETE). Expired rows of `logs_default`
+  are deleted.
+
+Every partition is created or dropped in its own short transaction, so one
+failure does not undo the others, and drops run whatever happened to the
+creates.
+
+Run it daily, e.g. from cron:
+
+    python -m app.tasks.log_partitions
+"""
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.database.sync.session import get_engine
+
+PARENT_TABLE = "logs"
+DEFAULT_PARTITION = "logs_default"
+PARTITION_PREFIX = "logs_p"
+_PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{8}})$")
+# Catalog changes below need a strong lock on `logs`; give up rather than
+# queue behind a long query and block every log insert meanwhile
+LOCK_TIMEOUT = "5s"
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def list_partitions(conn) -> dict:
+    """Return {day: partition name} for the daily partitions of `logs`."""
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+    """), {"parent": PARENT_TABLE}).scalars()
+    partitions = {}
+    for name in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[datetime.strptime(match.group(1), "%Y%m%d").date()] = name
+    return partitions
+
+
+def _bounds(day: date) -> tuple:
+    # UTC midnights, matching the migration that set the table up
+    return f"{day.isoformat()} 00:00:00+00", f"{(day + timedelta(days=1)).isoformat()} 00:00:00+00"
+
+
+def create_partition(conn, day: date) -> int:
+    """
+    Create the partition of `day`; returns how many rows it took over from
+    `logs_default`.
+
+    Attaching a range the default partition holds rows for is refused, so
+    those rows are moved into the new table first, with the default
+    partition locked against inserts until the range is attached.
+    """
+    name = partition_name(day)
+    lower, upper = _bounds(day)
+    conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    stray = conn.execute(text(
+        f'SELECT 1 FROM {DEFAULT_PARTITION} WHERE timestamp >= :lower AND timestamp < :upper LIMIT 1'
+    ), {"lower": lower, "upper": upper}).first()
+    if stray is None:
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+        return 0
+
+    conn.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+    conn.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    moved = conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE timestamp >= :lower AND timestamp < :upper
+            RETURNING *
+        )
+        INSERT INTO "{name}" SELECT * FROM moved
+    """), {"lower": lower, "upper": upper}).rowcount
+    # Builds the partition's copies of the parent's indexes
+    conn.execute(text(
+        f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    return moved
+
+
+def create_partitions(engine, today: date, days_ahead: int) -> tuple:
+    """
+    Create the missing partitions for `today` .. `today + days_ahead`, one
+    transaction each. Returns (created names, {name: error} of failures).
+    """
+    with engine.connect() as conn:
+        existing = list_partitions(conn)
+    created, failed = [], {}
+    for offset in range(days_ahead + 1):
+        day = today + timedelta(days=offset)
+        if day in existing:
+            continue
+        name = partition_name(day)
+        try:
+            with engine.begin() as conn:
+                moved = create_partition(conn, day)
+        except Exception as e:
+            failed[name] = str(e).splitlines()[0]
+            logger.error(f"Log partition {name} not created: {e}")
+            continue
+        if moved:
+            logger.warning(f"Log partition {name} created late, {moved} rows moved out of {DEFAULT_PARTITION}")
+        created.append(name)
+    return created, failed
+
+
+def drop_expired_partitions(engine, today: date, retention_days: int) -> tuple:
+    """
+    Drop the partitions whose whole day is older than the retention window,
+    one transaction each: DROP locks `logs` exclusively (DETACH ...
+    CONCURRENTLY is not allowed next to a default partition), so each lock
+    is only held for one catalog update. Returns (dropped names, failures).
+    """
+    cutoff = today - timedelta(days=retention_days)
+    with engine.connect() as conn:
+        expired = [name for day, name in sorted(list_partitions(conn).items()) if day < cutoff]
+    dropped, failed = [], {}
+    for name in expired:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+                conn.execute(text(f'DROP TABLE "{name}"'))
+        except Exception as e:
+            failed[name] = str(e).splitlines()[0]
+            logger.error(f"Log partition {name} not dropped: {e}")
+            continue
+        dropped.append(name)
+    return dropped, failed
+
+
+def prune_default_partition(engine, today: date, retention_days: int) -> int:
+    """Delete the rows of `logs_default` older than the retention window."""
+    cutoff = today - timedelta(days=retention_days)
+    with engine.begin() as conn:
+        return conn.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE timestamp < :cutoff"),
+            {"cutoff": f"{cutoff.isoformat()} 00:00:00+00"},
+        ).rowcount
+
+
+def run_maintenance(
+    days_ahead: int = settings.LOG_PARTITION_PREMAKE_DAYS,
+    retention_days: int = settings.LOG_RETENTION_DAYS,
+) -> dict:
+    today = datetime.now(timezone.utc).date()
+    engine = get_engine()
+    created, create_failed = create_partitions(engine, today, days_ahead)
+    dropped, drop_failed = drop_expired_partitions(engine, today, retention_days)
+    pruned = prune_default_partition(engine, today, retention_days)
+    return {"created": created, "dropped": dropped, "default_pruned": pruned, "failed": {**create_failed, **drop_failed}}
+
+
+if __name__ == "__main__":
+    result = run_maintenance()
+    print(f"Created partitions: {result['created'] or 'none'}")
+    print(f"Dropped partitions: {result['dropped'] or 'none'}")
+    print(f"Expired rows deleted from {DEFAULT_PARTITION}: {result['default_pruned']}")
+    for name, error in result["failed"].items():
+        print(f"FAILED {name}: {error}")
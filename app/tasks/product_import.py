@@ -0,0 +1,47 @@
+"""
+Command line entry point for the bulk product import.
+
+    python -m app.tasks.product_import supplier_feed.csv
+    python -m app.tasks.product_import feed.ndjson --batch-size 20000
+"""
+import argparse
+import sys
+
+from app.api.v1.services.product_import import ImportFormatError, detect_format, import_products
+from app.core.config import settings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a CSV/NDJSON product file into the catalog")
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = detect_format(args.path, args.format)
+    except ImportFormatError as e:
+        parser.error(str(e))
+
+    def print_progress(progress):
+        print(
+            f"batch {progress.batch}: {progress.rows_read} rows read, "
+            f"{progress.valid_rows} valid, {progress.invalid_rows} invalid "
+            f"({progress.elapsed_seconds}s)",
+            flush=True,
+        )
+
+    with open(args.path, "rb") as stream:
+        report = import_products(stream, fmt, batch_size=args.batch_size, on_progress=print_progress)
+
+    print(
+        f"done in {report.duration_seconds}s: {report.inserted} inserted, "
+        f"{report.updated} updated, {report.reactivated} reactivated, {report.invalid_rows} invalid"
+    )
+    if report.error_file:
+        print(f"row errors written to {report.error_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Postgres-backed job queue: jobs are rows of `jobs`, there is no broker.
+
+- `enqueue` / `enqueue_async` insert a job. The async one writes through the
+  caller's session, so the job only exists if the request's transaction
+  commits.
+- Workers (app/tasks/worker.py) `claim` ready jobs with
+  FOR UPDATE SKIP LOCKED: concurrent claimers skip each other's rows instead
+  of waiting on them, so any number of workers on any number of hosts share
+  the table. Ready jobs are taken most urgent first (priority, then run_at).
+- A claimed job is leased until `locked_until` (the visibility timeout) and
+  its worker extends the lease with heartbeats while it runs. When a worker
+  dies, `reap_expired` hands its jobs back to the queue.
+- A failed attempt is retried after an exponential, jittered backoff until
+  `max_attempts`. A handler raising `PermanentJobError` fails the job right
+  away.
+
+Every state change after the claim is guarded by `locked_by`, so a worker
+whose lease expired cannot overwrite the outcome of the attempt that
+replaced it.
+"""
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.sync.session import get_engine
+
+
+class JobError(ValueError):
+    pass
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (bad payload, missing input)."""
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    name: str
+    func: Callable[[dict], Optional[dict]]
+    queue: str = "default"
+    priority: int = 0
+    max_attempts: Optional[int] = None
+
+
+@dataclass
+class ClaimedJob:
+    id: int
+    name: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    created_by: Optional[int]
+    run_at: datetime
+    started_at: datetime
+
+
+# Registered handlers, by job name (see app/tasks/jobs.py)
+HANDLERS: dict = {}
+
+
+def job(name: str, queue: str = "default", priority: int = 0, max_attempts: Optional[int] = None):
+    """
+    Register the decorated function as the handler of job `name`. It gets
+    the payload and may return a JSON-serializable result.
+    """
+    def decorator(func):
+        HANDLERS[name] = JobSpec(name, func, queue=queue, priority=priority, max_attempts=max_attempts)
+        return func
+    return decorator
+
+
+def get_spec(name: str) -> JobSpec:
+    if not HANDLERS:
+        # Registering is a side effect of importing the handlers
+        import app.tasks.jobs  # noqa: F401
+    spec = HANDLERS.get(name)
+    if spec is None:
+        raise JobError(f"Unknown job '{name}'")
+    return spec
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next attempt: doubling from JOB_RETRY_BASE, capped, with jitter."""
+    delay = min(settings.JOB_RETRY_MAX, settings.JOB_RETRY_BASE * 2 ** max(attempts - 1, 0))
+    # Equal jitter: jobs that failed together do not all come back together
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# -----------------------------
+# Statements
+# -----------------------------
+ENQUEUE_SQL = text("""
+    INSERT INTO jobs (queue, name, payload, priority, max_attempts, run_at, created_by)
+    VALUES (:queue, :name, CAST(:payload AS jsonb), :priority, :max_attempts,
+            now() + make_interval(secs => :delay), :created_by)
+    RETURNING id
+""")
+
+CLAIM_SQL = text("""
+    UPDATE jobs j
+    SET status = 'running',
+        attempts = j.attempts + 1,
+        locked_by = :worker,
+        locked_until = now() + make_interval(secs => :visibility),
+        started_at = now()
+    FROM (
+        SELECT id
+        FROM jobs
+        WHERE status = 'queued' AND queue = ANY(:queues) AND run_at <= now()
+        ORDER BY priority DESC, run_at, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    ) ready
+    WHERE j.id = ready.id
+    RETURNING j.id, j.name, j.payload, j.attempts, j.max_attempts, j.created_by, j.run_at, j.started_at
+""")
+
+HEARTBEAT_SQL = text("""
+    UPDATE jobs
+    SET locked_until = now() + make_interval(secs => :visibility)
+    WHERE id = ANY(:ids) AND locked_by = :worker AND status = 'running'
+""")
+
+COMPLETE_SQL = text("""
+    UPDATE jobs
+    SET status = 'succeeded', result = CAST(:result AS jsonb), last_error = NULL,
+        locked_by = NULL, locked_until = NULL, finished_at = now()
+    WHERE id = :id AND locked_by = :worker AND status = 'running'
+    RETURNING finished_at
+""")
+
+# Back to the queue after `delay`, or failed for good; finished_at is only
+# set once the job is over
+FAIL_SQL = text("""
+    UPDATE jobs
+    SET status = CASE WHEN :permanent OR attempts >= max_attempts
+                      THEN 'failed' ELSE 'queued' END::jobstatus,
+        run_at = CASE WHEN :permanent OR attempts >= max_attempts
+                      THEN run_at ELSE now() + make_interval(secs => :delay) END,
+        last_error = :error,
+        locked_by = NULL, locked_until = NULL,
+        finished_at = CASE WHEN :permanent OR attempts >= max_attempts THEN now() END
+    WHERE id = :id AND locked_by = :worker AND status = 'running'
+    RETURNING status, finished_at
+""")
+
+REAP_SQL = text("""
+    UPDATE jobs
+    SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END::jobstatus,
+        run_at = now(),
+        last_error = 'Lease expired: worker ' || coalesce(locked_by, '?') || ' stopped heartbeating',
+        locked_by = NULL, locked_until = NULL,
+        finished_at = CASE WHEN attempts >= max_attempts THEN now() END
+    WHERE status = 'running' AND locked_until < now()
+    RETURNING id, status
+""")
+
+PRUNE_SQL = text("""
+    DELETE FROM jobs
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE finished_at < now() - make_interval(days => :days)
+          AND status IN ('succeeded', 'failed')
+        LIMIT :limit
+    )
+""")
+
+
+# -----------------------------
+# Enqueue
+# -----------------------------
+def _enqueue_params(name, payload, queue, priority, delay, max_attempts, created_by) -> dict:
+    spec = get_spec(name)
+    return {
+        "queue": queue or spec.queue,
+        "name": name,
+        "payload": json.dumps(payload or {}),
+        "priority": spec.priority if priority is None else priority,
+        "max_attempts": max_attempts or spec.max_attempts or settings.JOB_MAX_ATTEMPTS,
+        "delay": delay,
+        "created_by": created_by,
+    }
+
+
+def enqueue(
+    name: str,
+    payload: Optional[dict] = None,
+    queue: Optional[str] = None,
+    priority: Optional[int] = None,
+    delay: float = 0,
+    max_attempts: Optional[int] = None,
+    created_by: Optional[int] = None,
+    conn=None,
+) -> int:
+    """Insert a job (in `conn`'s transaction if given, else its own); returns its id."""
+    params = _enqueue_params(name, payload, queue, priority, delay, max_attempts, created_by)
+    if conn is not None:
+        return conn.execute(ENQUEUE_SQL, params).scalar_one()
+    with get_engine().begin() as own:
+        return own.execute(ENQUEUE_SQL, params).scalar_one()
+
+
+async def enqueue_async(
+    db: AsyncSession,
+    name: str,
+    payload: Optional[dict] = None,
+    queue: Optional[str] = None,
+    priority: Optional[int] = None,
+    delay: float = 0,
+    max_attempts: Optional[int] = None,
+    created_by: Optional[int] = None,
+) -> int:
+    """Insert a job in the caller's transaction; the caller commits."""
+    params = _enqueue_params(name, payload, queue, priority, delay, max_attempts, created_by)
+    return (await db.execute(ENQUEUE_SQL, params)).scalar_one()
+
+
+# -----------------------------
+# Worker side (each call is its own short transaction)
+# -----------------------------
+def claim(worker: str, queues: list, limit: int, visibility: float = settings.JOB_VISIBILITY_TIMEOUT) -> list:
+    with get_engine().begin() as conn:
+        rows = conn.execute(CLAIM_SQL, {
+            "worker": worker, "queues": queues, "limit": limit, "visibility": visibility,
+        }).all()
+    return [ClaimedJob(**row._mapping) for row in rows]
+
+
+def heartbeat(worker: str, ids: list, visibility: float = settings.JOB_VISIBILITY_TIMEOUT):
+    if ids:
+        with get_engine().begin() as conn:
+            conn.execute(HEARTBEAT_SQL, {"worker": worker, "ids": ids, "visibility": visibility})
+
+
+def complete(worker: str, job_id: int, result=None) -> Optional[datetime]:
+    """Mark the job succeeded; None if this worker no longer holds it."""
+    with get_engine().begin() as conn:
+        return conn.execute(COMPLETE_SQL, {
+            "worker": worker, "id": job_id, "result": json.dumps(result, default=str),
+        }).scalar_one_or_none()
+
+
+def fail(worker: str, job: ClaimedJob, error: str, permanent: bool = False):
+    """Schedule the next attempt or fail the job; (status, finished_at), None if no longer held."""
+    with get_engine().begin() as conn:
+        return conn.execute(FAIL_SQL, {
+            "worker": worker,
+            "id": job.id,
+            "error": error,
+            "permanent": permanent,
+            "delay": retry_delay(job.attempts),
+        }).one_or_none()
+
+
+def reap_expired() -> list:
+    """Requeue (or fail, when out of attempts) running jobs whose lease expired."""
+    with get_engine().begin() as conn:
+        return conn.execute(REAP_SQL).all()
+
+
+def prune_finished(days: int = settings.JOB_RETENTION_DAYS, limit: int = 10000) -> int:
+    with get_engine().begin() as conn:
+        return conn.execute(PRUNE_SQL, {"days": days, "limit": limit}).rowcount
@@ -0,0 +1,217 @@
+"""
+Job worker: claims jobs from the `jobs` table and runs them on a thread pool.
+
+    python -m app.tasks.worker                          # every queue, JOB_CONCURRENCY threads
+    python -m app.tasks.worker --queues imports --processes 4 --concurrency 1
+    python -m app.tasks.worker enqueue logs.maintain_partitions     # e.g. daily from cron
+
+Threads suit jobs that wait on the DB or the network; `--processes` starts
+that many worker processes, each with its own threads and connection pool,
+for CPU-bound jobs. Workers on other hosts only need the same database.
+SIGTERM or Ctrl-C stops claiming; running jobs finish first, and any job
+left behind by a killed worker is requeued once its lease expires.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional
+
+from app.core import audit
+from app.core.config import settings
+from app.core.logger import logger, setup_logger, shutdown_logger
+from app.tasks import jobs  # noqa: F401  registers the job handlers
+from app.tasks import queue
+from app.tasks.queue import HANDLERS, ClaimedJob, JobError, PermanentJobError
+
+# Seconds between reaping expired leases and pruning old jobs
+HOUSEKEEPING_INTERVAL = 60.0
+
+
+class Worker:
+    def __init__(
+        self,
+        queues: Optional[List[str]] = None,
+        concurrency: int = settings.JOB_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL,
+        visibility_timeout: float = settings.JOB_VISIBILITY_TIMEOUT,
+    ):
+        self.queues = queues or sorted({spec.queue for spec in HANDLERS.values()})
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+        self.running = {}                   # job id -> Future
+        self.stopping = threading.Event()
+        self.wakeup = threading.Event()     # a job finished: refill its slot now
+
+    def stop(self, *_):
+        self.stopping.set()
+        self.wakeup.set()
+
+    # -------------------------
+    # One job, on a pool thread
+    # -------------------------
+    def _execute(self, job: ClaimedJob):
+        info = {
+            "job_id": job.id,
+            "job": job.name,
+            "attempt": job.attempts,
+            "worker": self.id,
+            # From becoming runnable to being claimed
+            "wait_seconds": round((job.started_at - job.run_at).total_seconds(), 3),
+        }
+        # Writes made by the job are audited as its creator's
+        token = audit.audit_actor.set(job.created_by)
+        started = time.perf_counter()
+        try:
+            spec = HANDLERS.get(job.name)
+            if spec is None:
+                raise PermanentJobError(f"No handler for job '{job.name}'")
+            result = spec.func(job.payload)
+        except Exception as e:
+            info["run_seconds"] = round(time.perf_counter() - started, 3)
+            try:
+                outcome = queue.fail(self.id, job, f"{type(e).__name__}: {e}", permanent=isinstance(e, PermanentJobError))
+                info["status"] = outcome.status if outcome is not None else "lease_lost"
+            except Exception as db_error:
+                # The lease runs out and the job is retried
+                info["status"] = f"unrecorded: {db_error}"
+            logger.exception("job failed", extra={"extra": info})
+        else:
+            info["run_seconds"] = round(time.perf_counter() - started, 3)
+            try:
+                held = queue.complete(self.id, job.id, result) is not None
+                info["status"] = "succeeded" if held else "lease_lost"
+            except Exception as db_error:
+                info["status"] = f"unrecorded: {db_error}"
+            logger.info("job finished", extra={"extra": info})
+        finally:
+            audit.audit_actor.reset(token)
+            self.wakeup.set()
+
+    # -------------------------
+    # Main loop
+    # -------------------------
+    def _housekeeping(self):
+        for job_id, status in queue.reap_expired():
+            logger.warning("job lease expired", extra={"extra": {"job_id": job_id, "status": status}})
+        pruned = queue.prune_finished()
+        if pruned:
+            logger.info("finished jobs pruned", extra={"extra": {"jobs": pruned}})
+
+    def run(self):
+        logger.info("job worker started", extra={"extra": {
+            "worker": self.id, "queues": self.queues, "concurrency": self.concurrency,
+        }})
+        last_heartbeat = last_housekeeping = 0.0
+        heartbeat_interval = self.visibility_timeout / 3
+        while not self.stopping.is_set():
+            self.wakeup.clear()
+            self.running = {job_id: f for job_id, f in self.running.items() if not f.done()}
+            now = time.monotonic()
+            free = self.concurrency - len(self.running)
+            claimed = []
+            try:
+                if self.running and now - last_heartbeat >= heartbeat_interval:
+                    queue.heartbeat(self.id, list(self.running), self.visibility_timeout)
+                    last_heartbeat = now
+                if now - last_housekeeping >= HOUSEKEEPING_INTERVAL:
+                    self._housekeeping()
+                    last_housekeeping = now
+                if free:
+                    claimed = queue.claim(self.id, self.queues, free, self.visibility_timeout)
+            except Exception as e:
+                logger.error(f"job worker cannot reach the database: {e}")
+            for job in claimed:
+                self.running[job.id] = self.executor.submit(self._execute, job)
+            if not free or len(claimed) < free:
+                # Pool full or queue drained: sleep until a job finishes or the next poll
+                self.wakeup.wait(min(self.poll_interval, heartbeat_interval))
+
+        # Let the running jobs finish, keeping their leases alive meanwhile
+        while self.running:
+            try:
+                queue.heartbeat(self.id, list(self.running), self.visibility_timeout)
+            except Exception as e:
+                logger.error(f"job worker heartbeat failed: {e}")
+            wait(list(self.running.values()), timeout=heartbeat_interval)
+            self.running = {job_id: f for job_id, f in self.running.items() if not f.done()}
+        self.executor.shutdown()
+        logger.info("job worker stopped", extra={"extra": {"worker": self.id}})
+
+
+def run_worker(queues: Optional[List[str]], concurrency: int, poll_interval: float):
+    setup_logger(log_to_db=True)
+    worker = Worker(queues, concurrency=concurrency, poll_interval=poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    try:
+        worker.run()
+    finally:
+        shutdown_logger(logger)
+
+
+def run_workers(processes: int, queues: Optional[List[str]], concurrency: int, poll_interval: float):
+    """Run `processes` workers as child processes; SIGTERM / Ctrl-C stops them all gracefully."""
+    # Spawned, not forked: children build their own engines, threads and log handlers
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(target=run_worker, args=(queues, concurrency, poll_interval), name=f"job-worker-{i}")
+        for i in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def forward(signum, _frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        child.join()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run background job workers, or enqueue a job")
+    parser.add_argument("--queues", help="comma-separated queues to serve, default: every registered one")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_CONCURRENCY, help="jobs run at once per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL)
+    commands = parser.add_subparsers(dest="command")
+
+    enqueue = commands.add_parser("enqueue", help="enqueue one job and exit")
+    enqueue.add_argument("name", help="registered job name, e.g. logs.maintain_partitions")
+    enqueue.add_argument("--payload", default="{}", help="JSON object")
+    enqueue.add_argument("--priority", type=int, help="higher runs first")
+    enqueue.add_argument("--delay", type=float, default=0, help="seconds before the job may run")
+    args = parser.parse_args(argv)
+
+    if args.command == "enqueue":
+        try:
+            job_id = queue.enqueue(args.name, json.loads(args.payload), priority=args.priority, delay=args.delay)
+        except (JobError, ValueError) as e:
+            parser.error(str(e))
+        print(f"enqueued job {job_id}")
+        return 0
+
+    queues = [name.strip() for name in args.queues.split(",")] if args.queues else None
+    if args.processes > 1:
+        run_workers(args.processes, queues, args.concurrency, args.poll_interval)
+    else:
+        run_worker(queues, args.concurrency, args.poll_interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+API load and latency benchmark.
+
+Drives the FastAPI `app` in-process over ASGI (httpx.ASGITransport, with
+the lifespan running) against a seeded local database, so the whole request
+path is measured: middleware, dependencies, logger, session layer, queries
+and serialization, but no network. Client and server share one event loop,
+so throughput is a lower bound of a single worker's capacity.
+
+Each scenario is run for `--requests` requests by `--concurrency` concurrent
+clients after `--warmup` untimed ones; throughput, mean and p50 / p95 / p99
+latency are printed and saved as JSON (`--output`). With `--baseline` the
+run is compared against a stored result and fails when a p99 grows or a
+throughput drops by more than `--tolerance`.
+
+    python -m app.tests.benchmarks.api_benchmark --concurrency 20 --output results.json
+    python -m app.tests.benchmarks.api_benchmark --save-baseline benchmarks/api-baseline.json
+    python -m app.tests.benchmarks.api_benchmark --baseline benchmarks/api-baseline.json
+    python -m app.tests.benchmarks.api_benchmark --only health,search
+    python -m app.tests.benchmarks.api_benchmark --cleanup
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import text
+
+from app.database.sync.session import get_engine
+from app.tests.benchmarks import search_benchmark
+from app.utils.security import get_password_hash
+
+BENCH_EMAIL = "api-bench@catalogflow.local"
+BENCH_PASSWORD = "api-bench-password"
+BENCH_CATEGORY = "API benchmark"
+# Benchmark products moved into the benchmark category
+CATEGORY_PRODUCTS = 5000
+# p99 differences below this are noise, whatever the tolerance says
+MIN_P99_DELTA_MS = 1.0
+
+
+# -----------------------------
+# Seeding
+# -----------------------------
+def seed(rows: int) -> int:
+    """Benchmark admin user, category and products; returns the category id."""
+    search_benchmark.seed(rows)
+    with get_engine().begin() as conn:
+        conn.execute(text("""
+            INSERT INTO auth.users (full_name, email, password_hash, global_role, is_active, is_verified, token_version)
+            VALUES ('API benchmark', :email, :password_hash, 'admin', true, true, 0)
+            ON CONFLICT (email) DO NOTHING
+        """), {"email": BENCH_EMAIL, "password_hash": get_password_hash(BENCH_PASSWORD)})
+
+        category_id = conn.execute(
+            text("SELECT id FROM categories WHERE name = :name AND parent_id IS NULL AND is_active"),
+            {"name": BENCH_CATEGORY},
+        ).scalar()
+        if category_id is None:
+            category_id = conn.execute(text("""
+                INSERT INTO categories (name, parent_id, depth, path, is_active, created_at)
+                VALUES (:name, NULL, 0, '', true, now()) RETURNING id
+            """), {"name": BENCH_CATEGORY}).scalar_one()
+            conn.execute(text("UPDATE categories SET path = '/' || id || '/' WHERE id = :id"), {"id": category_id})
+
+        conn.execute(text("""
+            UPDATE products SET category_id = :category_id
+            WHERE id IN (
+                SELECT id FROM products
+                WHERE sku LIKE :prefix AND category_id IS NULL
+                ORDER BY id LIMIT :n
+            )
+        """), {
+            "category_id": category_id,
+            "prefix": search_benchmark.SKU_PREFIX + "%",
+            "n": max(0, CATEGORY_PRODUCTS - _category_size(conn, category_id)),
+        })
+    return category_id
+
+
+def _category_size(conn, category_id: int) -> int:
+    return conn.execute(
+        text("SELECT count(*) FROM products WHERE category_id = :id"), {"id": category_id}
+    ).scalar()
+
+
+def cleanup():
+    with get_engine().begin() as conn:
+        category_ids = conn.execute(
+            text("SELECT id FROM categories WHERE name = :name AND parent_id IS NULL"), {"name": BENCH_CATEGORY}
+        ).scalars().all()
+        if category_ids:
+            conn.execute(text("UPDATE products SET category_id = NULL WHERE category_id = ANY(:ids)"), {"ids": category_ids})
+            conn.execute(text("DELETE FROM categories WHERE id = ANY(:ids)"), {"ids": category_ids})
+        conn.execute(text("DELETE FROM auth.users WHERE email = :email"), {"email": BENCH_EMAIL})
+    search_benchmark.cleanup()
+
+
+# -----------------------------
+# Scenarios
+# -----------------------------
+class Context:
+    """Ids and tokens the scenarios need, filled in once before timing."""
+
+    def __init__(self, category_id: int):
+        self.category_id = category_id
+        self.access_token = None
+        # One refresh session per concurrent client: tokens rotate on use
+        self.refresh_tokens = []
+
+    @property
+    def auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+def _login(client, ctx):
+    return client.post("/api/v1/auth/login", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+
+
+async def _refresh(client, ctx):
+    # Take a session's current token, put back the one it rotates to
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": ctx.refresh_tokens.pop()})
+    if response.status_code == 200:
+        ctx.refresh_tokens.append(response.json()["refresh_token"])
+    return response
+
+
+# name -> request factory; a scenario must answer 2xx
+SCENARIOS = {
+    "health": lambda client, ctx: client.get("/api/v1/health"),
+    "login": _login,
+    "refresh": _refresh,
+    "category_tree": lambda client, ctx: client.get("/api/v1/categories/tree", headers=ctx.auth),
+    "category_products": lambda client, ctx: client.get(
+        f"/api/v1/categories/{ctx.category_id}/products", params={"limit": 50}, headers=ctx.auth
+    ),
+    "search": lambda client, ctx: client.get("/api/v1/search", params={"q": "wireless headphones"}, headers=ctx.auth),
+    "logs": lambda client, ctx: client.get("/api/v1/logs", params={"limit": 100}, headers=ctx.auth),
+}
+
+
+# -----------------------------
+# Running
+# -----------------------------
+def _percentile(samples: list, q: float) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(q * 100) - 1] if len(samples) > 1 else samples[0]
+
+
+async def run_scenario(client, ctx, request, requests: int, concurrency: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        (await request(client, ctx)).raise_for_status()
+
+    remaining = iter(range(requests))
+    samples, errors = [], {}
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await request(client, ctx)
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": {str(status): n for status, n in sorted(errors.items())},
+        "throughput_rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(_percentile(samples, 0.50), 3),
+        "p95_ms": round(_percentile(samples, 0.95), 3),
+        "p99_ms": round(_percentile(samples, 0.99), 3),
+    }
+
+
+def _lift_rate_limits():
+    """
+    One client hammering login would be throttled after a few requests.
+    Keep the limiter on the measured path, with limits the run cannot reach.
+    """
+    from app.core.config import settings
+
+    settings.RATE_LIMIT_ROUTES = {
+        route: {key: "1000000/second" if key in ("ip", "account") else value for key, value in rule.items()}
+        for route, rule in settings.RATE_LIMIT_ROUTES.items()
+    }
+
+
+async def run(names: list, category_id: int, requests: int, concurrency: int, warmup: int) -> dict:
+    # Before the application is imported: the middleware reads the limits then
+    _lift_rate_limits()
+    # Imported here so seeding and --cleanup do not start the application
+    from app.main import app
+
+    ctx = Context(category_id)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            logins = await asyncio.gather(*(_login(client, ctx) for _ in range(concurrency)))
+            tokens = [response.raise_for_status().json() for response in logins]
+            ctx.access_token = tokens[0]["access_token"]
+            ctx.refresh_tokens = [t["refresh_token"] for t in tokens]
+
+            print(f"{'endpoint':<20}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+            for name in names:
+                result = await run_scenario(client, ctx, SCENARIOS[name], requests, concurrency, warmup)
+                results[name] = result
+                print(
+                    f"{name:<20}{result['throughput_rps']:>10.1f}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{sum(result['errors'].values()):>8}",
+                    flush=True,
+                )
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# -----------------------------
+# Baseline comparison
+# -----------------------------
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Human-readable regressions of `results` against `baseline` (empty when none)."""
+    regressions = []
+    for name, result in results.items():
+        if result["errors"]:
+            regressions.append(f"{name}: error responses {result['errors']}")
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        p99_limit = max(before["p99_ms"] * (1 + tolerance), before["p99_ms"] + MIN_P99_DELTA_MS)
+        if result["p99_ms"] > p99_limit:
+            regressions.append(f"{name}: p99 {result['p99_ms']:.2f} ms, baseline {before['p99_ms']:.2f} ms")
+        if result["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['throughput_rps']:.1f} req/s, baseline {before['throughput_rps']:.1f} req/s"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints in-process over ASGI")
+    parser.add_argument("--only", default=",".join(SCENARIOS), help="comma-separated scenarios to run")
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent clients")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests per scenario")
+    parser.add_argument("--rows", type=int, default=10_000, help="benchmark products to seed")
+    parser.add_argument("--output", default="api_benchmark.json", help="where to write the results")
+    parser.add_argument("--baseline", default=None, help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p99 growth / throughput drop")
+    parser.add_argument("--save-baseline", default=None, help="also write the results here as the new baseline")
+    parser.add_argument("--cleanup", action="store_true", help="delete the benchmark data and exit")
+    args = parser.parse_args(argv)
+
+    if args.cleanup:
+        cleanup()
+        return 0
+    names = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    category_id = seed(args.rows)
+    results = asyncio.run(run(names, category_id, args.requests, args.concurrency, args.warmup))
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "endpoints": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {path}")
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print("OK" if not regressions else f"FAILED: {len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Cold-start benchmark: how long a fresh worker takes to become ready.
+
+Each run starts a new interpreter that imports `app.main` and runs the
+lifespan startup, then prints the startup profiler report. The parent
+measures the wall time from spawning the process to that report, so
+interpreter start-up is included, and prints the median / max per phase.
+
+    python -m app.tests.benchmarks.cold_start --runs 10
+    python -m app.tests.benchmarks.cold_start --max-ready-ms 2000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CHILD = """
+import asyncio, json
+from app.main import app, startup_profiler
+
+async def main():
+    async with app.router.lifespan_context(app):
+        print("STARTUP " + json.dumps(startup_profiler.report()), flush=True)
+
+asyncio.run(main())
+"""
+
+
+def run_once() -> dict:
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", CHILD], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env
+    )
+    report = None
+    for line in process.stdout:
+        if line.startswith("STARTUP "):
+            report = json.loads(line[len("STARTUP "):])
+            report["wall_ready_seconds"] = time.perf_counter() - started
+    process.wait()
+    if report is None:
+        raise RuntimeError(f"startup failed (exit code {process.returncode})")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start of the application")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ready-ms", type=float, default=None, help="fail when the median exceeds this")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for i in range(args.runs):
+        reports.append(run_once())
+        print(f"run {i + 1}: ready in {reports[-1]['wall_ready_seconds'] * 1000:.0f} ms", flush=True)
+
+    phases = {}
+    for report in reports:
+        for name, seconds in report["phases"].items():
+            phases.setdefault(name, []).append(seconds * 1000)
+    phases["(process to ready)"] = [r["wall_ready_seconds"] * 1000 for r in reports]
+
+    print(f"\n{'phase':<24}{'median ms':>12}{'max ms':>10}")
+    for name, samples in phases.items():
+        print(f"{name:<24}{statistics.median(samples):>12.1f}{max(samples):>10.1f}")
+
+    ready = statistics.median(phases["(process to ready)"])
+    if args.max_ready_ms is not None and ready > args.max_ready_ms:
+        print(f"FAILED: median ready time {ready:.0f} ms above {args.max_ready_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
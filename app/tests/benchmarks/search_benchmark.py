@@ -0,0 +1,148 @@
+"""
+Latency benchmark for /api/v1/search over a generated catalog.
+
+Seeds up to `--rows` synthetic products (SKU prefix "BENCH-", generated
+server-side with generate_series so 1M rows take seconds, not minutes), then
+times `search_products` for a mix of queries with the cache bypassed and
+prints p50 / p95 / p99 per query. Exits non-zero when a p95 exceeds
+`--target-ms`.
+
+    python -m app.tests.benchmarks.search_benchmark --rows 1000000
+    python -m app.tests.benchmarks.search_benchmark --cleanup
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.crud.search import search_products
+from app.database.asyncio.session import dispose_async_engine, new_async_session
+from app.database.sync.session import get_engine
+
+SKU_PREFIX = "BENCH-"
+SEED_CHUNK = 100_000
+
+ADJECTIVES = [
+    "red", "blue", "green", "black", "white", "light", "heavy", "compact", "wireless", "smart",
+    "classic", "premium", "organic", "vintage", "portable", "waterproof", "ergonomic", "silent",
+    "rugged", "slim",
+]
+NOUNS = [
+    "running shoe", "backpack", "headphones", "keyboard", "mouse", "lamp", "kettle", "blender",
+    "jacket", "tent", "bottle", "watch", "speaker", "charger", "monitor", "chair", "desk",
+    "notebook", "camera", "drone", "helmet", "bicycle", "skillet", "teapot", "blanket",
+]
+BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Tyrell", "Soylent"]
+TAGS = ["sale", "new", "eco", "gift", "outdoor", "kitchen", "office", "travel", "kids", "pro"]
+
+SEED_SQL = """
+    INSERT INTO products (sku, name, description, price, stock, brand, tags, is_active, version, created_at)
+    SELECT
+        :prefix || g,
+        initcap(adj[1 + g % array_length(adj, 1)]) || ' ' || noun[1 + (g / 7) % array_length(noun, 1)]
+            || ' ' || (g % 997),
+        'The ' || adj[1 + (g / 3) % array_length(adj, 1)] || ' ' || noun[1 + g % array_length(noun, 1)]
+            || ' by ' || brand[1 + g % array_length(brand, 1)] || ', model ' || (g % 9973) || '.',
+        round((1 + (g * 7919) % 50000) / 100.0, 2),
+        (g * 31) % 500,
+        brand[1 + (g / 11) % array_length(brand, 1)],
+        ARRAY[tag[1 + g % array_length(tag, 1)], tag[1 + (g / 13) % array_length(tag, 1)]],
+        true, 1, now()
+    FROM generate_series(CAST(:start AS bigint), :stop) g,
+         (SELECT CAST(:adjectives AS text[]) AS adj, CAST(:nouns AS text[]) AS noun,
+                 CAST(:brands AS text[]) AS brand, CAST(:tags AS text[]) AS tag) words
+    ON CONFLICT (sku) DO NOTHING
+"""
+
+# (label, search_products kwargs)
+QUERIES = [
+    ("full-text word", {"term": "backpack"}),
+    ("full-text two words", {"term": "wireless headphones"}),
+    ("prefix", {"term": "waterpr"}),
+    ("typo", {"term": "hedphones"}),
+    ("sku prefix", {"term": SKU_PREFIX + "12345"}),
+    ("filtered", {"term": "shoe", "brand": "Acme", "tags": ["sale"]}),
+    ("broad (capped)", {"term": "the"}),
+]
+
+
+def seed(rows: int):
+    with get_engine().connect() as conn:
+        existing = conn.execute(
+            text("SELECT count(*) FROM products WHERE sku LIKE :p"), {"p": SKU_PREFIX + "%"}
+        ).scalar()
+    if existing >= rows:
+        print(f"{existing} benchmark products already present")
+        return
+
+    started = time.perf_counter()
+    for start in range(1, rows + 1, SEED_CHUNK):
+        stop = min(start + SEED_CHUNK - 1, rows)
+        with get_engine().begin() as conn:
+            conn.execute(text(SEED_SQL), {
+                "prefix": SKU_PREFIX, "start": start, "stop": stop, "adjectives": ADJECTIVES,
+                "nouns": NOUNS, "brands": BRANDS, "tags": TAGS,
+            })
+        print(f"seeded {stop}/{rows} ({time.perf_counter() - started:.1f}s)", flush=True)
+    with get_engine().begin() as conn:
+        conn.execute(text("ANALYZE products"))
+
+
+def cleanup():
+    with get_engine().begin() as conn:
+        deleted = conn.execute(text("DELETE FROM products WHERE sku LIKE :p"), {"p": SKU_PREFIX + "%"}).rowcount
+    print(f"deleted {deleted} benchmark products")
+
+
+def _percentile(samples: list, q: float) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(q * 100) - 1] if len(samples) > 1 else samples[0]
+
+
+async def run(runs: int, target_ms: float) -> bool:
+    ok = True
+    print(f"{'query':<22}{'total':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    async with new_async_session() as db:
+        for label, kwargs in QUERIES:
+            # One untimed run to warm the plan and the buffer cache
+            result = await search_products(db, use_cache=False, **kwargs)
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                await search_products(db, use_cache=False, **kwargs)
+                samples.append((time.perf_counter() - start) * 1000)
+            p95 = _percentile(samples, 0.95)
+            ok = ok and p95 <= target_ms
+            total = f"{result['total']}{'+' if result['total_capped'] else ''}"
+            print(
+                f"{label:<22}{total:>8}{_percentile(samples, 0.50):>10.2f}"
+                f"{p95:>10.2f}{_percentile(samples, 0.99):>10.2f}",
+                flush=True,
+            )
+    await dispose_async_engine()
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark product search on a generated catalog")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="benchmark products to seed")
+    parser.add_argument("--runs", type=int, default=50, help="timed runs per query")
+    parser.add_argument("--target-ms", type=float, default=50.0, help="p95 budget per query")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true", help="delete the benchmark products and exit")
+    args = parser.parse_args(argv)
+
+    if args.cleanup:
+        cleanup()
+        return 0
+    if not args.skip_seed:
+        seed(args.rows)
+    ok = asyncio.run(run(args.runs, args.target_ms))
+    print("OK" if ok else f"FAILED: p95 above {args.target_ms} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Audit buffering across savepoints, against the configured database.
+
+Approval retries a failing batch change by change in savepoints; a change
+the database refuses must not take the audit entries of the applied ones
+with it.
+
+    python -m pytest app/tests/test_audit.py
+"""
+import asyncio
+import json
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.crud import changes as crud
+from app.database.asyncio.session import new_async_session
+
+
+async def _mixed_batch(tag: str):
+    async with new_async_session() as db:
+        user_id = (await db.execute(text(
+            "INSERT INTO auth.users (full_name, email, password_hash, global_role, is_active, is_verified, token_version)"
+            " VALUES ('audit test', :email, 'x', 'admin', true, true, 0) RETURNING id"
+        ), {"email": f"{tag}@audit.test"})).scalar()
+        team_id = (await db.execute(text(
+            "INSERT INTO auth.teams (name, is_active, created_at) VALUES (:name, true, now()) RETURNING id"
+        ), {"name": tag})).scalar()
+        product_id = (await db.execute(text(
+            "INSERT INTO products (sku, name, price, stock, is_active, version)"
+            " VALUES (:sku, 'audit test', 1, 1, true, 1) RETURNING id"
+        ), {"sku": tag})).scalar()
+        good = (await db.execute(text(
+            "INSERT INTO change_requests (team_id, submitted_by, entity_type, entity_id, action, base_version, diff)"
+            " VALUES (:team, :user, 'product', :product, 'update', 1, '{\"stock\": 7}') RETURNING id"
+        ), {"team": team_id, "user": user_id, "product": product_id})).scalar()
+        # Unknown category: the create's savepoint is rolled back
+        bad = (await db.execute(text(
+            "INSERT INTO change_requests (team_id, submitted_by, entity_type, action, diff)"
+            " VALUES (:team, :user, 'product', 'create', CAST(:diff AS jsonb)) RETURNING id"
+        ), {"team": team_id, "user": user_id, "diff": json.dumps(
+            {"sku": f"{tag}-new", "name": "audit test", "price": "1", "category_id": -1}
+        )})).scalar()
+        await db.commit()
+        try:
+            result = await crud.approve_changes(db, [good, bad], user_id, None)
+            await db.commit()
+            stock = (await db.execute(text("SELECT stock FROM products WHERE id = :p"), {"p": product_id})).scalar()
+            audited = (await db.execute(text(
+                "SELECT count(*) FROM audit_log WHERE entity_type = 'product' AND entity_id = :p"
+            ), {"p": product_id})).scalar()
+            return result[good][0], result[bad][0], stock, audited
+        finally:
+            # audit_log is append-only: its rows stay
+            await db.rollback()
+            await db.execute(text("DELETE FROM change_requests WHERE team_id = :t"), {"t": team_id})
+            await db.execute(text("DELETE FROM products WHERE id = :p"), {"p": product_id})
+            await db.execute(text("DELETE FROM auth.teams WHERE id = :t"), {"t": team_id})
+            await db.execute(text("DELETE FROM auth.users WHERE id = :u"), {"u": user_id})
+            await db.commit()
+
+
+def test_failed_change_keeps_audit_of_applied_ones():
+    try:
+        outcome = asyncio.run(_mixed_batch(f"AUDIT-{uuid.uuid4().hex[:12]}"))
+    except OSError as exc:
+        pytest.skip(f"database unavailable: {exc}")
+    assert outcome == ("approved", "failed", 7, 1)
@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+from app.utils.security import get_password_hash, verify_password
+
+# Upper bounds (seconds) of the hash latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing queue is full and the request should be shed."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordPool:
+    """
+    Size-limited process pool for bcrypt hashing and verification.
+
+    bcrypt is deliberately CPU heavy and holds the GIL for most of its work, so
+    running it on the request threadpool lets a login storm starve every other
+    endpoint. Running it in worker processes scales with cores, and the
+    admission check rejects work up front once `max_queue` jobs are waiting
+    instead of letting latency grow without bound.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_POOL_WORKERS,
+        max_queue: int = settings.PASSWORD_POOL_MAX_QUEUE,
+        retry_after: int = settings.PASSWORD_POOL_RETRY_AFTER,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: the parent runs threads (log writer, DB pool), forking it is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._executor
+
+    def warm_up(self):
+        """Start every worker process now instead of on the first login."""
+        executor = self.start()
+        futures = [executor.submit(get_password_hash, "warm-up") for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted but not yet picked up by a worker."""
+        return max(0, self.in_flight - self.workers)
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolBusy(self.retry_after)
+            self.in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.start(), fn, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.latency_sum += elapsed
+                self.latency_max = max(self.latency_max, elapsed)
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    if elapsed <= bound:
+                        self.latency_buckets[i] += 1
+                        break
+                else:
+                    self.latency_buckets[-1] += 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_sum_seconds": round(self.latency_sum, 6),
+                "latency_max_seconds": round(self.latency_max, 6),
+                "latency_buckets": dict(
+                    zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], self.latency_buckets)
+                ),
+            }
+
+
+# Global pool instance, started from the app lifespan
+password_pool = PasswordPool()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.hash(password)
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+_MISSING = object()
+
+
+class TTLLRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry expiry.
+
+    Entries expire `ttl` seconds after they are set (or at an explicit
+    `expires_at` monotonic deadline) and the least recently used entry is
+    evicted once `maxsize` is reached. Expired entries are dropped lazily on
+    access. `on_evict(key)` is called, outside the lock, for every entry the
+    cache drops by itself (evicted or expired), not for `pop` or `clear`.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, on_evict: Optional[Callable] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+            self.misses += 1
+        if self.on_evict is not None:
+            self.on_evict(key)
+        return default
+
+    def set(self, key, value, ttl: float = None, expires_at: float = None):
+        if expires_at is None:
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        evicted = []
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False)[0])
+                self.evictions += 1
+        if self.on_evict is not None:
+            for old in evicted:
+                self.on_evict(old)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }